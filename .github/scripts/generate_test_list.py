@@ -1,39 +1,23 @@
-import os
 import json
-import re
+import sys
+from pathlib import Path
 
-TEST_DIR = "captive/tests"
+# Run from anywhere: make the repo root (captive/) importable
+ROOT_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT_DIR))
 
-def parse_test_file(file_path):
-    tests = []
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
+from backend.test_catalog import TestCatalog  # noqa: E402
 
-    # match all test_xxx functions
-    matches = re.findall(r"def (test_[a-zA-Z0-9_]+)\(", content)
+# Same AST catalog that backs /api/test-catalog
+_, all_tests = TestCatalog(ROOT_DIR / "tests", ROOT_DIR).snapshot()
 
-    for m in matches:
-        readable = m.replace("test_", "").replace("_", " ").title()
-        tests.append({
-            "id": m,
-            "name": readable,
-            "pytest": f"{file_path.replace('/', '.')}::{m}"
-        })
+# Line numbers would change the committed file on every edit above a test
+# (and trigger the auto-commit workflow); they stay in the API catalog only
+VOLATILE_FIELDS = ("line",)
 
-    return tests
+output = {"tests": [{k: v for k, v in t.items() if k not in VOLATILE_FIELDS} for t in all_tests]}
 
-
-all_tests = []
-
-for root, dirs, files in os.walk(TEST_DIR):
-    for file in files:
-        if file.startswith("test_") and file.endswith(".py"):
-            all_tests.extend(parse_test_file(os.path.join(root, file)))
-
-
-output = {"tests": all_tests}
-
-with open("automation_test_list.json", "w") as f:
+with open(ROOT_DIR / "automation_test_list.json", "w") as f:
     json.dump(output, f, indent=4)
 
-print("Generated automation_test_list.json")
+print(f"Generated automation_test_list.json ({len(all_tests)} tests)")
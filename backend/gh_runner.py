@@ -1,19 +1,33 @@
 # backend/gh_runner.py
+import asyncio
+import gzip
+import hashlib
+import hmac
 import json
 import os
-import time
+import shutil
+import tempfile
 import uuid
 import zipfile
-import io
-import requests
 import re
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI, BackgroundTasks, HTTPException
-from fastapi.responses import FileResponse, JSONResponse
-from pydantic import BaseModel
-from typing import Dict, Optional
+from xml.etree import ElementTree
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 
+from backend.github_client import AsyncGitHubClient
+from backend.job_events import JobEventBus
+from backend.job_store import JobStore
+from backend.report_files import report_response, stored_report_response
+from backend.report_store import report_store
+from backend.result_store import result_store
+from backend.results_api import router as results_router
+from backend.test_catalog import AmbiguousTestName, MarkerExpressionError, test_catalog
+
 # -------------------------------------------------------------------------
 # GitHub Config
 # -------------------------------------------------------------------------
@@ -29,9 +43,47 @@ HEADERS = {
     "Authorization": f"token {GITHUB_TOKEN}"
 }
 
+# Shared, pooled asyncio client for every GitHub API call (see github_client.py)
+github = AsyncGitHubClient(HEADERS)
+
 POLL_INTERVAL = 5
 POLL_TIMEOUT = 600  # 10 minutes
 
+# Fallback poller backoff: the interval doubles (up to this cap) while GitHub
+# reports no change and drops back to POLL_INTERVAL when something changes.
+POLL_MAX_INTERVAL = 60
+
+# With the workflow_run webhook configured, the poller is only a safety net
+GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")
+WEBHOOK_FALLBACK_INTERVAL = 30
+
+# The workflow's run-name carries the job id (see ci-runner.yml)
+JOB_ID_RE = re.compile(r"\b([0-9a-f]{32})\b")
+
+# Batch runs: each shard is one matrix job in the workflow run (setup is paid
+# once per shard, not once per test)
+BATCH_DEFAULT_SHARDS = int(os.getenv("BATCH_DEFAULT_SHARDS", "4"))
+BATCH_MAX_SHARDS = int(os.getenv("BATCH_MAX_SHARDS", "10"))
+
+# Per-shard artifacts are named report-<index> (plain "report" = shard 0)
+ARTIFACT_NAME_RE = re.compile(r"report(?:-(\d+))?")
+
+# Workflow runs allowed in flight at once (all workers together); further
+# jobs wait in the "queued" state
+MAX_ACTIVE_RUNS = int(os.getenv("MAX_ACTIVE_RUNS", "5"))
+
+# While jobs are queued, free slots are re-checked at least this often
+# (seconds) in case another worker freed them
+QUEUE_RECHECK_INTERVAL = 5
+
+# A job claimed for dispatch but not dispatched within this many seconds was
+# orphaned by a process that died mid-dispatch; it is failed to free its
+# run slot and its target
+DISPATCH_TIMEOUT = int(os.getenv("DISPATCH_TIMEOUT", "300"))
+
+# Artifacts downloaded / unpacked at the same time (the rest wait their turn)
+REPORT_COLLECT_CONCURRENCY = int(os.getenv("REPORT_COLLECT_CONCURRENCY", "4"))
+
 # -------------------------------------------------------------------------
 # Paths
 # -------------------------------------------------------------------------
@@ -40,44 +92,85 @@ REPORTS_DIR = Path(__file__).resolve().parent / "reports"
 REPORTS_DIR.mkdir(exist_ok=True)
 
 # -------------------------------------------------------------------------
-app = FastAPI(title="GitHub Actions Test Runner")
-jobs: Dict[str, Dict] = {}
-
-# -------------------------------------------------------------------------
-# Request model for running test
+# Supervision runs as asyncio tasks on the app's event loop
 # -------------------------------------------------------------------------
-class RunTestPayload(BaseModel):
-    test_case: str   # Function name (e.g. "test_valid_login")
-    requester: Optional[str] = "ui"
+# Strong references keep running tasks from being garbage collected
+_background_tasks = set()
 
 
-# -------------------------------------------------------------------------
-# Auto-discover test cases
-# -------------------------------------------------------------------------
-def discover_tests():
+def _task_done(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        print(f">>> {task.get_name()} failed:", repr(task.exception()))
+
+
+def spawn(coro, name: str) -> asyncio.Task:
+    """Run `coro` as a background task (call from the event loop)."""
+    task = asyncio.get_running_loop().create_task(coro, name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_task_done)
+    return task
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    run_poller.start()
+    dispatch_queue.start()
+    # Pick up jobs that were queued / in flight when the previous process
+    # stopped, and release the ones it left half-dispatched
+    await asyncio.to_thread(expire_stale_dispatches)
+    run_poller.kick()
+    dispatch_queue.kick()
+    yield
+    await dispatch_queue.stop()
+    await run_poller.stop()
+    await github.aclose()
+
+
+app = FastAPI(title="GitHub Actions Test Runner", lifespan=lifespan)
+
+# Per-test result history (/api/results/...), fed by _collect_report
+app.include_router(results_router)
+
+# Jobs live in SQLite (JOB_DB_URL) so every uvicorn worker sees the same state
+job_store = JobStore()
 
-    TEST_DIR = BASE_DIR / "tests"
-    mapping = {}
+# Pushes every recorded status change to /api/job-events subscribers
+job_events = JobEventBus(job_store)
 
-    for root, dirs, files in os.walk(TEST_DIR):
-        for file in files:
-            if file.startswith("test_") and file.endswith(".py"):
-                file_path = Path(root) / file
-                content = file_path.read_text(encoding="utf-8")
+# Statuses after which a job never changes again
+TERMINAL_STATUSES = (
+    "report_ready", "dispatch_failed", "workflow_not_found", "no_artifact", "artifact_missing", "collect_failed",
+)
 
-                functions = re.findall(r"def (test_[a-zA-Z0-9_]+)\(", content)
+# Idle SSE connections get a comment line this often (seconds)
+SSE_KEEPALIVE = 15
+
+# Job statuses that are waiting on a GitHub workflow run
+IN_FLIGHT_STATUSES = ("dispatched", "running")
+
+# Job statuses that count against MAX_ACTIVE_RUNS
+ACTIVE_RUN_STATUSES = ("dispatching",) + IN_FLIGHT_STATUSES
+
+# -------------------------------------------------------------------------
+# Request model for running test
+# -------------------------------------------------------------------------
+class RunTestPayload(BaseModel):
+    test_case: str   # Function name (e.g. "test_valid_login") or pytest node id
+    requester: Optional[str] = "ui"
 
-                for fn in functions:
-                    pytest_path = f"{file_path.relative_to(BASE_DIR)}::{fn}"
-                    mapping[fn] = pytest_path.replace("\\", "/")
 
-    return mapping
+class RunBatchPayload(BaseModel):
+    tests: Optional[List[str]] = None   # Function names or pytest node ids
+    marker: Optional[str] = None        # Or a marker expression, e.g. "smoke and not dashboard"
+    shards: int = Field(BATCH_DEFAULT_SHARDS, ge=1)
+    requester: Optional[str] = "ui"
 
 
 # -------------------------------------------------------------------------
 # Trigger GitHub workflow
 # -------------------------------------------------------------------------
-def trigger_github_workflow(client_payload: dict):
+async def trigger_github_workflow(client_payload: dict):
     url = f"{API_BASE}/repos/{GITHUB_REPO}/dispatches"
 
     payload = {
@@ -91,7 +184,7 @@ def trigger_github_workflow(client_payload: dict):
     print("Headers:", HEADERS)
     print("========================================\n")
 
-    resp = requests.post(url, headers=HEADERS, json=payload)
+    resp = await github.post(url, json=payload)
 
     print(">>> GitHub Response Code:", resp.status_code)
     print(">>> GitHub Response Body:", resp.text)
@@ -102,121 +195,534 @@ def trigger_github_workflow(client_payload: dict):
 # -------------------------------------------------------------------------
 # Download HTML artifact report
 # -------------------------------------------------------------------------
-def download_and_extract_report(artifact_url: str):
-    resp = requests.get(artifact_url, headers=HEADERS)
-    if resp.status_code != 200:
+# Artifacts up to this size stay in memory; larger ones spill to a temp file
+ARTIFACT_SPOOL_SIZE = 8 * 1024 * 1024
+STREAM_CHUNK_SIZE = 256 * 1024
+
+
+ArtifactContents = Tuple[Optional[Path], Dict[str, str], Optional[dict]]
+
+
+async def download_artifact(artifact_url: str, out_path: Path) -> ArtifactContents:
+    """Stream an artifact zip into a spooled temp file, then store its HTML
+    report at `out_path` and read its JUnit and `--results-json` results;
+    memory use stays flat however large the self-contained reports are.
+
+    Returns `(report path or None, outcome per JUnit key, results document or None)`.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=ARTIFACT_SPOOL_SIZE) as spool:
+        async with github.stream("GET", artifact_url) as resp:
+            if resp.status_code != 200:
+                return None, {}, None
+            async for chunk in resp.aiter_bytes(STREAM_CHUNK_SIZE):
+                spool.write(chunk)
+
+        # Unzipping and gzip are CPU / disk bound: keep them off the loop
+        return await asyncio.to_thread(_unpack_artifact, spool, out_path)
+
+
+def _unpack_artifact(spool, out_path: Path) -> ArtifactContents:
+    spool.seek(0)
+    with zipfile.ZipFile(spool) as z:
+        return extract_report(z, out_path), extract_junit_results(z), extract_results_document(z)
+
+
+def extract_report(z: zipfile.ZipFile, out_path: Path) -> Optional[Path]:
+    """Copy the artifact's HTML report chunk by chunk into `out_path` (a `.html.gz` file)."""
+    name = next((n for n in z.namelist() if n.endswith(".html")), None)
+    if name is None:
+        return None
+
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    with z.open(name) as src, gzip.open(tmp_path, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, STREAM_CHUNK_SIZE)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def extract_results_document(z: zipfile.ZipFile) -> Optional[dict]:
+    """The per-test results written by `pytest --results-json=results.json`."""
+    if "results.json" not in z.namelist():
+        return None   # artifacts from before the workflow wrote it
+    try:
+        with z.open("results.json") as f:
+            return json.load(f)
+    except ValueError as e:
+        print(f">>> Cannot parse results.json: {e}")
         return None
 
-    z = zipfile.ZipFile(io.BytesIO(resp.content))
 
+# Least to most severe; a parametrized target takes its worst case
+JUNIT_OUTCOMES = ("passed", "skipped", "failed", "error")
+
+
+def junit_key(node_id: str) -> str:
+    """`tests/test_x.py::TestA::test_b` -> `tests.test_x.TestA.test_b` (JUnit classname + name)."""
+    module, *rest = node_id.split("::")
+    return ".".join([module[:-3].replace("/", ".")] + rest)
+
+
+def extract_junit_results(z: zipfile.ZipFile) -> Dict[str, str]:
+    """Outcome per test (keyed by `junit_key`) from the artifact's JUnit XML files."""
+    results = {}
     for name in z.namelist():
-        if name.endswith(".html"):
-            return z.read(name).decode("utf-8")
+        if not name.endswith(".xml"):
+            continue
+        try:
+            with z.open(name) as f:
+                for _, el in ElementTree.iterparse(f):
+                    if el.tag != "testcase":
+                        continue
+                    outcome = "passed"
+                    for child in el:
+                        if child.tag in ("failure", "error", "skipped"):
+                            outcome = "failed" if child.tag == "failure" else child.tag
+                    key = f"{el.get('classname')}.{el.get('name', '').split('[', 1)[0]}"
+                    if JUNIT_OUTCOMES.index(outcome) >= JUNIT_OUTCOMES.index(results.get(key, "passed")):
+                        results[key] = outcome
+                    el.clear()
+        except ElementTree.ParseError as e:
+            print(f">>> Cannot parse {name}: {e}")
+    return results
 
-    return None
+
+# -------------------------------------------------------------------------
+# Conditional GitHub GETs (ETag / If-None-Match)
+# -------------------------------------------------------------------------
+# url -> (etag, last JSON body). A 304 answer is free against the rate limit.
+# Only touched from the event loop, so no lock is needed.
+_etag_cache: Dict[str, tuple] = {}
+
+
+async def conditional_get(url: str, params: Optional[dict] = None):
+    """GET `url` with the cached ETag; returns `(changed, data)`."""
+    key = url + "?" + "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    cached = _etag_cache.get(key)
+
+    headers = {"If-None-Match": cached[0]} if cached else {}
+
+    r = await github.get(url, headers=headers, params=params)
+    if r.status_code == 304 and cached:
+        return False, cached[1]
+    if r.status_code != 200:
+        return False, cached[1] if cached else {}
+
+    data = r.json()
+    etag = r.headers.get("ETag")
+    if etag:
+        _etag_cache[key] = (etag, data)
+    return True, data
 
 
 # -------------------------------------------------------------------------
-# Background monitor worker
+# Run → job matching and state updates (shared by webhook and poller)
 # -------------------------------------------------------------------------
-def background_monitor_job(job_id: str):
-    job = jobs[job_id]
-    job["status"] = "dispatching"
+def job_id_from_run(run: dict) -> Optional[str]:
+    for field in ("display_title", "name"):
+        m = JOB_ID_RE.search(run.get(field) or "")
+        if m:
+            return m.group(1)
+    return None
 
-    pytest_target = job["pytest_target"]
 
-    # Send workflow trigger
-    client_payload = {
-        "job_id": job_id,
-        "pytest_target": pytest_target,
-        "requester": job["requester"]
-    }
+async def apply_run_update(job_id: Optional[str], run: dict) -> bool:
+    """Record what GitHub reports about a job's workflow run.
 
-    ok, resp = trigger_github_workflow(client_payload)
-    if not ok:
-        job["status"] = "dispatch_failed"
-        job["error"] = resp.text
-        return
+    Returns True when the job's state changed. The first time a run is seen
+    as completed, report collection is started for the job.
+    """
+    job = await asyncio.to_thread(job_store.get, job_id) if job_id else None
+    if not job or job["status"] not in IN_FLIGHT_STATUSES:
+        return False
 
-    job["status"] = "dispatched"
+    before = (job.get("workflow_run_id"), job.get("run_status"), job.get("conclusion"))
 
-    # -------------------------------
-    # Find workflow run
-    # -------------------------------
-    run_id = None
-    deadline = time.time() + POLL_TIMEOUT
+    fields = {"workflow_run_id": run.get("id"), "run_status": run.get("status")}
+    if run.get("status") == "completed":
+        fields["conclusion"] = run.get("conclusion")
+
+    after = (fields["workflow_run_id"], fields["run_status"], fields.get("conclusion"))
+    if job["status"] == "running" and before == after:
+        return False
+
+    # Conditional, so a job finished meanwhile (e.g. by another worker) is left alone
+    if not await asyncio.to_thread(job_store.transition, job_id, IN_FLIGHT_STATUSES, "running", **fields):
+        return False
+
+    if run.get("status") == "completed":
+        await start_report_collection(job_id)
 
-    while time.time() < deadline:
-        r = requests.get(
-            f"{API_BASE}/repos/{GITHUB_REPO}/actions/runs",
-            headers=HEADERS
-        )
+    return before != after
 
-        runs = r.json().get("workflow_runs", [])
 
-        for run in runs:
-            if run.get("event") == "repository_dispatch":
-                run_id = run["id"]
+# -------------------------------------------------------------------------
+# Shared run poller (one list call per interval for all in-flight jobs)
+# -------------------------------------------------------------------------
+class RunPoller:
+    """Fallback poller shared by every in-flight job.
+
+    Each round lists the recent `repository_dispatch` runs once (created
+    since the oldest in-flight job, conditional on the cached ETag), matches
+    them to jobs through the job id in the run name and applies the updates.
+    API cost therefore depends on the interval, not on the number of jobs.
+    The task idles while nothing is in flight and is woken by `kick()`.
+    """
+
+    PER_PAGE = 100
+
+    def __init__(self):
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the polling task on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="run-poller")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def kick(self):
+        """Poll again right away (safe to call from any thread)."""
+        if self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _in_flight(self):
+        return job_store.with_status(IN_FLIGHT_STATUSES)
+
+    async def poll_once(self) -> bool:
+        """One polling round; returns True if any job changed."""
+        in_flight = await asyncio.to_thread(self._in_flight)
+        if not in_flight:
+            return False
+
+        # Allow for clock skew between us and GitHub
+        oldest = min(datetime.fromisoformat(job["created_at"]) for job in in_flight) - timedelta(minutes=2)
+        params = {
+            "event": "repository_dispatch",
+            "created": ">=" + oldest.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "per_page": self.PER_PAGE,
+        }
+
+        updated = False
+        page = 1
+        while True:
+            changed, data = await conditional_get(
+                f"{API_BASE}/repos/{GITHUB_REPO}/actions/runs", {**params, "page": page}
+            )
+            runs = data.get("workflow_runs", [])
+            if changed:
+                for run in runs:
+                    updated = await apply_run_update(job_id_from_run(run), run) or updated
+            if len(runs) < self.PER_PAGE:
                 break
+            page += 1
+
+        await self._expire(in_flight)
+        return updated
+
+    async def _expire(self, in_flight):
+        await asyncio.to_thread(expire_stale_dispatches)
+
+        # Jobs whose run never showed up (or never finished) within POLL_TIMEOUT
+        now = datetime.now(timezone.utc)
+        for job in in_flight:
+            dispatched = datetime.fromisoformat(job.get("dispatched_at") or job["created_at"])
+            if (now - dispatched).total_seconds() < POLL_TIMEOUT:
+                continue
+            # `in_flight` predates this round's run updates; decide on the current row
+            job = await asyncio.to_thread(job_store.get, job["job_id"])
+            if not job or job["status"] not in IN_FLIGHT_STATUSES:
+                continue
+            if not job.get("workflow_run_id"):
+                await asyncio.to_thread(job_store.transition, job["job_id"], IN_FLIGHT_STATUSES, "workflow_not_found")
+            else:
+                await start_report_collection(job["job_id"])
+
+    async def _run(self):
+        base_interval = WEBHOOK_FALLBACK_INTERVAL if GITHUB_WEBHOOK_SECRET else POLL_INTERVAL
+        interval = base_interval
+        while True:
+            try:
+                changed = await self.poll_once()
+            except Exception as e:
+                print(">>> Run poller error:", e)
+                changed = False
+
+            if not await asyncio.to_thread(self._in_flight):
+                # Nothing to watch: sleep until the next dispatch kicks us
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                interval = base_interval
+                continue
+
+            interval = base_interval if changed else min(interval * 2, max(POLL_MAX_INTERVAL, base_interval))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), interval)
+                self._wakeup.clear()
+                interval = base_interval
+            except asyncio.TimeoutError:
+                pass
+
+
+run_poller = RunPoller()
+
+
+# -------------------------------------------------------------------------
+# Shard planning
+# -------------------------------------------------------------------------
+def plan_shards(targets: List[str], shards: int) -> List[dict]:
+    """Split `targets` into at most `shards` contiguous, near-equal chunks.
+
+    Contiguous chunks of the catalog order keep a module's tests together,
+    so module-scoped setup is not repeated across shards.
+    """
+    count = max(1, min(shards, BATCH_MAX_SHARDS, len(targets)))
+    size, extra = divmod(len(targets), count)
+    plan, start = [], 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        plan.append({"index": index, "targets": targets[start:end]})
+        start = end
+    return plan
+
+
+def job_shards(job: dict) -> List[dict]:
+    # Single-test jobs run as a one-shard matrix
+    return job.get("shards") or [{"index": 0, "targets": [job["pytest_target"]]}]
+
+
+# -------------------------------------------------------------------------
+# Dispatch queue (at most MAX_ACTIVE_RUNS workflow runs at once)
+# -------------------------------------------------------------------------
+class DispatchQueue:
+    """Dispatches queued jobs, oldest first, while run slots are free.
+
+    Slots are claimed in the database (`JobStore.claim_next`), so the cap
+    holds across workers. The task is woken by `kick()` when a job is queued
+    and whenever a job leaves an active status; while jobs are waiting it
+    also re-checks every QUEUE_RECHECK_INTERVAL seconds.
+    """
+
+    def __init__(self, limit: int = MAX_ACTIVE_RUNS):
+        self.limit = limit
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        job_store.listeners.append(self._on_event)
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="dispatch-queue")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def kick(self):
+        """Check for free slots right away (safe to call from any thread)."""
+        if self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _on_event(self, event: dict):
+        if event["status"] not in ACTIVE_RUN_STATUSES:
+            self.kick()
+
+    async def dispatch_ready(self) -> int:
+        """Claim and dispatch queued jobs until the slots are full; returns how many."""
+        started = 0
+        while (job_id := await asyncio.to_thread(job_store.claim_next, ACTIVE_RUN_STATUSES, self.limit)):
+            spawn(background_monitor_job(job_id), f"dispatch-{job_id}")
+            started += 1
+        return started
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.to_thread(expire_stale_dispatches)
+                await self.dispatch_ready()
+            except Exception as e:
+                print(">>> Dispatch queue error:", e)
+
+            try:
+                waiting = await asyncio.to_thread(job_store.count, ("queued", "dispatching"))
+                timeout = QUEUE_RECHECK_INTERVAL if waiting else None
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+dispatch_queue = DispatchQueue()
+
+
+def expire_stale_dispatches() -> int:
+    """Fail jobs stuck in "dispatching" for over DISPATCH_TIMEOUT seconds.
+
+    A job is only in that state while some process is sending its
+    repository_dispatch; if that process died the job would otherwise hold
+    a MAX_ACTIVE_RUNS slot and its target's pending index forever. Failing
+    (rather than requeueing) avoids a second run when the dispatch had
+    reached GitHub before the crash.
+    """
+    cutoff = (datetime.now(timezone.utc) - timedelta(seconds=DISPATCH_TIMEOUT)).isoformat()
+    expired = 0
+    for job in job_store.with_status(("dispatching",)):
+        if (job.get("claimed_at") or job["created_at"]) < cutoff:
+            expired += job_store.transition(
+                job["job_id"], ("dispatching",), "dispatch_failed",
+                error=f"Dispatch did not finish within {DISPATCH_TIMEOUT}s (worker stopped?)",
+            )
+    return expired
 
-        if run_id:
-            break
 
-        time.sleep(POLL_INTERVAL)
+# -------------------------------------------------------------------------
+# Dispatch worker
+# -------------------------------------------------------------------------
+async def background_monitor_job(job_id: str):
+    """Dispatch a job claimed by the dispatch queue; the run poller / webhook
+    take it from there."""
+    job = await asyncio.to_thread(job_store.get, job_id)
+
+    pytest_target = job["pytest_target"]
 
-    if not run_id:
-        job["status"] = "workflow_not_found"
+    # Send workflow trigger; `matrix` is a JSON list of shards for the
+    # workflow's strategy (see ci-runner.yml)
+    matrix = [{"index": s["index"], "targets": " ".join(s["targets"])} for s in job_shards(job)]
+    client_payload = {
+        "job_id": job_id,
+        "pytest_target": pytest_target,
+        "requester": job["requester"],
+        "matrix": json.dumps(matrix)
+    }
+
+    # Transitions from "dispatching" only: a dispatch slow enough to be
+    # expired by expire_stale_dispatches() must not revive the job
+    try:
+        ok, resp = await trigger_github_workflow(client_payload)
+    except Exception as e:
+        await asyncio.to_thread(job_store.transition, job_id, ("dispatching",), "dispatch_failed", error=str(e))
+        return
+    if not ok:
+        await asyncio.to_thread(job_store.transition, job_id, ("dispatching",), "dispatch_failed", error=resp.text)
         return
 
-    job["workflow_run_id"] = run_id
-    job["status"] = "running"
+    await asyncio.to_thread(
+        job_store.transition,
+        job_id, ("dispatching",), "dispatched", dispatched_at=datetime.now(timezone.utc).isoformat(),
+    )
+    run_poller.kick()
 
-    # -------------------------------
-    # Poll until completed
-    # -------------------------------
-    while time.time() < deadline:
-        r = requests.get(
-            f"{API_BASE}/repos/{GITHUB_REPO}/actions/runs/{run_id}",
-            headers=HEADERS
-        )
-        data = r.json()
 
-        if data.get("status") == "completed":
-            job["conclusion"] = data.get("conclusion")
-            break
+# -------------------------------------------------------------------------
+# Report collection (runs once per job, after its workflow run completed)
+# -------------------------------------------------------------------------
+_collect_slots: Optional[asyncio.Semaphore] = None
 
-        time.sleep(POLL_INTERVAL)
 
-    job["status"] = "completed"
+async def start_report_collection(job_id: str):
+    """Start collecting the job's report in the background."""
+    # Only the caller that wins the transition collects the report
+    if not await asyncio.to_thread(job_store.transition, job_id, IN_FLIGHT_STATUSES, "completed"):
+        return
+    spawn(collect_report(job_id), f"collect-report-{job_id}")
+
+
+async def collect_report(job_id: str):
+    global _collect_slots
+    if _collect_slots is None:
+        _collect_slots = asyncio.Semaphore(REPORT_COLLECT_CONCURRENCY)
+    async with _collect_slots:
+        try:
+            await _collect_report(job_id)
+        except Exception as e:
+            # The job left IN_FLIGHT_STATUSES already: nothing retries it, so
+            # record the failure rather than leave it "completed" forever
+            print(f">>> Report collection for {job_id} failed:", e)
+            await asyncio.to_thread(
+                job_store.transition, job_id, ("completed",), "collect_failed", error=f"{type(e).__name__}: {e}"
+            )
+
+
+async def _collect_report(job_id: str):
+    job = await asyncio.to_thread(job_store.get, job_id)
+    run_id = job["workflow_run_id"]
+    shards = job_shards(job)
 
     # -------------------------------
-    # Fetch artifact
+    # Fetch artifacts (one per shard)
     # -------------------------------
-    a = requests.get(
+    a = (await github.get(
         f"{API_BASE}/repos/{GITHUB_REPO}/actions/runs/{run_id}/artifacts",
-        headers=HEADERS
-    ).json()
+        params={"per_page": 100}
+    )).json()
+
+    artifacts = {}
+    for artifact in a.get("artifacts", []):
+        m = ARTIFACT_NAME_RE.fullmatch(artifact["name"])
+        if m:
+            artifacts[int(m.group(1) or 0)] = artifact
 
-    artifacts = a.get("artifacts", [])
     if not artifacts:
-        job["status"] = "no_artifact"
+        await asyncio.to_thread(job_store.update, job_id, status="no_artifact")
         return
 
-    artifact_id = artifacts[0]["id"]
-    artifact_url = f"{API_BASE}/repos/{GITHUB_REPO}/actions/artifacts/{artifact_id}/zip"
-
-    html = download_and_extract_report(artifact_url)
-    if not html:
-        job["status"] = "artifact_missing"
+    report_path = None
+    results = {}
+    for shard in shards:
+        # Single-test jobs keep the plain /reports/{job_id}.html name
+        name = job_id if len(shards) == 1 else f"{job_id}-{shard['index']}"
+        out_path, outcomes, document = None, {}, None
+
+        artifact = artifacts.get(shard["index"])
+        if artifact:
+            artifact_url = f"{API_BASE}/repos/{GITHUB_REPO}/actions/artifacts/{artifact['id']}/zip"
+            # Download the report (gzip-compressed), then move it into the report store
+            out_path, outcomes, document = await download_artifact(artifact_url, REPORTS_DIR / f"{name}.html.gz")
+
+        if document:
+            try:
+                await asyncio.to_thread(
+                    result_store.ingest, name, "github", document,
+                    job_id=job_id, label=job.get("marker") or " ".join(shard["targets"]),
+                )
+            except Exception as e:
+                print(f">>> Could not store results of {name}:", e)
+
+        if out_path:
+            try:
+                await asyncio.to_thread(report_store.put, f"{name}.html", out_path)
+                out_path.unlink()
+            except Exception as e:
+                # Still served from the downloaded file
+                print(f">>> Could not store report {name}:", e)
+
+        shard["report"] = f"/reports/{name}.html" if out_path else None
+        report_path = report_path or shard["report"]
+        for target in shard["targets"]:
+            results[target] = outcomes.get(junit_key(target), "not_run")
+
+    if not report_path:
+        await asyncio.to_thread(job_store.update, job_id, status="artifact_missing", shards=shards, results=results)
         return
 
-    # Save report
-    out_path = REPORTS_DIR / f"{job_id}.html"
-    out_path.write_text(html, encoding="utf-8")
-
-    job["report_path"] = str(out_path)
-    job["status"] = "report_ready"
-    job["completed_at"] = datetime.now(timezone.utc).isoformat()
+    await asyncio.to_thread(
+        job_store.update,
+        job_id,
+        status="report_ready",
+        report_path=report_path,
+        shards=shards,
+        results=results,
+        completed_at=datetime.now(timezone.utc).isoformat(),
+    )
 
 
 # -------------------------------------------------------------------------
@@ -225,57 +731,247 @@ def background_monitor_job(job_id: str):
 @app.post("/api/run-test")
 def run_test(payload: RunTestPayload, background: BackgroundTasks):
 
-    test_map = discover_tests()
+    try:
+        pytest_target = test_catalog.resolve(payload.test_case)
+    except AmbiguousTestName as e:
+        raise HTTPException(400, str(e))
 
-    if payload.test_case not in test_map:
+    if not pytest_target:
         raise HTTPException(400, f"Test '{payload.test_case}' not found")
 
-    pytest_target = test_map[payload.test_case]
-    job_id = uuid.uuid4().hex
+    # Save job info, or attach to the pending job for the same target
+    job, created = job_store.create_or_attach(
+        job_id=uuid.uuid4().hex,
+        pytest_target=pytest_target,
+        requester=payload.requester,
+        status="queued",
+        created_at=datetime.now(timezone.utc).isoformat()
+    )
 
-    # Save job info
-    jobs[job_id] = {
-        "job_id": job_id,
+    # The dispatch queue starts it once a run slot is free
+    if created:
+        background.add_task(dispatch_queue.kick)
+
+    return {
+        "message": "Test started" if created else "Attached to pending job",
+        "job_id": job["job_id"],
         "pytest_target": pytest_target,
-        "requester": payload.requester,
-        "status": "queued",
-        "created_at": datetime.now(timezone.utc).isoformat()
+        "status": job["status"],
+        "attached": not created
     }
 
-    # Run background monitor
-    background.add_task(background_monitor_job, job_id)
+
+# -------------------------------------------------------------------------
+# API — Run Batch (many tests, one sharded workflow run)
+# -------------------------------------------------------------------------
+@app.post("/api/run-batch")
+def run_batch(payload: RunBatchPayload, background: BackgroundTasks):
+
+    if bool(payload.tests) == bool(payload.marker):
+        raise HTTPException(400, "Pass either 'tests' or 'marker'")
+
+    if payload.marker:
+        try:
+            targets = test_catalog.select(payload.marker)
+        except MarkerExpressionError as e:
+            raise HTTPException(400, str(e))
+    else:
+        targets, unknown = [], []
+        for test in payload.tests:
+            try:
+                target = test_catalog.resolve(test)
+            except AmbiguousTestName as e:
+                raise HTTPException(400, str(e))
+            if not target:
+                unknown.append(test)
+            elif target not in targets:
+                targets.append(target)
+        if unknown:
+            raise HTTPException(400, f"Tests not found: {', '.join(unknown)}")
+
+    if not targets:
+        raise HTTPException(400, "No tests match the selection")
+
+    # One parent job for the whole batch; results are tracked per target.
+    # An identical pending batch is reused like a single test.
+    job, created = job_store.create_or_attach(
+        job_id=uuid.uuid4().hex,
+        pytest_target=" ".join(targets),
+        marker=payload.marker,
+        shards=plan_shards(targets, payload.shards),
+        requester=payload.requester,
+        status="queued",
+        created_at=datetime.now(timezone.utc).isoformat()
+    )
+
+    if created:
+        background.add_task(dispatch_queue.kick)
 
     return {
-        "message": "Test started",
-        "job_id": job_id,
-        "pytest_target": pytest_target
+        "message": "Batch started" if created else "Attached to pending batch",
+        "job_id": job["job_id"],
+        "targets": len(targets),
+        "shards": job["shards"],
+        "status": job["status"],
+        "attached": not created
     }
 
 
+# -------------------------------------------------------------------------
+# API — GitHub workflow_run webhook
+# -------------------------------------------------------------------------
+@app.post("/api/github/webhook")
+async def github_webhook(request: Request):
+    if not GITHUB_WEBHOOK_SECRET:
+        raise HTTPException(403, "Webhook secret not configured")
+
+    body = await request.body()
+    expected = "sha256=" + hmac.new(GITHUB_WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    if not hmac.compare_digest(expected, request.headers.get("X-Hub-Signature-256", "")):
+        raise HTTPException(401, "Invalid signature")
+
+    event = request.headers.get("X-GitHub-Event")
+    if event == "ping":
+        return {"message": "pong"}
+    if event != "workflow_run":
+        return {"message": f"Ignored event '{event}'"}
+
+    run = json.loads(body).get("workflow_run", {})
+    job_id = job_id_from_run(run)
+    updated = await apply_run_update(job_id, run)
+
+    return {"job_id": job_id, "updated": updated}
+
+
 # -------------------------------------------------------------------------
 # API — Job Status
 # -------------------------------------------------------------------------
 @app.get("/api/job-status/{job_id}")
 def job_status(job_id: str):
-    if job_id not in jobs:
+    job = job_store.get(job_id)
+    if not job:
         raise HTTPException(404, "Job not found")
-    return jobs[job_id]
+    if job["status"] == "queued":
+        job["queue_position"] = job_store.queue_position(job)
+    if job.get("results"):
+        job["summary"] = {o: list(job["results"].values()).count(o) for o in JUNIT_OUTCOMES + ("not_run",)}
+    return job
+
+
+# -------------------------------------------------------------------------
+# API — Job Events (server-sent events, several jobs per connection)
+# -------------------------------------------------------------------------
+def sse_message(data: dict, event: str, seq: Optional[int] = None) -> str:
+    lines = [f"id: {seq}"] if seq is not None else []
+    lines += [f"event: {event}", f"data: {json.dumps(data)}"]
+    return "\n".join(lines) + "\n\n"
+
+
+@app.get("/api/job-events")
+async def job_event_stream(request: Request, job_id: List[str] = Query(...)):
+    """Stream status changes of `?job_id=a&job_id=b` (or `?job_id=a,b`).
+
+    Starts with a `status` event per job (or, with `Last-Event-ID`, replays
+    what was missed), then pushes each change as it is recorded. Ends with an
+    `end` event once every job reached a terminal status.
+    """
+    job_ids = list(dict.fromkeys(j for value in job_id for j in value.split(",") if j))
+    unknown = [j for j in job_ids if not await asyncio.to_thread(job_store.get, j)]
+    if unknown:
+        raise HTTPException(404, f"Jobs not found: {', '.join(unknown)}")
+
+    last_event_id = request.headers.get("last-event-id", "")
+    sub = await job_events.subscribe(job_ids)
+
+    async def stream():
+        try:
+            statuses = {}
+            if last_event_id.isdigit():
+                last_seq = int(last_event_id)
+                for event in await asyncio.to_thread(job_store.events_since, last_seq, job_ids):
+                    last_seq = event["seq"]
+                    yield sse_message(event["job"], "status", event["seq"])
+                for j in job_ids:
+                    statuses[j] = (await asyncio.to_thread(job_store.get, j))["status"]
+            else:
+                last_seq = await asyncio.to_thread(job_store.last_event_seq)
+                for j in job_ids:
+                    job = await asyncio.to_thread(job_store.get, j)
+                    statuses[j] = job["status"]
+                    yield sse_message(job, "status", last_seq)
+
+            while not all(s in TERMINAL_STATUSES for s in statuses.values()):
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), SSE_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event["seq"] <= last_seq:
+                    continue
+                last_seq = event["seq"]
+                statuses[event["job_id"]] = event["status"]
+                yield sse_message(event["job"], "status", event["seq"])
+
+            yield sse_message({"job_ids": job_ids}, "end")
+        finally:
+            job_events.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# -------------------------------------------------------------------------
+# API — Job History (newest first, paginated)
+# -------------------------------------------------------------------------
+@app.get("/api/jobs")
+def job_history(limit: int = Query(50, ge=1, le=200), offset: int = Query(0, ge=0),
+                status: Optional[str] = None, requester: Optional[str] = None):
+    total, items = job_store.history(limit, offset, status=status, requester=requester)
+    return {"total": total, "limit": limit, "offset": offset, "jobs": items}
 
 
 # -------------------------------------------------------------------------
 # API — Fetch HTML Report
 # -------------------------------------------------------------------------
 @app.get("/reports/{job_id}.html")
-def get_report(job_id: str):
-    path = REPORTS_DIR / f"{job_id}.html"
-    if not path.exists():
-        raise HTTPException(404, "Report not ready")
-    return FileResponse(path, media_type="text/html")
+async def get_report(job_id: str, request: Request):
+    report = await asyncio.to_thread(report_store.get, f"{job_id}.html")
+    if report is not None:
+        return stored_report_response(request, report, report_store.iter_range)
+    # Reports from before the store: {job_id}.html.gz, or plain .html
+    return await report_response(request, REPORTS_DIR / f"{job_id}.html")
+
+
+# -------------------------------------------------------------------------
+# API — GitHub API usage (calls, latency, rate-limit budget)
+# -------------------------------------------------------------------------
+@app.get("/api/github/metrics")
+def github_metrics():
+    return github.stats()
 
 
 # -------------------------------------------------------------------------
 # API — For Dropdown Test List
 # -------------------------------------------------------------------------
+def _catalog_response(request: Request, render) -> Response:
+    """`render(tests)` as JSON, or a 304 while the catalog is unchanged."""
+    etag, tests = test_catalog.snapshot()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(render(tests), headers=headers)
+
+
 @app.get("/api/test-list")
-def test_list():
-    return discover_tests()
+def test_list(request: Request):
+    """Test function name -> pytest node id."""
+    return _catalog_response(request, lambda tests: {t["id"]: t["pytest"] for t in tests})
+
+
+@app.get("/api/test-catalog")
+def test_catalog_list(request: Request):
+    """Every test with its markers, parametrization and location."""
+    return _catalog_response(request, lambda tests: {"tests": tests})
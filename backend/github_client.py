@@ -0,0 +1,217 @@
+# backend/github_client.py
+import asyncio
+import random
+import threading
+import time
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+
+import httpx
+
+# Methods that are safe to send again after a failure
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Statuses worth retrying (idempotent calls only)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class AsyncGitHubClient:
+    """asyncio GitHub REST client on one pooled `httpx.AsyncClient`.
+
+    * Idempotent calls are retried on connection errors, 5xx, 429 and
+      rate-limit 403s with exponential backoff and full jitter; a
+      `Retry-After` header wins over the computed delay.
+    * `X-RateLimit-Remaining` / `X-RateLimit-Reset` are tracked; once the
+      remaining budget drops below `low_budget`, calls are spaced out so the
+      budget lasts until the reset instead of running dry.
+    * `stats()` reports call counts, statuses, latency and the budget.
+
+    Waits (throttling, backoff) use `asyncio.sleep`, so any number of jobs
+    can be supervised from one event loop without tying up threads.
+    """
+
+    def __init__(self, headers: dict, pool_size: int = 20, max_retries: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 30.0, low_budget: int = 200, timeout: float = 30.0):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.low_budget = low_budget
+        self.timeout = timeout
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout,
+            follow_redirects=True,   # artifact downloads redirect to blob storage
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+
+        self._lock = threading.Lock()
+        self.rate_limit = {"limit": None, "remaining": None, "reset": None}
+        self.calls = 0
+        self.retries = 0
+        self.errors = 0
+        self.throttled_seconds = 0.0
+        self.statuses = Counter()
+        self.latencies = deque(maxlen=500)
+
+    # ---------------------------------------------------------------------
+    # Rate limit handling
+    # ---------------------------------------------------------------------
+    def _update_rate_limit(self, resp):
+        headers = resp.headers
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        try:
+            with self._lock:
+                self.rate_limit = {
+                    "limit": int(headers.get("X-RateLimit-Limit", 0)),
+                    "remaining": int(headers["X-RateLimit-Remaining"]),
+                    "reset": int(headers.get("X-RateLimit-Reset", 0)),
+                }
+        except ValueError:
+            pass
+
+    def _throttle_delay(self) -> float:
+        with self._lock:
+            remaining = self.rate_limit["remaining"]
+            reset = self.rate_limit["reset"]
+        if remaining is None or reset is None or remaining >= self.low_budget:
+            return 0.0
+        window = max(reset - time.time(), 0.0)
+        # Spread what is left evenly over the time until the reset
+        return min(window / max(remaining, 1), window)
+
+    def _retry_delay(self, attempt: int, resp=None) -> float:
+        if resp is not None:
+            retry_after = resp.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.max_backoff * 4)
+                except ValueError:
+                    pass
+            if resp.headers.get("X-RateLimit-Remaining") == "0":
+                reset = int(resp.headers.get("X-RateLimit-Reset", 0) or 0)
+                return min(max(reset - time.time(), 1.0), self.max_backoff * 4)
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    @staticmethod
+    def _should_retry(resp) -> bool:
+        if resp.status_code in RETRY_STATUSES:
+            return True
+        # Primary / secondary rate limits come back as 403
+        return resp.status_code == 403 and (
+            resp.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in resp.headers
+        )
+
+    # ---------------------------------------------------------------------
+    # Bookkeeping
+    # ---------------------------------------------------------------------
+    def _attempts(self, method: str) -> int:
+        return self.max_retries + 1 if method in IDEMPOTENT_METHODS else 1
+
+    def _note_throttle(self) -> float:
+        delay = self._throttle_delay()
+        if delay:
+            with self._lock:
+                self.throttled_seconds += delay
+        return delay
+
+    def _note_error(self, will_retry: bool):
+        with self._lock:
+            self.calls += 1
+            self.errors += 1
+            if will_retry:
+                self.retries += 1
+
+    def _note_response(self, resp, start: float, will_retry: bool):
+        with self._lock:
+            self.calls += 1
+            self.statuses[resp.status_code] += 1
+            self.latencies.append(time.monotonic() - start)
+            if will_retry:
+                self.retries += 1
+        self._update_rate_limit(resp)
+
+    # ---------------------------------------------------------------------
+    # Metrics
+    # ---------------------------------------------------------------------
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            rate_limit = dict(self.rate_limit)
+            stats = {
+                "calls": self.calls,
+                "retries": self.retries,
+                "errors": self.errors,
+                "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+                "throttled_seconds": round(self.throttled_seconds, 3),
+            }
+
+        def pct(p):
+            if not latencies:
+                return None
+            return round(latencies[min(int(p * len(latencies)), len(latencies) - 1)] * 1000, 1)
+
+        stats["latency_ms"] = {
+            "avg": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else None,
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "max": round(latencies[-1] * 1000, 1) if latencies else None,
+        }
+        stats["rate_limit"] = rate_limit
+        if rate_limit["reset"]:
+            stats["rate_limit"]["reset_in_seconds"] = max(int(rate_limit["reset"] - time.time()), 0)
+        stats["throttling"] = self._throttle_delay() > 0
+        return stats
+
+    # ---------------------------------------------------------------------
+    # Requests
+    # ---------------------------------------------------------------------
+    async def request(self, method: str, url: str, stream: bool = False, **kwargs) -> httpx.Response:
+        """Send a request; with `stream=True` the body is left unread (close it with `aclose()`)."""
+        method = method.upper()
+        attempts = self._attempts(method)
+
+        for attempt in range(attempts):
+            delay = self._note_throttle()
+            if delay:
+                await asyncio.sleep(delay)
+
+            start = time.monotonic()
+            try:
+                req = self.client.build_request(method, url, **kwargs)
+                resp = await self.client.send(req, stream=stream)
+            except (httpx.TransportError, httpx.TimeoutException):
+                self._note_error(attempt + 1 < attempts)
+                if attempt + 1 >= attempts:
+                    raise
+                await asyncio.sleep(self._retry_delay(attempt))
+                continue
+
+            retry = attempt + 1 < attempts and self._should_retry(resp)
+            self._note_response(resp, start, retry)
+            if retry:
+                await resp.aclose()
+                await asyncio.sleep(self._retry_delay(attempt, resp))
+                continue
+            return resp
+
+        return resp
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs):
+        """`async with client.stream("GET", url) as resp:` -- body read with `aiter_bytes()`."""
+        resp = await self.request(method, url, stream=True, **kwargs)
+        try:
+            yield resp
+        finally:
+            await resp.aclose()
+
+    async def aclose(self):
+        await self.client.aclose()
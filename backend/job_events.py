@@ -0,0 +1,92 @@
+# backend/job_events.py
+import asyncio
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from backend.job_store import JobStore, event_origin
+
+# How often (seconds) events recorded by other workers are picked up
+EVENT_TAIL_INTERVAL = 0.5
+
+
+class Subscription:
+    """Queue of events for a set of job ids, owned by one event loop."""
+
+    def __init__(self, job_ids: Iterable[str], loop: asyncio.AbstractEventLoop):
+        self.job_ids = set(job_ids)
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+
+class JobEventBus:
+    """Fans job status events out to SSE subscribers.
+
+    Events written by this process arrive through the store's listener hook
+    and are delivered immediately. Events written by other workers are read
+    from the shared `job_event` table by a tail thread, which only runs while
+    somebody is subscribed.
+    """
+
+    def __init__(self, store: JobStore, tail_interval: float = EVENT_TAIL_INTERVAL):
+        self.store = store
+        self.tail_interval = tail_interval
+        self._subscribers: Dict[int, Subscription] = {}
+        self._lock = threading.Lock()
+        self._tail_thread: Optional[threading.Thread] = None
+        self._last_seq = 0
+        store.listeners.append(self.publish)
+
+    def publish(self, event: dict):
+        """Deliver `event` to every subscriber of its job (any thread)."""
+        with self._lock:
+            targets = [s for s in self._subscribers.values() if event["job_id"] in s.job_ids]
+        for sub in targets:
+            try:
+                sub.loop.call_soon_threadsafe(sub.queue.put_nowait, event)
+            except RuntimeError:
+                # The subscriber's loop is already closed
+                pass
+
+    async def subscribe(self, job_ids: Iterable[str]) -> Subscription:
+        sub = Subscription(job_ids, asyncio.get_running_loop())
+        # The tail starts from the newest event; read it off the event loop
+        seq = None
+        if not self._tail_running():
+            seq = await asyncio.to_thread(self.store.last_event_seq)
+        with self._lock:
+            self._subscribers[id(sub)] = sub
+            if not self._tail_running():
+                # A tail that stopped in the meantime left `_last_seq` current
+                if seq is not None:
+                    self._last_seq = seq
+                self._tail_thread = threading.Thread(target=self._tail, name="job-event-tail", daemon=True)
+                self._tail_thread.start()
+        return sub
+
+    def _tail_running(self) -> bool:
+        return self._tail_thread is not None and self._tail_thread.is_alive()
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            self._subscribers.pop(id(sub), None)
+
+    def _tail(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._tail_thread = None
+                    return
+                job_ids = set().union(*(s.job_ids for s in self._subscribers.values()))
+
+            try:
+                origin = event_origin()
+                for event in self.store.events_since(self._last_seq):
+                    self._last_seq = event["seq"]
+                    # Our own events were already delivered by `publish`
+                    if event["origin"] != origin and event["job_id"] in job_ids:
+                        self.publish(event)
+            except Exception as e:
+                print(">>> Job event tail error:", e)
+
+            time.sleep(self.tail_interval)
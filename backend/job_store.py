@@ -0,0 +1,321 @@
+# backend/job_store.py
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import JSON, Column, Index, delete, event, false, func, inspect, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Field, Session, SQLModel, create_engine, select
+
+# One SQLite file shared by every uvicorn worker
+JOB_DB_URL = os.getenv(
+    "JOB_DB_URL", f"sqlite:///{Path(__file__).resolve().parent / 'jobs.db'}"
+)
+
+# How long (ms) a writer waits for another worker's lock before failing
+SQLITE_BUSY_TIMEOUT = 10000
+
+# A job in one of these states owns its pytest_target: an identical request
+# attaches to it instead of starting another run
+PENDING_STATUSES = ("queued", "dispatching", "dispatched", "running")
+
+# Status events are kept this long (clients resume with Last-Event-ID)
+EVENT_RETENTION = timedelta(hours=24)
+
+
+def event_origin() -> str:
+    """Identifies the process that recorded an event (workers may be forked)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Job(SQLModel, table=True):
+    """One test run requested through the API.
+
+    Timestamps are UTC ISO-8601 strings (as returned by the API), which sort
+    the same way as the datetimes they encode.
+    """
+    job_id: str = Field(primary_key=True)
+    pytest_target: str
+    requester: Optional[str] = Field(default=None, index=True)
+    status: str = Field(index=True)
+    created_at: str = Field(index=True)
+    claimed_at: Optional[str] = None           # taken off the queue for dispatch
+    dispatched_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    workflow_run_id: Optional[int] = None
+    run_status: Optional[str] = None
+    conclusion: Optional[str] = None
+    report_path: Optional[str] = None
+    error: Optional[str] = None
+    # Batch runs: selection, shard plan and per-target outcome
+    marker: Optional[str] = None
+    shards: Optional[list] = Field(default=None, sa_column=Column(JSON))
+    results: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    # Identical requests that attached to this job while it was pending
+    attached: Optional[list] = Field(default=None, sa_column=Column(JSON))
+
+
+# At most one pending job per target, enforced by the database so that
+# concurrent requests (in any worker) cannot both create one
+Index(
+    "ix_job_pending_target",
+    Job.pytest_target,
+    unique=True,
+    sqlite_where=Job.status.in_(PENDING_STATUSES),
+    postgresql_where=Job.status.in_(PENDING_STATUSES),
+)
+
+
+class JobEvent(SQLModel, table=True):
+    """One recorded status change, with the job as it was right after it."""
+    __tablename__ = "job_event"
+
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    job_id: str = Field(index=True)
+    status: str
+    origin: str
+    created_at: str = Field(index=True)
+    job: dict = Field(sa_column=Column(JSON))
+
+
+class JobStore:
+    """SQLite-backed job table, safe to share between processes.
+
+    * The database runs in WAL mode with a busy timeout, so API workers can
+      read while another one writes.
+    * `transition()` is a single conditional `UPDATE`, so exactly one caller
+      wins a status change even when several workers race for it.
+    * Jobs are returned as plain dicts with `None` fields left out, matching
+      what `/api/job-status` has always returned.
+    * Every status change is recorded as a `JobEvent` in the same
+      transaction and handed to the in-process `listeners` after commit.
+    """
+
+    def __init__(self, url: str = JOB_DB_URL):
+        connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+        self.engine = create_engine(url, connect_args=connect_args)
+        if url.startswith("sqlite"):
+            event.listen(self.engine, "connect", self._sqlite_pragmas)
+        # Other stores keep their tables in their own databases
+        SQLModel.metadata.create_all(self.engine, tables=[Job.__table__, JobEvent.__table__])
+        self._migrate()
+        self.listeners: List[Callable[[dict], None]] = []
+
+    @staticmethod
+    def _sqlite_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    def _migrate(self):
+        """`create_all()` never alters a table; add columns and indexes introduced since it was created."""
+        table = Job.__table__
+        existing = {c["name"] for c in inspect(self.engine).get_columns(table.name)}
+        with self.engine.begin() as conn:
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(self.engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+        for index in table.indexes:
+            try:
+                index.create(self.engine, checkfirst=True)
+            except IntegrityError as e:
+                print(f">>> Cannot create index {index.name}:", e)
+
+    @staticmethod
+    def _as_dict(job: Job) -> dict:
+        values = ((name, getattr(job, name)) for name in Job.model_fields)
+        return {name: value for name, value in values if value is not None}
+
+    # ---------------------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------------------
+    def get(self, job_id: str) -> Optional[dict]:
+        with Session(self.engine) as session:
+            job = session.get(Job, job_id)
+            return self._as_dict(job) if job else None
+
+    def with_status(self, statuses: Iterable[str]) -> List[dict]:
+        with Session(self.engine) as session:
+            rows = session.exec(select(Job).where(Job.status.in_(list(statuses))))
+            return [self._as_dict(job) for job in rows]
+
+    def history(self, limit: int = 50, offset: int = 0, status: Optional[str] = None,
+                requester: Optional[str] = None) -> Tuple[int, List[dict]]:
+        """Newest-first page of jobs, optionally filtered; returns `(total, jobs)`."""
+        query = select(Job)
+        count = select(func.count()).select_from(Job)
+        if status:
+            query = query.where(Job.status == status)
+            count = count.where(Job.status == status)
+        if requester:
+            query = query.where(Job.requester == requester)
+            count = count.where(Job.requester == requester)
+
+        with Session(self.engine) as session:
+            total = session.exec(count).one()
+            rows = session.exec(query.order_by(Job.created_at.desc()).offset(offset).limit(limit))
+            return total, [self._as_dict(job) for job in rows]
+
+    def count(self, statuses: Iterable[str]) -> int:
+        with Session(self.engine) as session:
+            return session.exec(
+                select(func.count()).select_from(Job).where(Job.status.in_(list(statuses)))
+            ).one()
+
+    def queue_position(self, job: dict) -> int:
+        """1-based position of a queued job (oldest first)."""
+        with Session(self.engine) as session:
+            ahead = session.exec(
+                select(func.count()).select_from(Job)
+                .where(Job.status == "queued", Job.created_at < job["created_at"])
+            ).one()
+            return ahead + 1
+
+    def events_since(self, seq: int, job_ids: Optional[Iterable[str]] = None,
+                     limit: int = 500) -> List[dict]:
+        """Events recorded after `seq` (oldest first), optionally for some jobs only."""
+        query = select(JobEvent).where(JobEvent.seq > seq)
+        if job_ids is not None:
+            query = query.where(JobEvent.job_id.in_(list(job_ids)))
+        with Session(self.engine) as session:
+            rows = session.exec(query.order_by(JobEvent.seq).limit(limit))
+            return [event.model_dump() for event in rows]
+
+    def last_event_seq(self) -> int:
+        with Session(self.engine) as session:
+            return session.exec(select(func.max(JobEvent.seq))).one() or 0
+
+    # ---------------------------------------------------------------------
+    # Writes
+    # ---------------------------------------------------------------------
+    def _record_event(self, session: Session, job_id: str) -> JobEvent:
+        job = session.get(Job, job_id)
+        event = JobEvent(
+            job_id=job_id,
+            status=job.status,
+            origin=event_origin(),
+            created_at=datetime.now(timezone.utc).isoformat(),
+            job=self._as_dict(job),
+        )
+        session.add(event)
+        return event
+
+    @staticmethod
+    def _lock_for_write(session: Session):
+        """Start the session's transaction with a no-op write, which takes
+        SQLite's write lock up front instead of at the first real write."""
+        session.exec(update(Job).where(false()).values(status=Job.status))
+
+    def _commit_event(self, session: Session, event: JobEvent):
+        session.commit()
+        session.refresh(event)
+        data = event.model_dump()
+        for listener in list(self.listeners):
+            try:
+                listener(data)
+            except Exception as e:
+                print(">>> Job event listener error:", e)
+
+    def create(self, **fields) -> dict:
+        """Insert a job; raises `IntegrityError` if its target already has a pending job."""
+        job = Job(**fields)
+        with Session(self.engine) as session:
+            session.add(job)
+            session.flush()
+            event = self._record_event(session, job.job_id)
+            # Old events are only needed for Last-Event-ID resumption
+            cutoff = (datetime.now(timezone.utc) - EVENT_RETENTION).isoformat()
+            session.exec(delete(JobEvent).where(JobEvent.created_at < cutoff))
+            self._commit_event(session, event)
+            session.refresh(job)
+            return self._as_dict(job)
+
+    def create_or_attach(self, requester: Optional[str] = None, **fields) -> Tuple[dict, bool]:
+        """Create a job, or attach `requester` to the pending job for the same target.
+
+        Returns `(job, created)`.
+        """
+        for _ in range(3):
+            try:
+                return self.create(requester=requester, **fields), True
+            except IntegrityError:
+                pass
+
+            with Session(self.engine) as session:
+                # Read-modify-write of `attached`: hold the write lock from
+                # the SELECT on, so concurrent attaches cannot drop entries
+                self._lock_for_write(session)
+                job = session.exec(
+                    select(Job).where(Job.pytest_target == fields["pytest_target"],
+                                      Job.status.in_(PENDING_STATUSES))
+                ).first()
+                if job is None:
+                    # It finished in between; try creating again
+                    continue
+                attached = list(job.attached or [])
+                attached.append({"requester": requester, "at": datetime.now(timezone.utc).isoformat()})
+                session.exec(update(Job).where(Job.job_id == job.job_id).values(attached=attached))
+                session.commit()
+                session.refresh(job)
+                return self._as_dict(job), False
+
+        raise RuntimeError(f"Could not create or attach a job for {fields['pytest_target']}")
+
+    def claim_next(self, active_statuses: Iterable[str], limit: int,
+                   to_status: str = "dispatching") -> Optional[str]:
+        """Move the oldest queued job to `to_status` if fewer than `limit` jobs are active.
+
+        The capacity check and the claim are one `UPDATE`, so workers sharing
+        the database never exceed `limit` between them. Returns the job id.
+        """
+        active_statuses = list(active_statuses)
+        with Session(self.engine) as session:
+            oldest = session.exec(
+                select(Job.job_id).where(Job.status == "queued").order_by(Job.created_at).limit(1)
+            ).first()
+            if oldest is None:
+                return None
+
+            active = select(func.count()).select_from(Job).where(Job.status.in_(active_statuses))
+            result = session.exec(
+                update(Job)
+                .where(Job.job_id == oldest, Job.status == "queued", active.scalar_subquery() < limit)
+                .values(status=to_status, claimed_at=datetime.now(timezone.utc).isoformat())
+            )
+            if result.rowcount != 1:
+                return None
+            self._commit_event(session, self._record_event(session, oldest))
+            return oldest
+
+    def update(self, job_id: str, **fields) -> bool:
+        """Set `fields` on the job unconditionally; returns False if it does not exist."""
+        with Session(self.engine) as session:
+            result = session.exec(update(Job).where(Job.job_id == job_id).values(**fields))
+            if result.rowcount != 1:
+                return False
+            if "status" in fields:
+                self._commit_event(session, self._record_event(session, job_id))
+            else:
+                session.commit()
+            return True
+
+    def transition(self, job_id: str, from_statuses: Iterable[str], to_status: str, **fields) -> bool:
+        """Move the job to `to_status` only if it is currently in `from_statuses`.
+
+        Returns True for the one caller whose update applied.
+        """
+        with Session(self.engine) as session:
+            result = session.exec(
+                update(Job)
+                .where(Job.job_id == job_id, Job.status.in_(list(from_statuses)))
+                .values(status=to_status, **fields)
+            )
+            if result.rowcount != 1:
+                return False
+            self._commit_event(session, self._record_event(session, job_id))
+            return True
@@ -0,0 +1,212 @@
+# backend/report_files.py
+import asyncio
+import gzip
+import os
+import shutil
+import tempfile
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Clients and proxies may keep a copy but revalidate it (a cheap 304) first
+CACHE_CONTROL = "no-cache"
+
+# Smaller reports are not worth a compressed copy
+GZIP_MIN_SIZE = 1024
+
+VALIDATOR_HEADERS = ("etag", "last-modified", "cache-control", "vary")
+
+
+def accepts_gzip(request: Request) -> bool:
+    """True unless the client did not list gzip or refused it with `q=0`."""
+    for coding in request.headers.get("accept-encoding", "").lower().split(","):
+        name, _, params = coding.partition(";")
+        if name.strip() in ("gzip", "*"):
+            q = params.strip().removeprefix("q=")
+            try:
+                return not params or float(q) > 0
+            except ValueError:
+                return True
+    return False
+
+
+def gzip_path(path: Path) -> Path:
+    return path.with_name(path.name + ".gz")
+
+
+def compress_report(path: Path) -> Path:
+    """Write `<path>.gz` next to the report (atomically) and return it."""
+    out = gzip_path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".gz.tmp")
+    try:
+        with open(path, "rb") as src, os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as dst:
+            shutil.copyfileobj(src, dst, STREAM_CHUNK_SIZE)
+        os.replace(tmp, out)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return out
+
+
+def _not_modified(request: Request, headers) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        if if_none_match.strip() == "*":
+            return True
+        return headers["etag"] in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and "last-modified" in headers:
+        try:
+            return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(headers["last-modified"])
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _conditional(request: Request, response: Response) -> Response:
+    """Turn `response` into a bodiless 304 when the client's copy is current."""
+    if not _not_modified(request, response.headers):
+        return response
+    headers = {k: response.headers[k] for k in VALIDATOR_HEADERS if k in response.headers}
+    return Response(status_code=304, headers=headers)
+
+
+def _file_response(path: Path, **headers) -> FileResponse:
+    # Passing the stat result fills in ETag / Last-Modified up front
+    return FileResponse(
+        path,
+        media_type="text/html",
+        stat_result=os.stat(path),
+        headers={"Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding", **headers},
+    )
+
+
+async def report_response(request: Request, path: Path) -> Response:
+    """Serve the HTML report at `path` (or its `<path>.gz` copy).
+
+    gzip-capable clients get the compressed file as-is; a plain report is
+    compressed on first request and kept alongside it. Both variants are
+    file responses, so they stream from disk and honour `Range`,
+    `If-None-Match` and `If-Modified-Since`. A report that only exists
+    compressed is inflated on the fly for clients without gzip.
+    """
+    gz_path = gzip_path(path)
+    try:
+        html_stat = os.stat(path)
+    except FileNotFoundError:
+        html_stat = None
+
+    if html_stat is None and not gz_path.exists():
+        raise HTTPException(404, "Report not found")
+
+    if accepts_gzip(request):
+        if html_stat is not None and html_stat.st_size >= GZIP_MIN_SIZE:
+            try:
+                stale = os.stat(gz_path).st_mtime < html_stat.st_mtime
+            except FileNotFoundError:
+                stale = True
+            if stale:
+                # Compressing a big report is CPU / disk bound: off the loop
+                await asyncio.to_thread(compress_report, path)
+        if gz_path.exists():
+            return _conditional(request, _file_response(gz_path, **{"Content-Encoding": "gzip"}))
+
+    if html_stat is not None:
+        return _conditional(request, _file_response(path))
+
+    # Only the compressed copy exists (e.g. reports downloaded by gh_runner)
+    validators = _file_response(gz_path).headers
+    headers = {
+        "ETag": validators["etag"][:-1] + '-identity"',
+        "Last-Modified": validators["last-modified"],
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+
+    def inflate():
+        with gzip.open(gz_path, "rb") as f:
+            while chunk := f.read(STREAM_CHUNK_SIZE):
+                yield chunk
+
+    return _conditional(request, StreamingResponse(inflate(), media_type="text/html", headers=headers))
+
+
+def _byte_range(request: Request, size: int, headers: dict) -> Optional[Tuple[int, int]]:
+    """The `[start, end)` a `Range: bytes=...` request asks for, or None for
+    the whole body (no or multiple ranges, or an outdated `If-Range`)."""
+    header = request.headers.get("range", "")
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec or "," in spec:
+        return None
+    if_range = request.headers.get("if-range")
+    if if_range and if_range not in (headers["ETag"], headers["Last-Modified"]):
+        return None
+
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last) + 1, size) if last else size
+        else:
+            # "bytes=-N": the last N bytes
+            start, end = max(size - int(last), 0), size
+    except ValueError:
+        return None
+    if start >= end:
+        raise HTTPException(416, "Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _gzip_stream(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Compress `chunks` into a single gzip member as they are produced."""
+    # wbits=31: gzip header / trailer, mtime 0, so the output is repeatable
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        if out := compressor.compress(chunk):
+            yield out
+    yield compressor.flush()
+
+
+def stored_report_response(request: Request, report: dict,
+                           read_range: Callable[..., Iterator[bytes]]) -> Response:
+    """Serve a report kept in the report store (`report` is its index entry).
+
+    The body is reassembled blob by blob as it is sent, by
+    `read_range(report, start, end)`. gzip-capable clients get it compressed
+    on the fly as one gzip member (blobs are separate members on disk, and
+    browsers stop after the first member of a stream). Its length is not
+    known up front, so a `Range` request is answered from the plain bytes.
+    """
+    size = report["size"]
+    encoded = size >= GZIP_MIN_SIZE and accepts_gzip(request) and "range" not in request.headers
+    headers = {
+        "ETag": f'"{report["digest"]}-gzip"' if encoded else f'"{report["digest"]}"',
+        "Last-Modified": formatdate(report["created_at"], usegmt=True),
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+        "Accept-Ranges": "bytes",
+    }
+    if _not_modified(request, {k.lower(): v for k, v in headers.items()}):
+        return Response(status_code=304, headers={k: v for k, v in headers.items() if k.lower() in VALIDATOR_HEADERS})
+
+    if encoded:
+        headers["Content-Encoding"] = "gzip"
+        return StreamingResponse(_gzip_stream(read_range(report)), media_type="text/html", headers=headers)
+
+    span = _byte_range(request, size, headers)
+    if span is None:
+        start, end, status = 0, size, 200
+    else:
+        (start, end), status = span, 206
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    headers["Content-Length"] = str(end - start)
+    return StreamingResponse(
+        read_range(report, start, end), status_code=status, media_type="text/html", headers=headers
+    )
@@ -0,0 +1,422 @@
+# backend/report_store.py
+import argparse
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional
+
+from sqlalchemy import JSON, Column, delete, event, func, inspect, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Field, Session, SQLModel, create_engine, select
+
+from backend.job_store import SQLITE_BUSY_TIMEOUT
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Shared by run_tests.py and gh_runner.py (both may write to it)
+REPORT_STORE_DIR = Path(os.getenv("REPORT_STORE_DIR", BASE_DIR / "report_store"))
+
+# Disk space the stored blobs may use; least recently read reports go first
+REPORT_STORE_BUDGET = int(os.getenv("REPORT_STORE_BUDGET_MB", "1024")) * 1024 * 1024
+
+# Inline assets smaller than this stay part of the surrounding page blob
+MIN_ASSET_SIZE = 4096
+
+# Reading a report refreshes its LRU position at most this often (seconds)
+TOUCH_INTERVAL = 60
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Reports are split while being read, this much at a time
+SPLIT_CHUNK_SIZE = 1024 * 1024
+
+# Blob files the index does not know are deleted once this old (seconds);
+# younger ones may belong to a `put` that has not committed yet
+ORPHAN_GRACE = 3600
+
+# `evict` looks for such files at most this often (seconds)
+SWEEP_INTERVAL = 3600
+
+# Parts of a self-contained pytest-html report that repeat across reports:
+# the inline CSS / JS, and base64 payloads (screenshots, data: URIs)
+_ASSET_RE = re.compile(
+    rb"<(?:style|script)\b[^>]*>(.+?)</(?:style|script)>"
+    rb"|([A-Za-z0-9+/]{%d,}={0,2})" % MIN_ASSET_SIZE,
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+_OPEN_TAG_RE = re.compile(rb"<(?:style|script)\b", re.IGNORECASE)
+_CLOSE_TAG_RE = re.compile(rb"</(?:style|script)>", re.IGNORECASE)
+_BASE64_CHARS = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+
+
+def _split_limit(buf: bytes) -> int:
+    """How much of `buf` can be split now: an asset that may continue past
+    its end (an unclosed `<style>` / `<script>`, a trailing base64 run or a
+    half-read tag) is held back until more is read."""
+    limit = len(buf)
+    opening = None
+    for opening in _OPEN_TAG_RE.finditer(buf):
+        pass
+    if opening is not None and not _CLOSE_TAG_RE.search(buf, opening.end()):
+        limit = opening.start()
+    tag = buf.rfind(b"<", max(limit - 8, 0), limit)
+    if tag != -1 and b">" not in buf[tag:limit]:
+        limit = tag
+    return len(buf[:limit].rstrip(_BASE64_CHARS))
+
+
+def split_report(f: BinaryIO) -> Iterator[bytes]:
+    """Cut the report read from `f` into pieces whose concatenation is the
+    original bytes, with every large inline asset in a piece of its own.
+
+    Only the text between assets and the asset being read are held in
+    memory, never the whole report.
+    """
+    buf = b""
+    while True:
+        # Read at least as much again as is held back, so a long asset is
+        # rescanned a logarithmic number of times
+        data = f.read(max(SPLIT_CHUNK_SIZE, len(buf)))
+        buf += data
+        limit = _split_limit(buf) if data else len(buf)
+        pos = 0
+        for m in _ASSET_RE.finditer(buf, 0, limit):
+            group = 1 if m.group(1) is not None else 2
+            start, end = m.span(group)
+            if end - start < MIN_ASSET_SIZE:
+                continue
+            if start > pos:
+                yield buf[pos:start]
+            yield buf[start:end]
+            pos = end
+        if limit > pos:
+            yield buf[pos:limit]
+        buf = buf[limit:]
+        if not data:
+            return
+
+
+class StoredReport(SQLModel, table=True):
+    """A report as the ordered list of blobs it is made of."""
+    __tablename__ = "stored_report"
+
+    name: str = Field(primary_key=True)
+    blobs: list = Field(sa_column=Column(JSON))
+    lengths: Optional[list] = Field(default=None, sa_column=Column(JSON))  # uncompressed bytes per blob
+    size: int                                  # uncompressed bytes
+    digest: str                                # identifies the content (ETag)
+    created_at: float
+    last_access: float = Field(index=True)
+
+
+class ReportBlob(SQLModel, table=True):
+    __tablename__ = "report_blob"
+
+    digest: str = Field(primary_key=True)
+    size: int                                  # bytes on disk (gzip)
+    refs: int = Field(index=True)
+
+
+class ReportStore:
+    """Content-addressed store for HTML reports.
+
+    A report is split into blobs (see `split_report`) named by their sha256
+    and kept gzip-compressed under `blobs/`, so CSS, JS and screenshots that
+    several reports share are stored once. `index.db` maps report names to
+    their blob lists and counts references per blob; lookups never scan
+    directories.
+
+    When the blobs outgrow `budget` bytes, the least recently read reports
+    are evicted and blobs no longer referenced are deleted. Eviction runs
+    inside the index's write lock, so it cannot remove a blob that another
+    process is adding a reference to.
+    """
+
+    def __init__(self, root: Path = REPORT_STORE_DIR, budget: int = REPORT_STORE_BUDGET):
+        self.root = Path(root)
+        self.budget = budget
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.engine = create_engine(
+            f"sqlite:///{self.root / 'index.db'}", connect_args={"check_same_thread": False}
+        )
+        event.listen(self.engine, "connect", self._sqlite_pragmas)
+        SQLModel.metadata.create_all(self.engine, tables=[StoredReport.__table__, ReportBlob.__table__])
+        self._migrate()
+        self._last_sweep = 0.0
+
+    @staticmethod
+    def _sqlite_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    def _migrate(self):
+        """`create_all()` never alters a table; add columns introduced since it was created."""
+        table = StoredReport.__table__
+        existing = {c["name"] for c in inspect(self.engine).get_columns(table.name)}
+        with self.engine.begin() as conn:
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(self.engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / f"{digest}.gz"
+
+    def _write_blob(self, digest: str, piece: bytes) -> int:
+        """Store `piece` unless it is already there; returns its size on disk."""
+        path = self._blob_path(digest)
+        try:
+            # A fresh mtime keeps `_sweep_orphans` off a blob we are about to index
+            os.utime(path)
+            return path.stat().st_size
+        except FileNotFoundError:
+            pass
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+                f.write(piece)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return path.stat().st_size
+
+    # ---------------------------------------------------------------------
+    # Writes
+    # ---------------------------------------------------------------------
+    def put(self, name: str, source: Path) -> dict:
+        """Store the report file at `source` (plain or `.gz`) as `name`,
+        replacing any report of that name; then enforce the budget."""
+        opener = gzip.open if str(source).endswith(".gz") else open
+        digests, lengths, sizes = [], [], {}
+        with opener(source, "rb") as f:
+            for piece in split_report(f):
+                d = hashlib.sha256(piece).hexdigest()
+                if d not in sizes:
+                    sizes[d] = self._write_blob(d, piece)
+                digests.append(d)
+                lengths.append(len(piece))
+
+        size = sum(lengths)
+        now = time.time()
+        report = StoredReport(
+            name=name,
+            blobs=digests,
+            lengths=lengths,
+            size=size,
+            digest=hashlib.sha256("".join(digests).encode()).hexdigest()[:32],
+            created_at=now,
+            last_access=now,
+        )
+
+        with Session(self.engine) as session:
+            # Writing first takes the database write lock for the whole
+            # transaction (see `evict`)
+            old = self._drop(session, name)
+            counts = Counter(digests)
+            for d, n in counts.items():
+                session.exec(
+                    sqlite_insert(ReportBlob)
+                    .values(digest=d, size=sizes[d], refs=n)
+                    .on_conflict_do_update(index_elements=["digest"], set_={"refs": ReportBlob.refs + n})
+                )
+            session.add(report)
+            if old is not None:
+                self._collect_garbage(session)
+            session.commit()
+
+        # An eviction that ran between writing the blobs and committing may
+        # have deleted one we now reference
+        missing = {d for d in counts if not self._blob_path(d).exists()}
+        if missing:
+            with opener(source, "rb") as f:
+                for piece in split_report(f):
+                    d = hashlib.sha256(piece).hexdigest()
+                    if d in missing:
+                        self._write_blob(d, piece)
+                        missing.discard(d)
+
+        self.evict(keep=name)
+        return {"name": name, "size": size, "blobs": len(counts)}
+
+    @staticmethod
+    def _drop(session: Session, name: str) -> Optional[list]:
+        """Delete a report's index entry and release its blobs; returns its blob list."""
+        blobs = session.exec(
+            delete(StoredReport).where(StoredReport.name == name).returning(StoredReport.blobs)
+        ).scalar_one_or_none()
+        for d, n in Counter(blobs or []).items():
+            session.exec(update(ReportBlob).where(ReportBlob.digest == d).values(refs=ReportBlob.refs - n))
+        return blobs
+
+    def _collect_garbage(self, session: Session):
+        """Delete unreferenced blobs (rows and files); call with the write lock held."""
+        for digest in session.exec(select(ReportBlob.digest).where(ReportBlob.refs <= 0)).all():
+            self._blob_path(digest).unlink(missing_ok=True)
+        session.exec(delete(ReportBlob).where(ReportBlob.refs <= 0))
+
+    def _sweep_orphans(self, session: Session) -> int:
+        """Delete blob files the index has no row for, e.g. written by a `put`
+        that crashed before committing; call with the write lock held."""
+        known = set(session.exec(select(ReportBlob.digest)).all())
+        cutoff = time.time() - ORPHAN_GRACE
+        removed = 0
+        for path in self.blob_dir.glob("*/*"):
+            if path.name.removesuffix(".gz") in known:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def delete(self, name: str) -> bool:
+        with Session(self.engine) as session:
+            if self._drop(session, name) is None:
+                return False
+            self._collect_garbage(session)
+            session.commit()
+        return True
+
+    def evict(self, keep: Optional[str] = None) -> List[str]:
+        """Drop least recently read reports until the blobs fit the budget.
+
+        Now and then also sweeps blob files that never made it into the
+        index, which the budget would otherwise not see.
+        """
+        evicted = []
+        with Session(self.engine) as session:
+            # A (no-op) write takes the database write lock first, so the
+            # totals cannot change under us
+            session.exec(update(ReportBlob).where(ReportBlob.refs < 0).values(refs=0))
+            if time.time() - self._last_sweep > SWEEP_INTERVAL:
+                self._last_sweep = time.time()
+                swept = self._sweep_orphans(session)
+                if swept:
+                    print(f">>> Report store: removed {swept} unindexed blob file(s)")
+            total = session.exec(select(func.coalesce(func.sum(ReportBlob.size), 0))).one()
+            if total <= self.budget:
+                session.rollback()
+                return evicted
+
+            oldest = session.exec(
+                select(StoredReport.name).where(StoredReport.name != keep).order_by(StoredReport.last_access)
+            ).all()
+            for name in oldest:
+                self._drop(session, name)
+                evicted.append(name)
+                self._collect_garbage(session)
+                total = session.exec(select(func.coalesce(func.sum(ReportBlob.size), 0))).one()
+                if total <= self.budget:
+                    break
+            session.commit()
+
+        if evicted:
+            print(f">>> Report store: evicted {len(evicted)} report(s) to stay within budget")
+        return evicted
+
+    # ---------------------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------------------
+    def _blob_length(self, digest: str) -> int:
+        """Uncompressed size of a blob, from its gzip trailer (blobs are single members)."""
+        with open(self._blob_path(digest), "rb") as f:
+            f.seek(-4, os.SEEK_END)
+            return int.from_bytes(f.read(4), "little")
+
+    def get(self, name: str) -> Optional[dict]:
+        """Index entry of a stored report (None if absent or incomplete)."""
+        with Session(self.engine) as session:
+            report = session.get(StoredReport, name)
+            if report is None:
+                return None
+            if not all(self._blob_path(d).exists() for d in set(report.blobs)):
+                print(f">>> Report store: {name} is missing blobs")
+                return None
+
+            entry = report.model_dump()
+
+        updates = {}
+        now = time.time()
+        if now - entry["last_access"] > TOUCH_INTERVAL:
+            updates["last_access"] = now
+        if entry["lengths"] is None:
+            # Stored before per-blob lengths were indexed
+            entry["lengths"] = updates["lengths"] = [self._blob_length(d) for d in entry["blobs"]]
+        if updates:
+            with Session(self.engine) as session:
+                session.exec(update(StoredReport).where(StoredReport.name == name).values(**updates))
+                session.commit()
+        return entry
+
+    def iter_range(self, report: dict, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Bytes `[start, end)` of a report (`report` from `get`), read blob by blob."""
+        if end is None:
+            end = report["size"]
+        offset = 0
+        for d, size in zip(report["blobs"], report["lengths"]):
+            if offset >= end:
+                break
+            if offset + size > start:
+                skip = max(start - offset, 0)
+                remaining = min(end, offset + size) - offset - skip
+                with gzip.open(self._blob_path(d), "rb") as f:
+                    if skip:
+                        f.seek(skip)
+                    while remaining > 0 and (chunk := f.read(min(STREAM_CHUNK_SIZE, remaining))):
+                        remaining -= len(chunk)
+                        yield chunk
+            offset += size
+
+    def stats(self) -> dict:
+        with Session(self.engine) as session:
+            reports, logical = session.exec(
+                select(func.count(), func.coalesce(func.sum(StoredReport.size), 0)).select_from(StoredReport)
+            ).one()
+            blobs, stored = session.exec(
+                select(func.count(), func.coalesce(func.sum(ReportBlob.size), 0)).select_from(ReportBlob)
+            ).one()
+        return {
+            "reports": reports,
+            "blobs": blobs,
+            "report_bytes": logical,
+            "stored_bytes": stored,
+            "budget_bytes": self.budget,
+        }
+
+
+# Shared by the API endpoints
+report_store = ReportStore()
+
+
+if __name__ == "__main__":
+    # python -m backend.report_store ingest reports/*.html [--delete]
+    parser = argparse.ArgumentParser(description="Manage the content-addressed report store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="move existing HTML reports into the store")
+    ingest.add_argument("paths", nargs="+", type=Path)
+    ingest.add_argument("--delete", action="store_true", help="remove each file once stored")
+    sub.add_parser("stats", help="print store usage")
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        for path in args.paths:
+            name = path.name.removesuffix(".gz")
+            print(report_store.put(name, path))
+            if args.delete:
+                path.unlink()
+    print(report_store.stats())
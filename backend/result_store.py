@@ -0,0 +1,271 @@
+# backend/result_store.py
+import json
+import math
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Index, case, delete, event, func
+from sqlmodel import Field, Session, SQLModel, create_engine, select
+
+from backend.job_store import SQLITE_BUSY_TIMEOUT
+
+# Shared by run_tests.py (local runs) and gh_runner.py (GitHub runs)
+RESULTS_DB_URL = os.getenv(
+    "RESULTS_DB_URL", f"sqlite:///{Path(__file__).resolve().parent / 'results.db'}"
+)
+
+# Outcomes that count as a pass / a failure in pass rates
+PASSED_OUTCOMES = ("passed", "xfailed")
+FAILED_OUTCOMES = ("failed", "error", "xpassed")
+
+# "tests/test_a.py::test_b[param-1]" -> "tests/test_a.py::test_b"
+_PARAMS_RE = re.compile(r"\[.*\]$")
+
+
+def base_nodeid(nodeid: str) -> str:
+    """Node id without parametrize ids: all cases of a test share it."""
+    return _PARAMS_RE.sub("", nodeid)
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Linear-interpolated percentile of `values` (sorted ascending)."""
+    if not values:
+        return None
+    rank = (len(values) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return round(values[low] + (values[high] - values[low]) * (rank - low), 4)
+
+
+class RecordedRun(SQLModel, table=True):
+    """One pytest session: a local run or one shard of a GitHub job."""
+    __tablename__ = "test_run"
+
+    run_id: str = Field(primary_key=True)
+    source: str = Field(index=True)            # "local" or "github"
+    job_id: Optional[str] = Field(default=None, index=True)
+    label: Optional[str] = None                # marker / tag / shard the run covered
+    started_at: str = Field(index=True)
+    finished_at: Optional[str] = None
+    duration: Optional[float] = None
+    exitstatus: Optional[int] = None
+    total: int = 0
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+class RecordedTest(SQLModel, table=True):
+    """One test's result within a run."""
+    __tablename__ = "test_result"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    run_id: str = Field(index=True)
+    nodeid: str
+    test_id: str
+    outcome: str
+    duration: float
+    setup_duration: Optional[float] = None
+    call_duration: Optional[float] = None
+    teardown_duration: Optional[float] = None
+    error: Optional[str] = None
+    started_at: str = Field(index=True)
+
+
+# Per-test history and "what failed since ..." are the common queries
+Index("ix_test_result_test_started", RecordedTest.test_id, RecordedTest.started_at)
+Index("ix_test_result_outcome_started", RecordedTest.outcome, RecordedTest.started_at)
+
+
+class ResultStore:
+    """Indexed per-test results of every run, local or remote.
+
+    Runs are ingested from the JSON written by `--results-json`
+    (utils/results_json.py). Re-ingesting a run id replaces its results.
+    Timestamps are UTC ISO-8601 strings, so they compare as text.
+    """
+
+    def __init__(self, url: str = RESULTS_DB_URL):
+        connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+        self.engine = create_engine(url, connect_args=connect_args)
+        if url.startswith("sqlite"):
+            event.listen(self.engine, "connect", self._sqlite_pragmas)
+        SQLModel.metadata.create_all(self.engine, tables=[RecordedRun.__table__, RecordedTest.__table__])
+
+    @staticmethod
+    def _sqlite_pragmas(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT}")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+    # ---------------------------------------------------------------------
+    # Writes
+    # ---------------------------------------------------------------------
+    def ingest(self, run_id: str, source: str, document: dict,
+               job_id: Optional[str] = None, label: Optional[str] = None) -> dict:
+        """Store a `--results-json` document as run `run_id`."""
+        tests = document.get("tests", [])
+        outcomes = [t["outcome"] for t in tests]
+        run = RecordedRun(
+            run_id=run_id,
+            source=source,
+            job_id=job_id,
+            label=label,
+            started_at=document["started_at"],
+            finished_at=document.get("finished_at"),
+            duration=document.get("duration"),
+            exitstatus=document.get("exitstatus"),
+            total=len(tests),
+            passed=sum(o in PASSED_OUTCOMES for o in outcomes),
+            failed=sum(o in FAILED_OUTCOMES for o in outcomes),
+            skipped=outcomes.count("skipped"),
+        )
+
+        with Session(self.engine) as session:
+            session.exec(delete(RecordedTest).where(RecordedTest.run_id == run_id))
+            session.exec(delete(RecordedRun).where(RecordedRun.run_id == run_id))
+            session.add(run)
+            for t in tests:
+                phases = t.get("phases", {})
+                session.add(RecordedTest(
+                    run_id=run_id,
+                    nodeid=t["nodeid"],
+                    test_id=base_nodeid(t["nodeid"]),
+                    outcome=t["outcome"] or "unknown",
+                    duration=t.get("duration", 0.0),
+                    setup_duration=phases.get("setup"),
+                    call_duration=phases.get("call"),
+                    teardown_duration=phases.get("teardown"),
+                    error=t.get("error"),
+                    started_at=t.get("started_at") or run.started_at,
+                ))
+            record = run.model_dump()
+            session.commit()
+        return record
+
+    def ingest_file(self, path: Path, run_id: str, source: str, **info) -> Optional[dict]:
+        """`ingest()` a results file; None if the run did not write one."""
+        try:
+            with open(path) as f:
+                document = json.load(f)
+        except FileNotFoundError:
+            return None
+        return self.ingest(run_id, source, document, **info)
+
+    # ---------------------------------------------------------------------
+    # Reads
+    # ---------------------------------------------------------------------
+    def runs(self, limit: int = 50, offset: int = 0, source: Optional[str] = None) -> Tuple[int, List[dict]]:
+        query = select(RecordedRun)
+        count = select(func.count()).select_from(RecordedRun)
+        if source:
+            query = query.where(RecordedRun.source == source)
+            count = count.where(RecordedRun.source == source)
+        with Session(self.engine) as session:
+            total = session.exec(count).one()
+            rows = session.exec(query.order_by(RecordedRun.started_at.desc()).offset(offset).limit(limit)).all()
+            return total, [r.model_dump() for r in rows]
+
+    def run(self, run_id: str) -> Optional[dict]:
+        with Session(self.engine) as session:
+            run = session.get(RecordedRun, run_id)
+            if run is None:
+                return None
+            tests = session.exec(
+                select(RecordedTest).where(RecordedTest.run_id == run_id).order_by(RecordedTest.id)
+            ).all()
+            return {**run.model_dump(), "tests": [t.model_dump(exclude={"id"}) for t in tests]}
+
+    def history(self, test: str, limit: int = 50) -> List[dict]:
+        """Latest results of a test (all of its parametrized cases), newest first."""
+        with Session(self.engine) as session:
+            rows = session.exec(
+                select(RecordedTest, RecordedRun.source, RecordedRun.job_id)
+                .join(RecordedRun, RecordedRun.run_id == RecordedTest.run_id)
+                .where(RecordedTest.test_id == base_nodeid(test))
+                .order_by(RecordedTest.started_at.desc())
+                .limit(limit)
+            ).all()
+            return [
+                {**t.model_dump(exclude={"id", "test_id"}), "source": source, "job_id": job_id}
+                for t, source, job_id in rows
+            ]
+
+    def failures(self, since: str, until: Optional[str] = None) -> List[dict]:
+        """Failed / errored results that started in `[since, until)`."""
+        query = select(RecordedTest).where(
+            RecordedTest.outcome.in_(FAILED_OUTCOMES), RecordedTest.started_at >= since
+        )
+        if until:
+            query = query.where(RecordedTest.started_at < until)
+        with Session(self.engine) as session:
+            rows = session.exec(query.order_by(RecordedTest.started_at.desc())).all()
+            return [t.model_dump(exclude={"id"}) for t in rows]
+
+    def pass_rates(self, since: Optional[str] = None, min_runs: int = 1) -> List[dict]:
+        """Per test: runs, passes, failures and pass rate (skips left out), worst first."""
+        passed = func.sum(case((RecordedTest.outcome.in_(PASSED_OUTCOMES), 1), else_=0))
+        failed = func.sum(case((RecordedTest.outcome.in_(FAILED_OUTCOMES), 1), else_=0))
+        query = select(
+            RecordedTest.test_id, func.count(), passed, failed, func.max(RecordedTest.started_at)
+        ).group_by(RecordedTest.test_id)
+        if since:
+            query = query.where(RecordedTest.started_at >= since)
+
+        with Session(self.engine) as session:
+            rows = session.exec(query).all()
+
+        rates = []
+        for test, runs, n_passed, n_failed, last_run in rows:
+            if runs < min_runs:
+                continue
+            decided = n_passed + n_failed
+            rates.append({
+                "test_id": test,
+                "runs": runs,
+                "passed": n_passed,
+                "failed": n_failed,
+                "pass_rate": round(n_passed / decided, 4) if decided else None,
+                "last_run": last_run,
+            })
+        return sorted(rates, key=lambda r: (r["pass_rate"] is None, r["pass_rate"], r["test_id"]))
+
+    def durations(self, test: str, last: int = 50, phase: Optional[str] = None) -> dict:
+        """Duration percentiles of a test's last `last` executed results.
+
+        `phase` picks the setup / call / teardown timing instead of the
+        total. Skipped results are left out.
+        """
+        column = {
+            None: RecordedTest.duration,
+            "setup": RecordedTest.setup_duration,
+            "call": RecordedTest.call_duration,
+            "teardown": RecordedTest.teardown_duration,
+        }[phase]
+        with Session(self.engine) as session:
+            values = session.exec(
+                select(column)
+                .where(RecordedTest.test_id == base_nodeid(test), RecordedTest.outcome != "skipped", column.is_not(None))
+                .order_by(RecordedTest.started_at.desc())
+                .limit(last)
+            ).all()
+
+        values = sorted(values)
+        summary: Dict[str, Optional[float]] = {
+            "test_id": base_nodeid(test),
+            "phase": phase or "total",
+            "samples": len(values),
+            "min": values[0] if values else None,
+            "max": values[-1] if values else None,
+            "mean": round(sum(values) / len(values), 4) if values else None,
+        }
+        for pct in (50, 90, 95, 99):
+            summary[f"p{pct}"] = percentile(values, pct)
+        return summary
+
+
+# Shared by the API endpoints
+result_store = ResultStore()
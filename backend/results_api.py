@@ -0,0 +1,64 @@
+# backend/results_api.py
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from backend.result_store import result_store
+from backend.test_catalog import AmbiguousTestName, test_catalog
+
+# Mounted by both gh_runner.py and run_tests.py; they share the results DB
+router = APIRouter(prefix="/api/results")
+
+
+def _resolve(test: str) -> str:
+    """Accept a node id or a bare test name, as /api/run-test does."""
+    try:
+        # Tests no longer in the suite still have history under their node id
+        return test_catalog.resolve(test) or test
+    except AmbiguousTestName as e:
+        raise HTTPException(400, str(e))
+
+
+@router.get("/runs")
+def list_runs(limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0),
+              source: Optional[str] = None):
+    total, runs = result_store.runs(limit, offset, source=source)
+    return {"total": total, "limit": limit, "offset": offset, "runs": runs}
+
+
+@router.get("/runs/{run_id}")
+def get_run(run_id: str):
+    run = result_store.run(run_id)
+    if run is None:
+        raise HTTPException(404, "Run not found")
+    return run
+
+
+@router.get("/history")
+def test_history(test: str, limit: int = Query(50, ge=1, le=1000)):
+    """Latest results of one test, e.g. `?test=test_new_install_job_creation&limit=50`."""
+    nodeid = _resolve(test)
+    return {"test": nodeid, "results": result_store.history(nodeid, limit)}
+
+
+@router.get("/durations")
+def test_durations(test: str, last: int = Query(50, ge=1, le=1000),
+                   phase: Optional[str] = Query(None, pattern="^(setup|call|teardown)$")):
+    """p50 / p90 / p95 / p99 of a test's duration over its last `last` runs."""
+    return result_store.durations(_resolve(test), last, phase)
+
+
+@router.get("/failures")
+def failures(since: Optional[str] = None, until: Optional[str] = None):
+    """Failed and errored tests; `since` defaults to the start of today (UTC)."""
+    if since is None:
+        since = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+    results = result_store.failures(since, until)
+    return {"since": since, "until": until, "count": len(results), "results": results}
+
+
+@router.get("/pass-rates")
+def pass_rates(since: Optional[str] = None, min_runs: int = Query(1, ge=1)):
+    """Pass rate per test, lowest first."""
+    return {"since": since, "tests": result_store.pass_rates(since, min_runs)}
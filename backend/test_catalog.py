@@ -0,0 +1,304 @@
+# backend/test_catalog.py
+import ast
+import hashlib
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[1]   # captive/
+TEST_DIR = BASE_DIR / "tests"
+
+
+class AmbiguousTestName(LookupError):
+    """A bare test name matches tests in more than one module or class."""
+
+    def __init__(self, name: str, candidates: List[str]):
+        super().__init__(f"Test '{name}' is ambiguous: {', '.join(candidates)}")
+        self.name = name
+        self.candidates = candidates
+
+
+class MarkerExpressionError(ValueError):
+    """A `-m` style marker expression could not be parsed."""
+
+
+# -------------------------------------------------------------------------
+# Marker expressions ("smoke and not dashboard")
+# -------------------------------------------------------------------------
+_MARKER_TOKEN_RE = re.compile(r"\s*(\(|\)|[A-Za-z_][A-Za-z0-9_]*)")
+_MARKER_KEYWORDS = ("and", "or", "not")
+
+
+def compile_marker_expression(expr: str):
+    """Compile a pytest `-m` expression into `predicate(markers) -> bool`.
+
+    Grammar (as pytest's): `or` binds loosest, then `and`, then `not`;
+    operands are marker names or parenthesised expressions. Anything else
+    raises `MarkerExpressionError`.
+    """
+    expr = expr.strip()
+    tokens, pos = [], 0
+    while pos < len(expr):
+        m = _MARKER_TOKEN_RE.match(expr, pos)
+        if not m:
+            raise MarkerExpressionError(f"Invalid marker expression: {expr!r}")
+        tokens.append(m.group(1))
+        pos = m.end()
+    if not tokens:
+        raise MarkerExpressionError("Empty marker expression")
+
+    def fail(what: str):
+        raise MarkerExpressionError(f"Invalid marker expression {expr!r}: {what}")
+
+    def parse_or(i):
+        left, i = parse_and(i)
+        while i < len(tokens) and tokens[i] == "or":
+            right, i = parse_and(i + 1)
+            left = (lambda a, b: lambda ms: a(ms) or b(ms))(left, right)
+        return left, i
+
+    def parse_and(i):
+        left, i = parse_not(i)
+        while i < len(tokens) and tokens[i] == "and":
+            right, i = parse_not(i + 1)
+            left = (lambda a, b: lambda ms: a(ms) and b(ms))(left, right)
+        return left, i
+
+    def parse_not(i):
+        if i < len(tokens) and tokens[i] == "not":
+            operand, i = parse_not(i + 1)
+            return (lambda a: lambda ms: not a(ms))(operand), i
+        return parse_primary(i)
+
+    def parse_primary(i):
+        if i >= len(tokens):
+            fail("unexpected end")
+        token = tokens[i]
+        if token == "(":
+            inner, i = parse_or(i + 1)
+            if i >= len(tokens) or tokens[i] != ")":
+                fail("missing ')'")
+            return inner, i + 1
+        if token == ")" or token in _MARKER_KEYWORDS:
+            fail(f"unexpected {token!r}")
+        return (lambda name: lambda ms: name in ms)(token), i + 1
+
+    predicate, end = parse_or(0)
+    if end != len(tokens):
+        fail(f"unexpected {tokens[end]!r}")
+    return lambda markers: bool(predicate(set(markers)))
+
+
+# -------------------------------------------------------------------------
+# AST helpers
+# -------------------------------------------------------------------------
+def _dotted(node) -> str:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return f"{_dotted(node.value)}.{node.attr}"
+    return ""
+
+
+def _literal(node):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, SyntaxError, TypeError):
+        return None
+
+
+def _parse_mark(node) -> Optional[dict]:
+    """`pytest.mark.smoke` / `pytest.mark.auth_role("x")` -> `{"name", "args"}`."""
+    call = node if isinstance(node, ast.Call) else None
+    dotted = _dotted(call.func if call else node)
+    if ".mark." not in f".{dotted}":
+        return None
+    mark = {"name": dotted.rsplit(".", 1)[-1], "args": []}
+    if call:
+        mark["args"] = [_literal(arg) for arg in call.args]
+        mark["call"] = call
+    return mark
+
+
+def _marks_from(nodes) -> List[dict]:
+    marks = []
+    for node in nodes:
+        for item in node.elts if isinstance(node, (ast.List, ast.Tuple)) else [node]:
+            mark = _parse_mark(item)
+            if mark:
+                marks.append(mark)
+    return marks
+
+
+def _pytestmark(body) -> List[dict]:
+    for stmt in body:
+        if isinstance(stmt, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "pytestmark" for t in stmt.targets
+        ):
+            return _marks_from([stmt.value])
+    return []
+
+
+def _parametrize(mark: dict) -> dict:
+    call = mark["call"]
+    argnames = _literal(call.args[0]) if call.args else None
+    if isinstance(argnames, str):
+        argnames = [name.strip() for name in argnames.split(",") if name.strip()]
+
+    values = call.args[1] if len(call.args) > 1 else next(
+        (kw.value for kw in call.keywords if kw.arg == "argvalues"), None
+    )
+    ids = next((_literal(kw.value) for kw in call.keywords if kw.arg == "ids"), None)
+    return {
+        "argnames": list(argnames or []),
+        # Unknown when the values are computed at import time
+        "cases": len(values.elts) if isinstance(values, (ast.List, ast.Tuple)) else None,
+        "ids": list(ids) if isinstance(ids, (list, tuple)) else None,
+    }
+
+
+def _test_entry(module: str, func, class_name: Optional[str], inherited: List[dict]) -> dict:
+    marks = inherited + _marks_from(func.decorator_list)
+    parametrize = [_parametrize(m) for m in marks if m["name"] == "parametrize" and "call" in m]
+    node_id = "::".join(filter(None, [module, class_name, func.name]))
+    return {
+        "id": func.name,
+        "name": func.name.replace("test_", "", 1).replace("_", " ").title(),
+        "pytest": node_id,
+        "module": module,
+        "class": class_name,
+        "line": func.lineno,
+        "async": isinstance(func, ast.AsyncFunctionDef),
+        "markers": sorted({m["name"] for m in marks if m["name"] != "parametrize"}),
+        "parametrize": parametrize,
+    }
+
+
+def parse_test_module(source: str, module: str) -> List[dict]:
+    """Collect the tests of one module the way pytest would name them."""
+    tree = ast.parse(source)
+    module_marks = _pytestmark(tree.body)
+    tests = []
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test"):
+            tests.append(_test_entry(module, node, None, module_marks))
+        elif isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
+            class_marks = module_marks + _marks_from(node.decorator_list) + _pytestmark(node.body)
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name.startswith("test"):
+                    tests.append(_test_entry(module, item, node.name, class_marks))
+    return tests
+
+
+# -------------------------------------------------------------------------
+# Catalog
+# -------------------------------------------------------------------------
+class TestCatalog:
+    """AST-built list of the suite's tests, cached per file.
+
+    `refresh()` only stats the test files; a file is re-read when its mtime
+    or size changed and re-parsed only when its content hash changed too.
+    The catalog ETag is derived from the content hashes, so it stays stable
+    across touches that do not change any test.
+    """
+
+    __test__ = False   # not a pytest test class
+
+    def __init__(self, test_dir: Path = TEST_DIR, base_dir: Path = BASE_DIR):
+        self.test_dir = Path(test_dir)
+        self.base_dir = Path(base_dir)
+        # path -> (mtime_ns, size, sha1, tests)
+        self._files: Dict[Path, Tuple[int, int, str, List[dict]]] = {}
+        self._lock = threading.Lock()
+        self._etag = None
+        self._tests: List[dict] = []
+        self._by_id: Dict[str, dict] = {}
+        self._by_name: Dict[str, List[str]] = {}
+
+    def _module_name(self, path: Path) -> str:
+        return path.relative_to(self.base_dir).as_posix()
+
+    def _scan(self) -> bool:
+        """Bring the per-file cache up to date; returns True if any test changed."""
+        changed = False
+        seen = set()
+
+        for path in sorted(self.test_dir.rglob("test_*.py")):
+            seen.add(path)
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            cached = self._files.get(path)
+            if cached and cached[:2] == (st.st_mtime_ns, st.st_size):
+                continue
+
+            content = path.read_bytes()
+            digest = hashlib.sha1(content).hexdigest()
+            if cached and cached[2] == digest:
+                self._files[path] = (st.st_mtime_ns, st.st_size, digest, cached[3])
+                continue
+
+            try:
+                tests = parse_test_module(content.decode("utf-8"), self._module_name(path))
+            except (SyntaxError, UnicodeDecodeError) as e:
+                print(f">>> Test catalog: cannot parse {path.name}: {e}")
+                tests = []
+            self._files[path] = (st.st_mtime_ns, st.st_size, digest, tests)
+            changed = True
+
+        for path in set(self._files) - seen:
+            del self._files[path]
+            changed = True
+
+        return changed
+
+    def refresh(self):
+        with self._lock:
+            if not self._scan() and self._etag is not None:
+                return
+
+            tests = [t for _, _, _, file_tests in (self._files[p] for p in sorted(self._files)) for t in file_tests]
+            by_name: Dict[str, List[str]] = {}
+            for t in tests:
+                by_name.setdefault(t["id"], []).append(t["pytest"])
+
+            combined = hashlib.sha1()
+            for path in sorted(self._files):
+                combined.update(f"{self._module_name(path)}:{self._files[path][2]};".encode())
+
+            self._tests = tests
+            self._by_id = {t["pytest"]: t for t in tests}
+            self._by_name = by_name
+            self._etag = f'"{combined.hexdigest()}"'
+
+    def snapshot(self) -> Tuple[str, List[dict]]:
+        """Return `(etag, tests)` for the current state of the test files."""
+        self.refresh()
+        return self._etag, self._tests
+
+    def select(self, marker_expr: str) -> List[str]:
+        """Node ids of the tests matching a marker expression, in catalog order."""
+        predicate = compile_marker_expression(marker_expr)
+        _, tests = self.snapshot()
+        return [t["pytest"] for t in tests if predicate(t["markers"])]
+
+    def resolve(self, test: str) -> Optional[str]:
+        """Map a node id or a bare test name to its pytest node id.
+
+        Returns None when nothing matches; raises `AmbiguousTestName` when a
+        bare name exists in several places.
+        """
+        self.refresh()
+        if test in self._by_id:
+            return test
+        candidates = self._by_name.get(test, [])
+        if len(candidates) > 1:
+            raise AmbiguousTestName(test, candidates)
+        return candidates[0] if candidates else None
+
+
+# Shared by the API endpoints
+test_catalog = TestCatalog()
@@ -0,0 +1,31 @@
+import os
+import tempfile
+
+import pytest
+
+# The backend modules create their shared stores on import; point them at a
+# scratch directory before any test module imports them
+_SCRATCH = tempfile.mkdtemp(prefix="captive-backend-tests-")
+os.environ.setdefault("JOB_DB_URL", f"sqlite:///{_SCRATCH}/jobs.db")
+os.environ.setdefault("RESULTS_DB_URL", f"sqlite:///{_SCRATCH}/results.db")
+os.environ.setdefault("REPORT_STORE_DIR", f"{_SCRATCH}/report_store")
+os.environ.setdefault("GITHUB_TOKEN", "test-token")
+os.environ.setdefault("GITHUB_REPO", "example/captive")
+
+
+@pytest.fixture
+def report_store(tmp_path):
+    from backend.report_store import ReportStore
+    return ReportStore(tmp_path / "report_store")
+
+
+@pytest.fixture
+def job_store(tmp_path):
+    from backend.job_store import JobStore
+    return JobStore(f"sqlite:///{tmp_path}/jobs.db")
+
+
+@pytest.fixture
+def result_store(tmp_path):
+    from backend.result_store import ResultStore
+    return ResultStore(f"sqlite:///{tmp_path}/results.db")
@@ -0,0 +1,54 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from backend import gh_runner
+
+
+def _running_job(**fields) -> str:
+    job_id = uuid.uuid4().hex
+    gh_runner.job_store.create_or_attach(
+        job_id=job_id,
+        pytest_target=f"tests/test_login.py::test_{job_id}",
+        requester="ui",
+        **{"status": "running", "workflow_run_id": 1,
+           "created_at": datetime.now(timezone.utc).isoformat(), **fields},
+    )
+    return job_id
+
+
+def test_failed_report_collection_is_terminal(monkeypatch):
+    async def unreachable(*args, **kwargs):
+        raise ConnectionError("network down")
+
+    monkeypatch.setattr(gh_runner.github, "get", unreachable)
+    job_id = _running_job()
+
+    async def collect():
+        await gh_runner.start_report_collection(job_id)
+        await asyncio.gather(*gh_runner._background_tasks)
+
+    asyncio.run(collect())
+    job = gh_runner.job_store.get(job_id)
+    assert job["status"] == "collect_failed"
+    assert job["status"] in gh_runner.TERMINAL_STATUSES
+    assert "network down" in job["error"]
+
+
+def test_expire_uses_run_matched_this_round(monkeypatch):
+    collected = []
+
+    async def collect(job_id):
+        collected.append(job_id)
+
+    monkeypatch.setattr(gh_runner, "start_report_collection", collect)
+    long_ago = (datetime.now(timezone.utc) - timedelta(seconds=gh_runner.POLL_TIMEOUT + 60)).isoformat()
+    job_id = _running_job(status="dispatched", workflow_run_id=None, created_at=long_ago, dispatched_at=long_ago)
+    in_flight = [gh_runner.job_store.get(job_id)]
+
+    # The run shows up after the snapshot was taken, in the same round
+    gh_runner.job_store.update(job_id, workflow_run_id=7, status="running")
+    asyncio.run(gh_runner.run_poller._expire(in_flight))
+
+    assert gh_runner.job_store.get(job_id)["status"] == "running"
+    assert collected == [job_id]
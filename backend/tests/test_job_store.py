@@ -0,0 +1,101 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from backend.gh_runner import ACTIVE_RUN_STATUSES
+
+TARGET = "tests/test_login.py::test_valid_login"
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _at(seconds: int) -> str:
+    return (T0 + timedelta(seconds=seconds)).isoformat()
+
+
+def _queue(store, job_id, target=TARGET, created_at=None, requester="ui"):
+    return store.create_or_attach(
+        requester=requester, job_id=job_id, pytest_target=target,
+        status="queued", created_at=created_at or _at(0),
+    )
+
+
+def _race(workers, fn):
+    """Run `fn(i)` on `workers` threads released at the same moment."""
+    barrier = threading.Barrier(workers)
+
+    def run(i):
+        barrier.wait()
+        return fn(i)
+
+    with ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(run, range(workers)))
+
+
+def test_duplicate_request_attaches(job_store):
+    job, created = _queue(job_store, "a", requester="alice")
+    again, attached = _queue(job_store, "b", requester="bob")
+
+    assert created and not attached
+    assert again["job_id"] == "a"
+    assert [entry["requester"] for entry in again["attached"]] == ["bob"]
+    assert job_store.get("b") is None
+
+
+def test_concurrent_duplicates_share_one_job(job_store):
+    results = _race(8, lambda i: _queue(job_store, f"job-{i}", requester=f"user-{i}"))
+
+    assert sum(created for _, created in results) == 1
+    assert len({job["job_id"] for job, _ in results}) == 1
+    job = job_store.get(results[0][0]["job_id"])
+    assert len(job["attached"]) == 7
+    assert job_store.count(["queued"]) == 1
+
+
+def test_finished_job_frees_its_target(job_store):
+    _queue(job_store, "a")
+    assert job_store.transition("a", ["queued"], "completed")
+
+    job, created = _queue(job_store, "b")
+    assert created and job["job_id"] == "b"
+
+
+def test_claim_next_takes_oldest_within_cap(job_store):
+    for i in range(3):
+        _queue(job_store, f"job-{i}", target=f"{TARGET}[{i}]", created_at=_at(i))
+
+    assert job_store.claim_next(ACTIVE_RUN_STATUSES, 2) == "job-0"
+    assert job_store.claim_next(ACTIVE_RUN_STATUSES, 2) == "job-1"
+    assert job_store.claim_next(ACTIVE_RUN_STATUSES, 2) is None
+
+    # A finished run frees its slot
+    job_store.transition("job-0", ["dispatching"], "completed")
+    assert job_store.claim_next(ACTIVE_RUN_STATUSES, 2) == "job-2"
+
+
+def test_concurrent_claims_respect_cap(job_store):
+    for i in range(6):
+        _queue(job_store, f"job-{i}", target=f"{TARGET}[{i}]", created_at=_at(i))
+
+    def claim_all(_):
+        # Like `DispatchQueue.dispatch_ready`: claim until a claim fails
+        claimed = []
+        while (job_id := job_store.claim_next(ACTIVE_RUN_STATUSES, 2)):
+            claimed.append(job_id)
+        return claimed
+
+    claimed = [job_id for batch in _race(6, claim_all) for job_id in batch]
+
+    assert sorted(claimed) == ["job-0", "job-1"]
+    assert job_store.count(ACTIVE_RUN_STATUSES) == 2
+
+
+def test_transition_has_one_winner(job_store):
+    _queue(job_store, "a")
+    seq = job_store.last_event_seq()
+
+    wins = _race(8, lambda i: job_store.transition("a", ["queued"], f"status-{i}"))
+
+    assert wins.count(True) == 1
+    winner = f"status-{wins.index(True)}"
+    assert job_store.get("a")["status"] == winner
+    assert [event["status"] for event in job_store.events_since(seq)] == [winner]
@@ -0,0 +1,96 @@
+import base64
+import gzip
+import os
+import zlib
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from backend.report_files import stored_report_response
+
+# Inline CSS and a screenshot: split into several blobs
+ASSET = base64.b64encode(os.urandom(12000))
+REPORT = (
+    b"<html><head><style>" + b"td{color:red}" * 600 + b"</style></head><body>"
+    + b"<table>" + b"<tr><td>passed</td></tr>" * 400 + b"</table>"
+    + b'<img src="data:image/png;base64,' + ASSET + b'"></body></html>'
+)
+
+
+@pytest.fixture
+def stored(report_store, tmp_path):
+    path = tmp_path / "report.html"
+    path.write_bytes(REPORT)
+    report_store.put("report.html", path)
+    return report_store
+
+
+@pytest.fixture
+def client(stored):
+    app = FastAPI()
+
+    @app.get("/report")
+    def report(request: Request):
+        return stored_report_response(request, stored.get("report.html"), stored.iter_range)
+
+    return TestClient(app)
+
+
+def test_put_round_trip(stored):
+    report = stored.get("report.html")
+    assert len(report["blobs"]) > 1
+    assert report["size"] == len(REPORT)
+    assert b"".join(stored.iter_range(report)) == REPORT
+    assert b"".join(stored.iter_range(report, 100, 20000)) == REPORT[100:20000]
+
+
+def test_iter_range_across_blob_boundaries(stored):
+    report = stored.get("report.html")
+    offset = 0
+    for length in report["lengths"][:-1]:
+        offset += length
+        for start, end in ((offset - 1, offset + 1), (offset, offset + 1), (offset - 5, offset)):
+            assert b"".join(stored.iter_range(report, start, end)) == REPORT[start:end]
+    assert b"".join(stored.iter_range(report, len(REPORT) - 3)) == REPORT[-3:]
+
+
+def test_put_gzip_source(report_store, tmp_path):
+    path = tmp_path / "report.html.gz"
+    path.write_bytes(gzip.compress(REPORT))
+    report_store.put("report.html", path)
+    assert b"".join(report_store.iter_range(report_store.get("report.html"))) == REPORT
+
+
+def test_shared_assets_stored_once(stored, tmp_path):
+    other = tmp_path / "other.html"
+    other.write_bytes(REPORT.replace(b"passed", b"failed"))
+    before = stored.stats()["blobs"]
+    stored.put("other.html", other)
+    # Only the page text differs; CSS and screenshot are shared
+    assert stored.stats()["blobs"] == before + 1
+
+
+def test_delete_collects_blobs(stored):
+    assert stored.delete("report.html")
+    assert stored.get("report.html") is None
+    assert stored.stats()["blobs"] == 0
+
+
+def test_serves_gzip_as_one_member(client):
+    with client.stream("GET", "/report", headers={"Accept-Encoding": "gzip"}) as resp:
+        assert resp.headers["content-encoding"] == "gzip"
+        raw = b"".join(resp.iter_raw())
+    assert gzip.decompress(raw) == REPORT
+    # Browsers decode a single gzip member; it must hold the whole report
+    assert zlib.decompressobj(31).decompress(raw) == REPORT
+    assert client.get("/report", headers={"Accept-Encoding": "gzip", "If-None-Match": resp.headers["etag"]}).status_code == 304
+
+
+def test_serves_ranges_uncompressed(client):
+    resp = client.get("/report", headers={"Accept-Encoding": "gzip", "Range": "bytes=10-99"})
+    assert resp.status_code == 206
+    assert "content-encoding" not in resp.headers
+    assert resp.headers["content-range"] == f"bytes 10-99/{len(REPORT)}"
+    assert resp.content == REPORT[10:100]
+
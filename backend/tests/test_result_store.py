@@ -0,0 +1,82 @@
+import pytest
+
+TEST = "tests/test_login.py::test_valid_login"
+
+
+def _document(started_at, *tests, exitstatus=0):
+    return {
+        "started_at": started_at,
+        "finished_at": started_at,
+        "duration": sum(t.get("duration", 0.0) for t in tests),
+        "exitstatus": exitstatus,
+        "tests": list(tests),
+    }
+
+
+def _test(nodeid, outcome, duration, started_at, **phases):
+    return {"nodeid": nodeid, "outcome": outcome, "duration": duration,
+            "started_at": started_at, "phases": phases}
+
+
+def test_ingest_round_trip(result_store):
+    document = _document(
+        "2026-01-01T00:00:00+00:00",
+        _test(f"{TEST}[chromium]", "passed", 1.5, "2026-01-01T00:00:01+00:00", setup=0.5, call=1.0),
+        _test("tests/test_admin.py::test_create", "failed", 2.0, "2026-01-01T00:00:03+00:00"),
+        _test("tests/test_admin.py::test_skip", "skipped", 0.0, "2026-01-01T00:00:05+00:00"),
+        exitstatus=1,
+    )
+    record = result_store.ingest("run-1", "github", document, job_id="job-1", label="shard-0")
+    assert (record["total"], record["passed"], record["failed"], record["skipped"]) == (3, 1, 1, 1)
+
+    run = result_store.run("run-1")
+    assert run["job_id"] == "job-1" and run["exitstatus"] == 1
+    first = run["tests"][0]
+    assert first["test_id"] == TEST
+    assert (first["setup_duration"], first["call_duration"], first["teardown_duration"]) == (0.5, 1.0, None)
+
+    # Re-ingesting a run id replaces its results
+    result_store.ingest("run-1", "github", _document("2026-01-01T00:00:00+00:00"))
+    assert result_store.run("run-1")["tests"] == []
+
+
+def test_durations(result_store):
+    for i, duration in enumerate([1.0, 2.0, 3.0, 4.0]):
+        started = f"2026-01-0{i + 1}T00:00:00+00:00"
+        result_store.ingest(f"run-{i}", "local", _document(
+            started, _test(f"{TEST}[{i}]", "passed", duration, started, call=duration / 2)
+        ))
+    skipped = "2026-01-09T00:00:00+00:00"
+    result_store.ingest("run-skip", "local", _document(skipped, _test(TEST, "skipped", 0.0, skipped)))
+
+    summary = result_store.durations(TEST)
+    assert summary["samples"] == 4
+    assert (summary["min"], summary["max"], summary["mean"], summary["p50"]) == (1.0, 4.0, 2.5, 2.5)
+    assert summary["p90"] == pytest.approx(3.7)
+
+    # Only the newest `last` results count
+    assert result_store.durations(TEST, last=2)["min"] == 3.0
+    assert result_store.durations(TEST, phase="call")["max"] == 2.0
+
+
+def test_pass_rates(result_store):
+    outcomes = {
+        TEST: ["passed", "failed", "passed", "xfailed"],
+        "tests/test_admin.py::test_create": ["failed", "error"],
+        "tests/test_admin.py::test_skip": ["skipped"],
+    }
+    for test, results in outcomes.items():
+        for i, outcome in enumerate(results):
+            started = f"2026-01-0{i + 1}T00:00:00+00:00"
+            result_store.ingest(f"{test}-{i}", "local", _document(started, _test(test, outcome, 1.0, started)))
+
+    rates = result_store.pass_rates()
+    assert [r["test_id"] for r in rates] == [
+        "tests/test_admin.py::test_create", TEST, "tests/test_admin.py::test_skip",
+    ]
+    assert (rates[0]["pass_rate"], rates[1]["pass_rate"], rates[2]["pass_rate"]) == (0.0, 0.75, None)
+    assert rates[1]["last_run"] == "2026-01-04T00:00:00+00:00"
+
+    assert [r["test_id"] for r in result_store.pass_rates(min_runs=2)] == ["tests/test_admin.py::test_create", TEST]
+    since = result_store.pass_rates(since="2026-01-02T00:00:00+00:00")
+    assert {r["test_id"]: r["runs"] for r in since} == {TEST: 3, "tests/test_admin.py::test_create": 1}
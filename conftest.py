@@ -6,3 +6,37 @@ import os
 ROOT = os.path.dirname(__file__)
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("har", "HAR record / replay of browser traffic")
+    group.addoption(
+        "--record-har", action="store_const", const="record", dest="har_mode", default=None,
+        help="record each test's browser traffic into a HAR file under --har-dir",
+    )
+    group.addoption(
+        "--replay-har", action="store_const", const="replay", dest="har_mode",
+        help="serve browser traffic from the recorded HAR files instead of the network",
+    )
+    group.addoption(
+        "--har-dir", default="hars",
+        help="directory holding one HAR file per test (default: hars)",
+    )
+    group.addoption(
+        "--har-not-found", choices=("abort", "fallback"), default="abort",
+        help="replay policy for requests missing from the HAR: abort them (offline) "
+             "or let them through to the network",
+    )
+
+    group = parser.getgroup("results", "machine-readable test results")
+    group.addoption(
+        "--results-json", default=None, metavar="PATH",
+        help="write per-test outcome, duration, phase timings and error to PATH (JSON)",
+    )
+
+
+def pytest_configure(config):
+    path = config.getoption("results_json", None)
+    if path:
+        from utils.results_json import ResultsRecorder
+        config.pluginmanager.register(ResultsRecorder(path), "results_json")
@@ -1,7 +1,8 @@
 import json
 from playwright.sync_api import Page
 
-class AdminPage:
+class AdminPageBase:
+    """Admin form locators, shared with `pages.aio.admin_page.AdminPage`."""
 
     def __init__(self, page: Page):
         self.page = page
@@ -31,6 +32,8 @@ class AdminPage:
         # Save button
         self.save_btn = page.get_by_role("button", name="Save")
 
+
+class AdminPage(AdminPageBase):
     # Navigate to Admins → Add Admin
     def open_add_admin_page(self):
         self.users_menu.click()
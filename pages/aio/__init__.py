@@ -0,0 +1,7 @@
+"""Async (`playwright.async_api`) counterparts of the page objects.
+
+Each class mirrors the method surface of its sync twin in `pages`, with the
+browser-facing methods turned into coroutines, so one event loop can drive
+many browser contexts concurrently. Locators and pure helpers come from the
+`...Base` classes in the sync modules; nothing here inherits a sync method.
+"""
@@ -0,0 +1,41 @@
+from pages.admin_page import AdminPageBase
+
+
+class AdminPage(AdminPageBase):
+    """Async counterpart of `pages.admin_page.AdminPage`."""
+
+    async def open_add_admin_page(self):
+        await self.users_menu.click()
+        await self.admins_button.click()
+        await self.add_admin_button.click()
+
+    async def fill_admin_form(self, data: dict):
+        await self.first_name.fill(data["firstName"])
+        await self.middle_name.fill(data["middleName"])
+        await self.last_name.fill(data["lastName"])
+        await self.email_input.fill(data["email"])
+        await self.username_input.fill(data["userName"])
+
+        # Select gender
+        await self.gender_dropdown.click()
+        await self.gender_option(data["gender"]).click()
+
+    async def submit_admin_form(self):
+        await self.save_btn.click()
+        # Success toast (sonner toaster) or navigation back to the listing
+        try:
+            await self.page.wait_for_selector('[data-sonner-toaster]', timeout=7000)
+            try:
+                text = await self.page.locator('[data-sonner-toaster]').first.text_content() or ""
+                if text and 'admin' in text.lower() and ('created' in text.lower() or 'success' in text.lower()):
+                    return True
+            except Exception:
+                pass
+        except Exception:
+            pass
+
+        try:
+            await self.page.wait_for_url('**/users/admins', timeout=7000)
+            return True
+        except Exception:
+            return False
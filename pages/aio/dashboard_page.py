@@ -0,0 +1,31 @@
+from playwright.async_api import expect
+
+from pages.dashboard_page import DashboardPageBase
+
+
+class DashboardPage(DashboardPageBase):
+    """Async counterpart of `pages.dashboard_page.DashboardPage`."""
+
+    async def _expect_visible(self, *selectors):
+        for selector in selectors:
+            await expect(self.page.locator(selector)).to_be_visible()
+
+    async def verify_dashboard_loaded(self):
+        await self._expect_visible(self.dashboard_title)
+
+    async def verify_user_stats_section(self):
+        await self._expect_visible(
+            self.user_stats_header, self.total_admins, self.total_partners, self.total_customers,
+            self.total_subsidiaries, self.total_roles, self.total_technicians,
+        )
+
+    async def verify_job_stats_section(self):
+        await self._expect_visible(
+            self.job_stats_header, self.total_jobs, self.draft_jobs, self.assigned_jobs,
+            self.arrived_jobs, self.started_jobs, self.completed_jobs,
+        )
+
+    async def verify_device_stats_section(self):
+        await self._expect_visible(
+            self.device_stats_header, self.total_routers, self.assigned_routers, self.unassigned_routers,
+        )
@@ -0,0 +1,78 @@
+from pages.forgot_password_page import (
+    FORGOT_ERROR_CONTAINERS,
+    FORGOT_ERROR_INPUTS,
+    FORGOT_ERROR_TEXTS,
+    ForgotPasswordPageBase,
+)
+from utils.dom_snapshot import collect_error_snapshot_async
+
+
+class ForgotPasswordPage(ForgotPasswordPageBase):
+    """Async counterpart of `pages.forgot_password_page.ForgotPasswordPage`."""
+
+    async def enter_email(self, email: str):
+        await self.email_input.fill(email)
+
+    async def click_send_link(self):
+        try:
+            await self.send_link_button.click()
+        except Exception:
+            try:
+                await self.page.locator('button:has-text("Send")').click()
+            except Exception:
+                return
+
+        # Wait for common feedback elements to appear (best-effort)
+        try:
+            await self.page.wait_for_selector('text=User not found', timeout=3000)
+        except Exception:
+            try:
+                await self.page.wait_for_selector('text=not found', timeout=3000)
+            except Exception:
+                try:
+                    await self.page.wait_for_selector('[data-sonner-toast]', timeout=2000)
+                except Exception:
+                    pass
+
+    async def get_visible_errors(self):
+        try:
+            snapshot = await collect_error_snapshot_async(
+                self.page, FORGOT_ERROR_TEXTS, FORGOT_ERROR_CONTAINERS, FORGOT_ERROR_INPUTS
+            )
+        except Exception:
+            return await self._get_visible_errors_by_locators()
+
+        return self._errors_from_snapshot(snapshot)
+
+    async def _get_visible_errors_by_locators(self):
+        errors = []
+        for loc in [self.error_email_required, self.error_user_not_found, self.error_generic_not_found]:
+            try:
+                if await loc.is_visible():
+                    errors.append((await loc.text_content()).strip())
+            except Exception:
+                continue
+
+        try:
+            vm = await self.email_input.evaluate("el => el.validationMessage")
+        except Exception:
+            vm = ""
+        if vm:
+            errors.append(self._normalize_validation(vm))
+
+        try:
+            alerts = self.page.locator(", ".join(FORGOT_ERROR_CONTAINERS))
+            count = await alerts.count()
+            for i in range(count):
+                try:
+                    t = await alerts.nth(i).text_content()
+                    if t:
+                        t = t.strip()
+                        if t and t not in errors:
+                            errors.append(t)
+                except Exception:
+                    continue
+        except Exception:
+            pass
+
+        return errors
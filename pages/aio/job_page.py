@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from playwright.async_api import expect
+
+from pages.job_page import JobPageBase
+from utils.waits import WaitTimeout, async_wait_until
+
+
+class JobPage(JobPageBase):
+    """Async counterpart of `pages.job_page.JobPage`."""
+
+    async def add_job(self):
+        await self.job_list.click()
+        await self.add_button.click()
+
+    async def select_new_install_job_type(self):
+        await self.page.check(self.job_type_new_install)
+
+    async def select_install_change_job_type(self):
+        await self.page.check(self.job_type_install_change)
+
+    async def select_change_reason(self, reason):
+        await self.page.click(self.change_reason_dropdown)
+        await self.page.click(self.change_reason_option(reason))
+
+    async def fill_order_number(self, number):
+        await self.page.fill(self.order_number, number)
+
+    async def select_technician(self, technician):
+        await self.page.click(self.technician_dropdown)
+        await self.page.click(self.technician_option(technician))
+
+    async def schedule_one_hour_later(self):
+        future = datetime.now() + timedelta(hours=1)
+        formatted_time = future.strftime("%m/%d/%Y %I:%M %p")
+        await self.page.fill(self.schedule_input, formatted_time)
+        return formatted_time
+
+    async def select_customer(self, customer):
+        await self.page.click(self.customer_dropdown)
+        await self.page.click(self.customer_option(customer))
+
+    async def select_subsidiary(self, subsidiary):
+        await self.page.click(self.subsidiary_dropdown)
+        await self.page.click(self.subsidiary_option(subsidiary))
+
+    async def verify_contact_person_options(self, expected_list):
+        await self.page.click(self.contact_dropdown)
+
+        for item in expected_list:
+            await expect(self.page.locator("li")).to_contain_text(item)
+
+        await self.page.click(f"li:has-text('{expected_list[0]}')")
+
+    async def select_address(self, address):
+        await self.page.click(self.address_dropdown)
+        await self.page.click(self.address_option(address))
+
+    async def select_device_type(self, option_number):
+        await self.page.check(self.device_option_checkbox(option_number))
+
+    async def fill_vehicle(self, index, license_plate, vin, brand, vtype):
+        await self.page.fill(self.vehicle_license(index), license_plate)
+        await self.page.fill(self.vehicle_vin(index), vin)
+        await self.page.fill(self.vehicle_brand(index), brand)
+        await self.page.fill(self.vehicle_type(index), vtype)
+
+    async def add_new_vehicle(self):
+        await self.page.click(self.add_vehicle_btn)
+
+    async def save_job(self):
+        await self.page.click(self.save_btn)
+
+    async def validate_job_created(self):
+        await expect(self.page.locator(self.toaster)).to_be_visible()
+
+    async def wait_for_job_saved(self, timeout: float = 1.0):
+        try:
+            await async_wait_until(lambda: "/jobs/create" not in self.page.url, timeout=timeout,
+                                   description="job form to close")
+        except WaitTimeout:
+            pass
@@ -0,0 +1,217 @@
+from pathlib import Path
+
+from tests.conftest import BASE_URL
+from pages.login_page import (
+    EMAIL_SELECTORS,
+    ERROR_CONTAINERS,
+    ERROR_INPUTS,
+    ERROR_TEXTS,
+    LOGIN_ERRORS,
+    LOGIN_OUTCOME_JS,
+    LOGIN_OUTCOME_TIMEOUT,
+    PASSWORD_SELECTORS,
+    LoginOutcome,
+    LoginPageBase,
+)
+from utils.auth_state import authenticated_role, normalize_role, resolve_role_credentials, session_expired
+from utils.dom_snapshot import collect_error_snapshot_async
+from utils.selector_cache import selector_resolver
+
+
+class LoginPage(LoginPageBase):
+    """Async counterpart of `pages.login_page.LoginPage`."""
+
+    async def goto(self, base_url: str = BASE_URL):
+        await self.page.goto(self._login_url(base_url))
+        if authenticated_role(self.page.context):
+            return
+        try:
+            await self.page.wait_for_selector('input[placeholder="Email"], input[type="email"], input[name="email"]', timeout=5000)
+        except Exception:
+            try:
+                await self.page.wait_for_load_state("networkidle", timeout=5000)
+            except Exception:
+                pass
+
+    async def enter_email(self, email: str):
+        if await selector_resolver.fill_async(self.page, "login", "email", EMAIL_SELECTORS, email):
+            return
+        try:
+            await self.page.keyboard.type(email)
+        except Exception:
+            pass
+
+    async def enter_password(self, password: str):
+        if await selector_resolver.fill_async(self.page, "login", "password", PASSWORD_SELECTORS, password):
+            return
+        try:
+            await self.page.keyboard.type(password)
+        except Exception:
+            pass
+
+    async def click_login(self) -> LoginOutcome:
+        """Click Login and wait for the first success or failure signal."""
+        await self.login_button.click()
+
+        try:
+            handle = await self.page.wait_for_function(
+                LOGIN_OUTCOME_JS, arg=LOGIN_ERRORS, timeout=LOGIN_OUTCOME_TIMEOUT
+            )
+            result = await handle.json_value()
+        except Exception:
+            return LoginOutcome("timeout", "none")
+
+        return LoginOutcome(result["status"], result["signal"], result.get("detail", ""))
+
+    async def click_forgot_password(self):
+        try:
+            if self.forgot_password_link and await self.forgot_password_link.is_visible():
+                await self.forgot_password_link.click()
+            else:
+                await self.page.get_by_text("Forgot", exact=False).click()
+
+            try:
+                await self.page.wait_for_url("**/forgot**", timeout=3000)
+            except Exception:
+                try:
+                    await self.page.wait_for_load_state("load", timeout=2000)
+                except Exception:
+                    pass
+        except Exception:
+            try:
+                await self.page.locator("text=Forgot").first.click()
+                try:
+                    await self.page.wait_for_url("**/forgot**", timeout=3000)
+                except Exception:
+                    pass
+            except Exception:
+                pass
+
+    async def _error_snapshot(self):
+        return await collect_error_snapshot_async(self.page, ERROR_TEXTS, ERROR_CONTAINERS, ERROR_INPUTS)
+
+    async def get_error_texts(self):
+        if self.batched_errors:
+            try:
+                return self._error_texts_from_snapshot(await self._error_snapshot())
+            except Exception:
+                pass
+        return await self._get_error_texts_by_locators()
+
+    async def _get_error_texts_by_locators(self):
+        errors = []
+        for loc in self._error_locators:
+            try:
+                if loc and await loc.is_visible():
+                    errors.append((await loc.text_content()).strip())
+            except Exception:
+                continue
+
+        for selector in ERROR_CONTAINERS:
+            loc = self.page.locator(selector)
+            try:
+                count = await loc.count()
+                for i in range(count):
+                    item = loc.nth(i)
+                    try:
+                        if await item.is_visible():
+                            t = (await item.text_content()).strip()
+                            if t and t not in errors:
+                                errors.append(t)
+                    except Exception:
+                        continue
+            except Exception:
+                continue
+        return errors
+
+    async def _error_signals(self):
+        """Return `(texts, email_validation, password_validation, alert_text)`."""
+        if self.batched_errors:
+            try:
+                return self._error_signals_from_snapshot(await self._error_snapshot())
+            except Exception:
+                pass
+
+        texts = await self._get_error_texts_by_locators()
+        if texts:
+            return texts, "", "", ""
+
+        vm = ""
+        try:
+            vm = await self.email_input.evaluate("el => el.validationMessage")
+        except Exception:
+            pass
+        if vm:
+            return [], vm, "", ""
+
+        try:
+            vm = await self.password_input.evaluate("el => el.validationMessage")
+        except Exception:
+            pass
+        if vm:
+            return [], "", vm, ""
+
+        txt = ""
+        try:
+            alert = self.page.locator('[role="alert"]').first
+            txt = (await alert.get_attribute('aria-label') or await alert.get_attribute('title')
+                   or await alert.text_content())
+        except Exception:
+            pass
+        return [], "", "", txt or ""
+
+    async def get_error_message(self) -> str:
+        """Return the first visible error message as a string, or empty string if none."""
+        attempts = 3
+        for _ in range(attempts):
+            message = self._normalize_error(*await self._error_signals())
+            if message:
+                return message
+            try:
+                await self.page.wait_for_timeout(300)
+            except Exception:
+                pass
+        return ""
+
+    async def login(self, email=None, password=None, base_url=None, user_key=None):
+        """Async counterpart of `pages.login_page.LoginPage.login`."""
+        if user_key:
+            email, password = self.load_user_credentials_from_users_json(user_key)
+        elif email is None or password is None:
+            if await self.resume_session("superAdmin", base_url):
+                return
+            email, password = self.load_default_credentials()
+
+        if base_url:
+            await self.goto(base_url)
+        else:
+            await self.goto()
+
+        await self.enter_email(email)
+        await self.enter_password(password)
+        await self.click_login()
+
+    async def login_with_role(self, role: str, base_url: str | None = None):
+        """Perform login using only a role name (see the sync page object)."""
+        match_key, email, password = resolve_role_credentials(role, Path("data/user_login.json"))
+        if await self.resume_session(match_key, base_url):
+            return
+        await self.login(email, password, base_url)
+
+    async def resume_session(self, role: str, base_url: str | None = None) -> bool:
+        """Reuse the session of a context that starts logged in as `role`."""
+        current = authenticated_role(self.page.context)
+        if not current or normalize_role(current) != normalize_role(role):
+            return False
+
+        await self.page.goto(f"{(base_url or BASE_URL).rstrip('/')}/dashboard")
+        try:
+            await self.page.get_by_text("Dashboard", exact=False).or_(self.email_input).first.wait_for(timeout=8000)
+        except Exception:
+            pass
+
+        if "/login" not in self.page.url and not await self.email_input.is_visible():
+            return True
+
+        session_expired(self.page.context)
+        return False
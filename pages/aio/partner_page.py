@@ -0,0 +1,24 @@
+from pages.partner_page import PartnerPageBase
+
+
+class PartnerPage(PartnerPageBase):
+    """Async counterpart of `pages.partner_page.PartnerPage`."""
+
+    async def add_partner(self):
+        await self.users_menu.click()
+        await self.partners_menu.click()
+        await self.add_button.click()
+
+    async def fill_partner_form(self, data):
+        await self.first_name.fill(data["firstName"])
+        await self.middle_name.fill(data["middleName"])
+        await self.last_name.fill(data["lastName"])
+        await self.email_input.fill(data["email"])
+        await self.username_input.fill(data["userName"])
+
+        await self.gender_dropdown.click()
+        await self.gender_option_female.click()
+
+    async def submit_partner_form(self):
+        await self.save_button.click()
+        return True
@@ -0,0 +1,29 @@
+import asyncio
+
+from pages.password_setup import INVITATION_TIMEOUT
+from utils.email_utils import get_invitation_link
+from utils.waits import async_wait_until
+
+
+async def open_invitation_and_set_password(page, email, password):
+    print(f"Fetching invitation link for: {email}")
+
+    # The Gmail client is blocking; poll it off the event loop so other
+    # sessions keep running while this one waits for its mail.
+    link = await async_wait_until(
+        lambda: asyncio.to_thread(get_invitation_link, email),
+        timeout=INVITATION_TIMEOUT,
+        interval=2,
+        max_interval=5,
+        description=f"invitation mail for {email}",
+    )
+    print("Invitation link:", link)
+
+    await page.goto(link)
+
+    pw_fields = page.locator("input[type='password']")
+    await pw_fields.nth(0).fill(password)
+    await pw_fields.nth(1).fill(password)
+
+    await page.get_by_role("button", name="Submit").click()
+    print("Password successfully set!")
@@ -1,7 +1,8 @@
 import json
 from playwright.sync_api import Page
 
-class CustomerPage:
+class CustomerPageBase:
+    """Customer form locators, shared with `pages.aio.customer_page.CustomerPage`."""
 
     def __init__(self, page: Page):
         self.page = page
@@ -31,6 +32,8 @@ class CustomerPage:
         # Save button
         self.save_btn = page.get_by_role("button", name="Save")
 
+
+class CustomerPage(CustomerPageBase):
     # Navigate to Customers → Add Customer
     def open_add_customer_page(self):
         self.users_menu.click()
@@ -1,6 +1,8 @@
 from playwright.sync_api import Page, expect
 
-class DashboardPage:
+class DashboardPageBase:
+    """Dashboard section and stat selectors, shared with `pages.aio.dashboard_page.DashboardPage`."""
+
     def __init__(self, page: Page):
         self.page = page
 
@@ -33,6 +35,8 @@ class DashboardPage:
         self.assigned_routers = "xpath=//span[normalize-space(text())='Assigned Routers']"
         self.unassigned_routers = "xpath=//span[normalize-space(text())='Unassigned Routers']"
 
+
+class DashboardPage(DashboardPageBase):
     def verify_dashboard_loaded(self):
         expect(self.page.locator(self.dashboard_title)).to_be_visible()
 
@@ -1,6 +1,19 @@
 from playwright.sync_api import Page, expect
 
-class ForgotPasswordPage:
+from utils.dom_snapshot import collect_error_snapshot
+
+# Error candidates read by `get_visible_errors` in a single DOM snapshot
+FORGOT_ERROR_TEXTS = ["Email is required", "User not found..", "not found"]
+FORGOT_ERROR_CONTAINERS = ['[role="alert"]', '[aria-live]']
+FORGOT_ERROR_INPUTS = {
+    "email": 'input[placeholder="Enter your email"], input[placeholder="Email"], input[name="email"]',
+}
+
+
+class ForgotPasswordPageBase:
+    """Locators and error normalization shared with
+    `pages.aio.forgot_password_page.ForgotPasswordPage`."""
+
     def __init__(self, page: Page):
         self.page = page
         # Updated selectors from provided HTML snippet with fallbacks
@@ -15,6 +28,32 @@ class ForgotPasswordPage:
         self.error_email_required = page.locator("text=Email is required")
         self.error_generic_not_found = page.locator("text=not found")
 
+    @staticmethod
+    def _normalize_validation(vm: str) -> str:
+        lvm = vm.lower()
+        if "include an '@'" in lvm or "missing an '@'" in lvm or "invalid" in lvm:
+            return "Invalid email"
+        if "fill out this field" in lvm or "please fill" in lvm or "required" in lvm:
+            return "Email is required"
+        return vm
+
+    @classmethod
+    def _errors_from_snapshot(cls, snapshot):
+        errors = [t.strip() for t in snapshot["texts"] if t]
+        vm = snapshot["validation"].get("email", "")
+        if vm:
+            errors.append(cls._normalize_validation(vm))
+
+        # role=alert or aria-live regions
+        for selector in FORGOT_ERROR_CONTAINERS:
+            for item in snapshot["containers"].get(selector, []):
+                t = item["text"]
+                if t and t not in errors:
+                    errors.append(t)
+        return errors
+
+
+class ForgotPasswordPage(ForgotPasswordPageBase):
     def enter_email(self, email: str):
         self.email_input.fill(email)
 
@@ -42,6 +81,15 @@ class ForgotPasswordPage:
                     pass
 
     def get_visible_errors(self):
+        # One DOM snapshot for every candidate; per-locator lookups as fallback
+        try:
+            snapshot = collect_error_snapshot(self.page, FORGOT_ERROR_TEXTS, FORGOT_ERROR_CONTAINERS, FORGOT_ERROR_INPUTS)
+        except Exception:
+            return self._get_visible_errors_by_locators()
+
+        return self._errors_from_snapshot(snapshot)
+
+    def _get_visible_errors_by_locators(self):
         errors = []
         for loc in [self.error_email_required, self.error_user_not_found, self.error_generic_not_found]:
             try:
@@ -56,19 +104,13 @@ class ForgotPasswordPage:
             except Exception:
                 vm = ""
             if vm:
-                lvm = vm.lower()
-                if "include an '@'" in lvm or "missing an '@'" in lvm or "invalid" in lvm:
-                    errors.append("Invalid email")
-                elif "fill out this field" in lvm or "please fill" in lvm or "required" in lvm:
-                    errors.append("Email is required")
-                else:
-                    errors.append(vm)
+                errors.append(self._normalize_validation(vm))
         except Exception:
             pass
 
         # Check role=alert or aria-live regions
         try:
-            alerts = self.page.locator('[role="alert"], [aria-live]')
+            alerts = self.page.locator(", ".join(FORGOT_ERROR_CONTAINERS))
             count = alerts.count()
             for i in range(count):
                 try:
@@ -82,4 +124,4 @@ class ForgotPasswordPage:
         except Exception:
             pass
 
-        return errors
\ No newline at end of file
+        return errors
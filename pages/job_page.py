@@ -2,7 +2,10 @@ from playwright.sync_api import Page
 from datetime import datetime, timedelta
 from playwright.sync_api import Page, expect
 
-class JobPage:
+from utils.waits import WaitTimeout, wait_until
+
+class JobPageBase:
+    """Job form selectors, shared with `pages.aio.job_page.JobPage`."""
 
     def __init__(self, page: Page):
         self.page = page
@@ -33,7 +36,9 @@ class JobPage:
         self.add_vehicle_btn = "button.MuiButton-outlinedPrimary.mui-x2zeaj"
         self.save_btn = "button:has-text('Save')"
         self.toaster = "text=Job Created"
-    
+
+
+class JobPage(JobPageBase):
     def add_job(self):
         self.job_list.click()
         self.add_button.click()
@@ -101,3 +106,12 @@ class JobPage:
 
     def validate_job_created(self):
         expect(self.page.locator(self.toaster)).to_be_visible()
+
+    def wait_for_job_saved(self, timeout: float = 1.0):
+        # Give the app up to `timeout` seconds to leave the create form after
+        # the "Job Created" toast, instead of always sleeping that long.
+        try:
+            wait_until(lambda: "/jobs/create" not in self.page.url, timeout=timeout,
+                       page=self.page, description="job form to close")
+        except WaitTimeout:
+            pass
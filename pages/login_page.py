@@ -1,14 +1,94 @@
 import json
+from dataclasses import dataclass
 from pathlib import Path
 from playwright.sync_api import Page, expect
-import re
 
 from tests.conftest import BASE_URL
-
-
-class LoginPage:
-    def __init__(self, page: Page):
+from utils.auth_state import authenticated_role, normalize_role, resolve_role_credentials, session_expired
+from utils.dom_snapshot import clean_message, collect_error_snapshot
+from utils.selector_cache import selector_resolver
+
+# Known app error texts that end a login attempt
+LOGIN_ERRORS = [
+    "User not found",
+    "Invalid email",
+    "Email is required",
+    "Password is required",
+    "does not meet requirements",
+]
+
+# Upper bound for the app to react to a login click (was 8s networkidle + 1s)
+LOGIN_OUTCOME_TIMEOUT = 9000
+
+# Evaluated by `wait_for_function` on every animation frame; returns a truthy
+# result object as soon as any success or failure signal is present.
+LOGIN_OUTCOME_JS = """
+(errors) => {
+    const url = window.location.href;
+    if (url.includes('/dashboard') || url.includes('/users')) {
+        return {status: 'success', signal: 'url', detail: url};
+    }
+    const text = document.body ? document.body.innerText : '';
+    if (text.includes('Dashboard')) {
+        return {status: 'success', signal: 'dashboard', detail: url};
+    }
+    for (const err of errors) {
+        if (text.includes(err)) {
+            return {status: 'error', signal: 'error_text', detail: err};
+        }
+    }
+    for (const input of document.querySelectorAll('input')) {
+        if (input.validationMessage) {
+            return {status: 'error', signal: 'validation', detail: input.validationMessage};
+        }
+    }
+    return null;
+}
+"""
+
+# Email / password field selectors, primary first
+EMAIL_SELECTORS = ['input[placeholder="Email"]', 'input[type="email"]', '[name="email"]']
+PASSWORD_SELECTORS = ['input[placeholder="Password"]', 'input[type="password"]', '[name="password"]']
+
+# Error candidates read by `get_error_texts` / `get_error_message`, in the
+# order the per-locator lookups check them.
+ERROR_TEXTS = [
+    "Email is required",
+    "Invalid email",
+    "User not found..",
+    "Password is required",
+    "The password provided does not meet requirements.",
+]
+ERROR_CONTAINERS = ['[role="alert"]', '.toast, .alert, .error', '[data-test="error"]']
+ERROR_INPUTS = {"email": 'input[placeholder="Email"]', "password": 'input[placeholder="Password"]'}
+
+
+@dataclass
+class LoginOutcome:
+    """Result of `LoginPage.click_login`.
+
+    `status` is "success", "error" or "timeout"; `signal` names what decided
+    it ("url", "dashboard", "error_text", "validation" or "none").
+    """
+    status: str
+    signal: str
+    detail: str = ""
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == "success"
+
+
+class LoginPageBase:
+    """Locators, URL building, credential loading and error normalization
+    shared by this page object and `pages.aio.login_page.LoginPage`; nothing
+    here talks to the browser."""
+
+    def __init__(self, page: Page, batched_errors: bool = True):
         self.page = page
+        # Read error candidates with one DOM snapshot instead of one locator
+        # round trip each; set False to use the per-locator lookups.
+        self.batched_errors = batched_errors
 
         # Updated selectors based on provided HTML
         # Using Playwright locator helpers for stability
@@ -24,19 +104,127 @@ class LoginPage:
         self.error_password_required = page.locator("text=Password is required")
         self.error_wrong_password = page.locator("text=The password provided does not meet requirements.")
 
-    def goto(self, base_url: str = BASE_URL):
-        # Navigate to the login page constructed from the provided `base_url`.
+    @property
+    def _error_locators(self):
+        return [self.error_email_required, self.error_invalid_email, self.error_user_not_found,
+                self.error_password_required, self.error_wrong_password]
+
+    @staticmethod
+    def _login_url(base_url: str) -> str:
         # If the caller passed a full login URL (including '/login'), use it
         # as-is; otherwise append '/login' to the base host.
         try:
             if base_url.rstrip().endswith('/login'):
-                url = base_url
-            else:
-                url = f"{base_url.rstrip('/')}/login"
+                return base_url
+            return f"{base_url.rstrip('/')}/login"
         except Exception:
-            url = base_url
+            return base_url
+
+    @staticmethod
+    def _error_texts_from_snapshot(snapshot):
+        errors = [t.strip() for t in snapshot["texts"] if t]
+        for selector in ERROR_CONTAINERS:
+            for item in snapshot["containers"].get(selector, []):
+                t = item["text"]
+                if item["visible"] and t and t not in errors:
+                    errors.append(t)
+        return errors
+
+    @classmethod
+    def _error_signals_from_snapshot(cls, snapshot):
+        """`(texts, email_validation, password_validation, alert_text)` of an error snapshot."""
+        alerts = snapshot["containers"].get('[role="alert"]', [])
+        alert_text = (alerts[0]["label"] or alerts[0]["text"]) if alerts else ""
+        return (
+            cls._error_texts_from_snapshot(snapshot),
+            snapshot["validation"].get("email", ""),
+            snapshot["validation"].get("password", ""),
+            alert_text,
+        )
+
+    @staticmethod
+    def _normalize_error(texts, email_vm, password_vm, alert_text) -> str:
+        """Map the collected error signals to the exact string tests expect."""
+        if texts:
+            # Map known app-specific messages to the exact expected test strings
+            s0 = texts[0]
+            ls0 = s0.lower()
+            # Match by substring (ignore punctuation differences) and
+            # return the exact string the tests expect.
+            if 'user not found' in ls0:
+                return 'User not found..'
+            if 'the password provided does not meet' in ls0:
+                return 'The password provided does not meet requirements..'
+            return clean_message(s0)
+
+        # If no visible error text found, check native validationMessage on inputs
+        if email_vm:
+            lvm = email_vm.lower()
+            # Normalize browser validation messages to app-expected strings
+            if "include an '@'" in lvm or "missing an '@'" in lvm or "enter an email" in lvm or "invalid" in lvm:
+                return "Invalid email"
+            if "fill out this field" in lvm or "please fill" in lvm or "required" in lvm:
+                return "Email is required"
+            return clean_message(email_vm)
+
+        if password_vm:
+            lvm = password_vm.lower()
+            if "fill out this field" in lvm or "please fill" in lvm or "required" in lvm:
+                return "Password is required"
+            return clean_message(password_vm)
+
+        if alert_text:
+            return clean_message(alert_text)
+        return ""
+
+    def load_user_credentials(self, user_key):
+        """Load email + password for any user from users.json"""
+        import json
+
+        with open("data/users.json") as f:
+            data = json.load(f)
+
+        if user_key not in data:
+            raise ValueError(f"{user_key} not found in users.json")
+
+        user = data[user_key]
+        email = user.get("email")
+        password = user.get("password")
+
+        if not email or not password:
+            raise ValueError(f"Missing email/password for {user_key} in users.json")
+
+        return email, password
+
+    def load_user_credentials_from_users_json(self, user_key):
+        """Load credentials for newly registered users from users.json"""
+        import json
+        with open("data/users.json") as f:
+            data = json.load(f)
+
+        if user_key not in data:
+            raise KeyError(f"User key '{user_key}' not found in users.json")
+
+        return data[user_key]["email"], data[user_key]["password"]
 
-        self.page.goto(url)
+    def load_default_credentials(self):
+        """Load default login credentials from user_login.json"""
+        import json
+        with open("data/user_login.json") as f:
+            data = json.load(f)
+            login_data = data["superAdmin"]
+
+        return login_data["email"], login_data["password"]
+
+
+class LoginPage(LoginPageBase):
+    def goto(self, base_url: str = BASE_URL):
+        # Navigate to the login page constructed from the provided `base_url`.
+        self.page.goto(self._login_url(base_url))
+        # A pre-authenticated context is redirected away from the form, so
+        # there is nothing to wait for here.
+        if authenticated_role(self.page.context):
+            return
         # Ensure page has loaded and the login form is present (best-effort)
         try:
             self.page.wait_for_selector('input[placeholder="Email"], input[type="email"], input[name="email"]', timeout=5000)
@@ -47,24 +235,10 @@ class LoginPage:
                 pass
 
     def enter_email(self, email: str):
-        # Try several fallback locators if the primary placeholder locator fails
-        try:
-            self.email_input.fill(email)
+        # Primary placeholder locator first, then fallbacks; the resolver
+        # probes them with short timeouts and remembers the one that worked.
+        if selector_resolver.fill(self.page, "login", "email", EMAIL_SELECTORS, email):
             return
-        except Exception:
-            pass
-
-        fallbacks = [
-            lambda: self.page.get_by_placeholder("Email").fill(email),
-            lambda: self.page.locator('input[type="email"]').fill(email),
-            lambda: self.page.locator('[name="email"]').fill(email),
-        ]
-        for f in fallbacks:
-            try:
-                f()
-                return
-            except Exception:
-                continue
         # Last-resort: type into the focused element
         try:
             self.page.keyboard.type(email)
@@ -72,70 +246,35 @@ class LoginPage:
             pass
 
     def enter_password(self, password: str):
-        try:
-            self.password_input.fill(password)
+        if selector_resolver.fill(self.page, "login", "password", PASSWORD_SELECTORS, password):
             return
-        except Exception:
-            pass
-
-        fallbacks = [
-            lambda: self.page.get_by_placeholder("Password").fill(password),
-            lambda: self.page.locator('input[type="password"]').fill(password),
-            lambda: self.page.locator('[name="password"]').fill(password),
-        ]
-        for f in fallbacks:
-            try:
-                f()
-                return
-            except Exception:
-                continue
         try:
             self.page.keyboard.type(password)
         except Exception:
             pass
 
-    def click_login(self):
+    def click_login(self) -> LoginOutcome:
+        """Click Login and wait for the first success or failure signal.
 
+        All signals (URL change, dashboard marker, known error texts and
+        native validation messages) are raced inside the browser by a single
+        `wait_for_function`, so the call returns as soon as the app reacts.
+        The returned `LoginOutcome` says which signal won; callers that only
+        care about side effects can ignore it.
+        """
         # Always click login
         self.login_button.click()
 
         try:
-            self.page.wait_for_load_state("networkidle", timeout=8000)
-        except:
-            pass
-
-        # If dashboard exists (common case)
-        try:
-            if self.page.get_by_text("Dashboard", exact=False).first.is_visible():
-                return
-        except:
-            pass
-
-        # If URL changed → login success
-        try:
-            if "/dashboard" in self.page.url or "/users" in self.page.url:
-                return
-        except:
-            pass
-
-        # If any known error appears → return and let test assert
-        errors = [
-            "User not found",
-            "Invalid email",
-            "Email is required",
-            "Password is required",
-            "does not meet requirements"
-        ]
-        for err in errors:
-            try:
-                if self.page.get_by_text(err, exact=False).first.is_visible():
-                    return
-            except:
-                continue
-
-        # Final safety wait (1 sec)
-        self.page.wait_for_timeout(1000)
+            result = self.page.wait_for_function(
+                LOGIN_OUTCOME_JS, arg=LOGIN_ERRORS, timeout=LOGIN_OUTCOME_TIMEOUT
+            ).json_value()
+        except Exception:
+            # No signal before the deadline (or the page went away under us):
+            # return and let the test assert on whatever is on screen.
+            return LoginOutcome("timeout", "none")
 
+        return LoginOutcome(result["status"], result["signal"], result.get("detail", ""))
 
     def click_forgot_password(self):
         # Try the primary locator, fall back to a text-based locator if needed,
@@ -173,8 +312,20 @@ class LoginPage:
 
     def get_error_texts(self):
         # returns visible error texts found among known locators
+        if self.batched_errors:
+            try:
+                return self._error_texts_from_snapshot(self._error_snapshot())
+            except Exception:
+                pass
+        return self._get_error_texts_by_locators()
+
+    def _error_snapshot(self):
+        # All error candidates (texts, alerts/toasts, validation) in one evaluate
+        return collect_error_snapshot(self.page, ERROR_TEXTS, ERROR_CONTAINERS, ERROR_INPUTS)
+
+    def _get_error_texts_by_locators(self):
         errors = []
-        for loc in [self.error_email_required, self.error_invalid_email, self.error_user_not_found, self.error_password_required, self.error_wrong_password]:
+        for loc in self._error_locators:
             try:
                 if loc and loc.is_visible():
                     text = loc.text_content().strip()
@@ -183,11 +334,7 @@ class LoginPage:
                 continue
 
         # Additional common error containers: role=alert, toast/alert classes, data-test attributes
-        extra_locators = [
-            self.page.locator('[role="alert"]'),
-            self.page.locator('.toast, .alert, .error'),
-            self.page.locator('[data-test="error"]'),
-        ]
+        extra_locators = [self.page.locator(selector) for selector in ERROR_CONTAINERS]
         for loc in extra_locators:
             try:
                 count = loc.count()
@@ -204,78 +351,54 @@ class LoginPage:
                 continue
         return errors
 
-    def get_error_message(self) -> str:
-        """Return the first visible error message as a string, or empty string if none."""
-        # Try a few times to capture transient messages (toasts/alerts/validation)
-        attempts = 3
-        for _ in range(attempts):
-            texts = self.get_error_texts()
-            if texts:
-                # Map known app-specific messages to the exact expected test strings
-                s0 = texts[0]
-                ls0 = s0.lower()
-                # Match by substring (ignore punctuation differences) and
-                # return the exact string the tests expect.
-                if 'user not found' in ls0:
-                    return 'User not found..'
-                if 'the password provided does not meet' in ls0:
-                    return 'The password provided does not meet requirements..'
-
-                # Normalize: remove zero-width chars, collapse multiple dots, trim
-                s = s0
-                s = re.sub(r'[\u200B\u200C\u200D\ufeff]', '', s)
-                s = re.sub(r'\.{2,}', '.', s)
-                return s.strip()
-
-            # If no visible error text found, check native validationMessage on inputs
+    def _error_signals(self):
+        """Return `(texts, email_validation, password_validation, alert_text)`."""
+        if self.batched_errors:
             try:
-                vm = ""
-                try:
-                    vm = self.email_input.evaluate("el => el.validationMessage")
-                except Exception:
-                    pass
-                if vm:
-                    lvm = vm.lower()
-                    # Normalize browser validation messages to app-expected strings
-                    if "include an '@'" in lvm or "missing an '@'" in lvm or "enter an email" in lvm or "invalid" in lvm:
-                        return "Invalid email"
-                    if "fill out this field" in lvm or "please fill" in lvm or "required" in lvm:
-                        return "Email is required"
-                    s = re.sub(r'[\u200B\u200C\u200D\ufeff]', '', vm)
-                    s = re.sub(r'\.{2,}', '.', s)
-                    return s.strip()
+                return self._error_signals_from_snapshot(self._error_snapshot())
             except Exception:
                 pass
+        return self._error_signals_by_locators()
 
-            try:
-                vm = ""
-                try:
-                    vm = self.password_input.evaluate("el => el.validationMessage")
-                except Exception:
-                    pass
-                if vm:
-                    lvm = vm.lower()
-                    if "fill out this field" in lvm or "please fill" in lvm or "required" in lvm:
-                        return "Password is required"
-                    s = re.sub(r'[\u200B\u200C\u200D\ufeff]', '', vm)
-                    s = re.sub(r'\.{2,}', '.', s)
-                    return s.strip()
-            except Exception:
-                pass
+    def _error_signals_by_locators(self):
+        # One locator round trip at a time; stops as soon as a signal that
+        # `_normalize_error` would prefer has been found.
+        texts = self._get_error_texts_by_locators()
+        if texts:
+            return texts, "", "", ""
 
-            # Last resort: look for aria-label/title on common alert elements
-            try:
-                alert = self.page.locator('[role="alert"]').first
-                try:
-                    txt = alert.get_attribute('aria-label') or alert.get_attribute('title') or alert.text_content()
-                    if txt:
-                        s = re.sub(r'[\u200B\u200C\u200D\ufeff]', '', txt)
-                        s = re.sub(r'\.{2,}', '.', s)
-                        return s.strip()
-                except Exception:
-                    pass
-            except Exception:
-                pass
+        vm = ""
+        try:
+            vm = self.email_input.evaluate("el => el.validationMessage")
+        except Exception:
+            pass
+        if vm:
+            return [], vm, "", ""
+
+        try:
+            vm = self.password_input.evaluate("el => el.validationMessage")
+        except Exception:
+            pass
+        if vm:
+            return [], "", vm, ""
+
+        # Last resort: look for aria-label/title on common alert elements
+        txt = ""
+        try:
+            alert = self.page.locator('[role="alert"]').first
+            txt = alert.get_attribute('aria-label') or alert.get_attribute('title') or alert.text_content()
+        except Exception:
+            pass
+        return [], "", "", txt or ""
+
+    def get_error_message(self) -> str:
+        """Return the first visible error message as a string, or empty string if none."""
+        # Try a few times to capture transient messages (toasts/alerts/validation)
+        attempts = 3
+        for _ in range(attempts):
+            message = self._normalize_error(*self._error_signals())
+            if message:
+                return message
 
             # Wait a bit and retry (allow transient toasts to appear)
             try:
@@ -284,26 +407,6 @@ class LoginPage:
                 pass
 
         return ""
-    def load_user_credentials(self, user_key):
-        """Load email + password for any user from users.json"""
-        import json
-
-        with open("data/users.json") as f:
-            data = json.load(f)
-
-        if user_key not in data:
-            raise ValueError(f"{user_key} not found in users.json")
-
-        user = data[user_key]
-        email = user.get("email")
-        password = user.get("password")
-
-        if not email or not password:
-            raise ValueError(f"Missing email/password for {user_key} in users.json")
-
-        return email, password
-
-
     def login(self, email=None, password=None, base_url=None, user_key=None):
         """
         If user_key is provided → fetch email & password from users.json
@@ -317,6 +420,8 @@ class LoginPage:
 
         # CASE 2: DEFAULT SUPER ADMIN (user_login.json)
         elif email is None or password is None:
+            if self.resume_session("superAdmin", base_url):
+                return
             email, password = self.load_default_credentials()
 
         # Navigate to login page
@@ -330,26 +435,6 @@ class LoginPage:
         self.enter_password(password)
         self.click_login()
 
-    def load_user_credentials_from_users_json(self, user_key):
-        """Load credentials for newly registered users from users.json"""
-        import json
-        with open("data/users.json") as f:
-            data = json.load(f)
-
-        if user_key not in data:
-            raise KeyError(f"User key '{user_key}' not found in users.json")
-
-        return data[user_key]["email"], data[user_key]["password"]
-    
-    def load_default_credentials(self):
-        """Load default login credentials from user_login.json"""
-        import json
-        with open("data/user_login.json") as f:
-            data = json.load(f)
-            login_data = data["superAdmin"]
-
-        return login_data["email"], login_data["password"]
-
     def login_with_role(self, role: str, base_url: str | None = None):
         """Perform login using only a role name.
 
@@ -358,32 +443,34 @@ class LoginPage:
         otherwise the default `BASE_URL` from `tests.conftest` will be used.
         """
         # Read role-based credentials from the `data/user_login.json` file.
-        file_path = Path("data/user_login.json")
-        if not file_path.exists():
-            raise FileNotFoundError(f"Role credential file not found: {file_path}")
+        match_key, email, password = resolve_role_credentials(role, Path("data/user_login.json"))
 
-        with file_path.open() as f:
-            data = json.load(f)
+        # Contexts created from the storage-state cache are already logged in
+        if self.resume_session(match_key, base_url):
+            return
 
-        # Match role key case-insensitively and allow simple variants (underscores/spaces)
-        def _normalize(k: str) -> str:
-            return k.lower().replace("_", "").replace(" ", "")
+        # Call the main login method with the resolved credentials
+        self.login(email, password, base_url)
 
-        match_key = None
-        for k in data.keys():
-            if _normalize(k) == _normalize(role):
-                match_key = k
-                break
+    def resume_session(self, role: str, base_url: str | None = None) -> bool:
+        """Reuse the session of a context that starts logged in as `role`.
 
-        if match_key is None:
-            raise ValueError(f"Credentials for role '{role}' not found in {file_path}")
+        Returns True when the dashboard is reachable without the login form.
+        If the saved session was rejected, the cached state is invalidated
+        and False is returned so the caller falls back to a UI login.
+        """
+        current = authenticated_role(self.page.context)
+        if not current or normalize_role(current) != normalize_role(role):
+            return False
 
-        entry = data.get(match_key, {})
-        email = entry.get("email")
-        password = entry.get("password")
+        self.page.goto(f"{(base_url or BASE_URL).rstrip('/')}/dashboard")
+        try:
+            self.page.get_by_text("Dashboard", exact=False).or_(self.email_input).first.wait_for(timeout=8000)
+        except Exception:
+            pass
 
-        if not email or not password:
-            raise ValueError(f"Incomplete credentials for role '{role}' in {file_path}")
+        if "/login" not in self.page.url and not self.email_input.is_visible():
+            return True
 
-        # Call the main login method with the resolved credentials
-        self.login(email, password, base_url)
\ No newline at end of file
+        session_expired(self.page.context)
+        return False
@@ -1,6 +1,8 @@
 from playwright.sync_api import Page
 
-class PartnerPage:
+class PartnerPageBase:
+    """Partner form locators, shared with `pages.aio.partner_page.PartnerPage`."""
+
     def __init__(self, page: Page):
         self.page = page
         self.users_menu = page.get_by_text("Users Management")
@@ -18,6 +20,8 @@ class PartnerPage:
 
         self.save_button = page.get_by_role("button", name="Save")
 
+
+class PartnerPage(PartnerPageBase):
     def add_partner(self):
         self.users_menu.click()
         self.partners_menu.click()
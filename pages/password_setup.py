@@ -1,13 +1,23 @@
 from utils.email_utils import get_invitation_link
+from utils.waits import wait_until
 from pages.login_page import LoginPage
 
+# Upper bound for the invitation mail to arrive in the Gmail inbox
+INVITATION_TIMEOUT = 20
+
 def open_invitation_and_set_password(page, email, password):
     print(f"Fetching invitation link for: {email}")
-    
-    page.wait_for_timeout(20000)
 
-    # Get latest link from Gmail API
-    link = get_invitation_link(email)
+    # Get latest link from Gmail API as soon as the mail has arrived.
+    # `get_invitation_link` raises until a matching mail exists.
+    link = wait_until(
+        lambda: get_invitation_link(email),
+        timeout=INVITATION_TIMEOUT,
+        interval=2,
+        max_interval=5,
+        description=f"invitation mail for {email}",
+        page=page,
+    )
     print("Invitation link:", link)
 
     # Use the same Playwright page
@@ -1,7 +1,8 @@
 import json
 from playwright.sync_api import Page
 
-class SubsidiariesPage:
+class SubsidiariesPageBase:
+    """Subsidiary form locators, shared with `pages.aio.subsidiaries.SubsidiariesPage`."""
 
     def __init__(self, page: Page):
         self.page = page
@@ -30,6 +31,8 @@ class SubsidiariesPage:
         # Save button
         self.save_btn = page.get_by_role("button", name="Save")
 
+
+class SubsidiariesPage(SubsidiariesPageBase):
     # Navigate to Subsidiaries → Add Subsidiaries
     def open_add_subsidiaries_page(self):
         self.users_menu.click()
@@ -1,7 +1,8 @@
 import json
 from playwright.sync_api import Page
 
-class TechnicianPage:
+class TechnicianPageBase:
+    """Technician form locators, shared with `pages.aio.technician.TechnicianPage`."""
 
     def __init__(self, page: Page):
         self.page = page
@@ -30,6 +31,8 @@ class TechnicianPage:
         # Save button
         self.save_btn = page.get_by_role("button", name="Save")
 
+
+class TechnicianPage(TechnicianPageBase):
     # Navigate to Technicians → Add Technicians
     def open_add_technicians_page(self):
         self.users_menu.click()
@@ -1,10 +1,245 @@
+import asyncio
+import os
+import signal
 import subprocess
 import uuid
-import os
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+from backend.report_files import gzip_path, report_response, stored_report_response
+from backend.report_store import report_store
+from backend.result_store import result_store
+from backend.results_api import router as results_router
+from utils.warm_pool import WarmPool
+
+# Create reports folder if not exists
+REPORT_DIR = "backend/reports"
+os.makedirs(REPORT_DIR, exist_ok=True)
+
+# pytest processes running at the same time; later runs wait in the queue
+MAX_CONCURRENT_RUNS = int(os.getenv("LOCAL_MAX_RUNS", "2"))
+
+# Runs allowed to wait for a slot before new requests are refused (429)
+MAX_QUEUED_RUNS = int(os.getenv("LOCAL_MAX_QUEUED", "20"))
+
+# A run still going after this many seconds is stopped
+RUN_TIMEOUT = int(os.getenv("LOCAL_RUN_TIMEOUT", "3600"))
+
+# Seconds between SIGTERM and SIGKILL when a run is cancelled or times out
+CANCEL_GRACE = int(os.getenv("LOCAL_CANCEL_GRACE", "10"))
+
+# pytest exit codes -> run status
+EXIT_STATUSES = {0: "passed", 1: "failed", 2: "interrupted", 5: "no_tests"}
+
+FINISHED_STATUSES = ("passed", "failed", "interrupted", "no_tests", "error", "cancelled", "timeout")
+
+# Pre-warmed pytest processes for single-process runs (0 disables the pool)
+WARM_WORKERS = int(os.getenv("LOCAL_WARM_WORKERS", str(MAX_CONCURRENT_RUNS)))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class LocalRunner:
+    """Runs pytest as background processes, at most `max_concurrent` at once.
+
+    Each run's output (stdout and stderr) goes to `<REPORT_DIR>/<run_id>.log`.
+    pytest is started in its own process group, so cancelling a run also
+    stops its xdist workers and browsers.
+
+    Runs submitted with `warm=True` go to an idle process of the warm pool
+    instead, when one is up; otherwise they fall back to a fresh process.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_RUNS, max_queued: int = MAX_QUEUED_RUNS,
+                 pool: Optional[WarmPool] = None):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.pool = pool
+        self.runs: Dict[str, dict] = {}
+        self._procs: Dict[str, asyncio.subprocess.Process] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def submit(self, command: list, warm: bool = False, **info) -> dict:
+        """Queue `command`; returns the run record (call from the event loop)."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+
+        queued = sum(1 for r in self.runs.values() if r["status"] == "queued")
+        if queued >= self.max_queued:
+            raise HTTPException(429, f"{queued} runs already waiting, try again later")
+
+        run_id = uuid.uuid4().hex
+        run = {
+            "run_id": run_id,
+            **info,
+            # Per-test results for the result store (see _store_results)
+            "command": [*command, f"--results-json={self._results_path(run_id)}"],
+            "status": "queued",
+            "created_at": _now(),
+            "log": os.path.abspath(os.path.join(REPORT_DIR, f"{run_id}.log")),
+            "warm": warm,
+        }
+        self.runs[run_id] = run
+        self._tasks[run_id] = asyncio.create_task(self._execute(run))
+        return run
+
+    async def _execute(self, run: dict):
+        try:
+            async with self._slots:
+                if run["status"] != "queued":
+                    return   # cancelled while waiting
+                worker = self.pool.take() if run["warm"] and self.pool is not None else None
+                if worker is not None:
+                    await self._execute_warm(run, worker)
+                    return
+                run["warm"] = False   # pool still warming up, or disabled
+                with open(run["log"], "wb") as log:
+                    proc = await asyncio.create_subprocess_exec(
+                        *run["command"], stdout=log, stderr=subprocess.STDOUT, start_new_session=True
+                    )
+                self._procs[run["run_id"]] = proc
+                run.update(status="running", pid=proc.pid, started_at=_now())
+
+                try:
+                    returncode = await asyncio.wait_for(proc.wait(), RUN_TIMEOUT)
+                except asyncio.TimeoutError:
+                    run["status"] = "timeout"
+                    returncode = await self._stop(proc)
+
+                run["returncode"] = returncode
+                if run["status"] == "running":
+                    run["status"] = EXIT_STATUSES.get(returncode, "error")
+        except Exception as e:
+            run.update(status="error", error=str(e))
+        finally:
+            await self._store_report(run)
+            await self._store_results(run)
+            run["finished_at"] = _now()
+            self._procs.pop(run["run_id"], None)
+            self._tasks.pop(run["run_id"], None)
+
+    async def _execute_warm(self, run: dict, worker):
+        """Run in a warm pool process; `command[1:]` are the pytest arguments."""
+        open(run["log"], "wb").close()
+        run.update(status="running", started_at=_now())
+        try:
+            returncode = await asyncio.wait_for(
+                self.pool.run(worker, run["run_id"], run["command"][1:], run["log"]), RUN_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            run["status"] = "timeout"
+            returncode = None
+
+        # None: the worker was killed (cancel, timeout) or died mid-run
+        run["returncode"] = returncode
+        if run["status"] == "running":
+            run["status"] = EXIT_STATUSES.get(returncode, "error")
+
+    @staticmethod
+    def _results_path(run_id: str) -> str:
+        return os.path.abspath(os.path.join(REPORT_DIR, f"{run_id}.results.json"))
+
+    async def _store_results(self, run: dict):
+        """Ingest the run's `--results-json` file into the result store."""
+        path = self._results_path(run["run_id"])
+        try:
+            stored = await asyncio.to_thread(
+                result_store.ingest_file, path, run["run_id"], "local", label=run.get("tag")
+            )
+        except Exception as e:
+            print(">>> Could not store results:", e)
+            return
+        if stored:
+            run["summary"] = {k: stored[k] for k in ("total", "passed", "failed", "skipped")}
+            run["results"] = f"/api/results/runs/{run['run_id']}"
+            os.unlink(path)
+
+    @staticmethod
+    async def _store_report(run: dict):
+        """Move the run's HTML report into the report store."""
+        path = Path(REPORT_DIR) / run.get("report", "")
+        if not run.get("report") or not path.exists():
+            return
+        try:
+            await asyncio.to_thread(report_store.put, path.name, path)
+        except Exception as e:
+            print(">>> Could not store report:", e)
+            return
+        path.unlink(missing_ok=True)
+        gzip_path(path).unlink(missing_ok=True)
+
+    @staticmethod
+    async def _stop(proc: asyncio.subprocess.Process) -> int:
+        """SIGTERM the run's process group, SIGKILL it after CANCEL_GRACE seconds."""
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(proc.pid, sig)
+            except ProcessLookupError:
+                break
+            try:
+                return await asyncio.wait_for(proc.wait(), CANCEL_GRACE)
+            except asyncio.TimeoutError:
+                continue
+        return await proc.wait()
+
+    async def cancel(self, run_id: str) -> dict:
+        run = self.get(run_id)
+        if run["status"] == "queued":
+            run["status"] = "cancelled"
+        elif run["status"] == "running":
+            run["status"] = "cancelled"
+            proc = self._procs.get(run_id)
+            if proc:
+                await self._stop(proc)
+            elif self.pool is not None:
+                self.pool.kill(run_id)
+        return run
+
+    def get(self, run_id: str) -> dict:
+        if run_id not in self.runs:
+            raise HTTPException(404, "Run not found")
+        return self.runs[run_id]
+
+    def read_output(self, run_id: str, offset: int = 0, limit: int = 65536) -> dict:
+        """Captured output from byte `offset`; poll again with `next_offset`."""
+        run = self.get(run_id)
+        try:
+            with open(run["log"], "rb") as f:
+                f.seek(offset)
+                chunk = f.read(limit)
+        except FileNotFoundError:
+            chunk = b""
+        return {
+            "run_id": run_id,
+            "status": run["status"],
+            "output": chunk.decode("utf-8", errors="replace"),
+            "next_offset": offset + len(chunk),
+            "finished": run["status"] in FINISHED_STATUSES,
+        }
+
+
+warm_pool = WarmPool(WARM_WORKERS) if WARM_WORKERS > 0 else None
+runner = LocalRunner(pool=warm_pool)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if warm_pool is not None:
+        warm_pool.start()
+    yield
+    if warm_pool is not None:
+        warm_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Enable CORS so frontend can call backend
 app.add_middleware(
@@ -15,15 +250,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create reports folder if not exists
-REPORT_DIR = "backend/reports"
-os.makedirs(REPORT_DIR, exist_ok=True)
+# Per-test result history (/api/results/...), shared with gh_runner
+app.include_router(results_router)
 
 
 @app.get("/run-tests")
-def run_tests(tag: str):
+async def run_tests(tag: str, workers: int = 0):
     report_name = f"report_{tag}_{uuid.uuid4().hex}.html"
-    report_path = os.path.join(REPORT_DIR, report_name)
+    report_path = os.path.abspath(os.path.join(REPORT_DIR, report_name))
 
     command = [
         "pytest",
@@ -32,19 +266,54 @@ def run_tests(tag: str):
         "--self-contained-html"
     ]
 
-    subprocess.run(command)
+    # Spread the run over N local worker processes (pytest-xdist). Each
+    # worker gets its own browser and unique test users; the controller
+    # merges their results into the single report above.
+    if workers > 1:
+        command += ["-n", str(workers)]
+
+    # Single-process runs use a warm worker that has already imported the
+    # suite and launched its browser; xdist runs start their own processes.
+    # Returns right away; follow the run via /runs/{run_id}
+    run = runner.submit(command, warm=workers <= 1, tag=tag, workers=workers, report=report_name)
 
     return {
-        "message": "Test execution completed",
-        "report": report_name
+        "message": "Test execution queued",
+        "run_id": run["run_id"],
+        "report": report_name,
+        "status_url": f"/runs/{run['run_id']}"
     }
 
 
-@app.get("/get-report/{filename}")
-def get_report(filename: str):
-    file_path = os.path.join(REPORT_DIR, filename)
-    if not os.path.exists(file_path):
-        return {"error": "Report not found"}
+@app.get("/runs")
+def list_runs():
+    return sorted(runner.runs.values(), key=lambda r: r["created_at"], reverse=True)
+
+
+@app.get("/runs/{run_id}")
+def run_status(run_id: str):
+    return runner.get(run_id)
 
-    with open(file_path, "r", encoding="utf-8") as file:
-        return {"html": file.read()}
+
+@app.get("/runs/{run_id}/output")
+def run_output(run_id: str, offset: int = 0):
+    return runner.read_output(run_id, offset)
+
+
+@app.post("/runs/{run_id}/cancel")
+async def cancel_run(run_id: str):
+    return await runner.cancel(run_id)
+
+
+@app.get("/get-report/{filename}")
+async def get_report(filename: str, request: Request):
+    # The HTML itself, streamed from disk (gzip, ETag / 304 and Range aware)
+    if os.path.basename(filename) != filename or not filename.endswith(".html"):
+        raise HTTPException(404, "Report not found")
+    if any(r.get("report") == filename and r["status"] not in FINISHED_STATUSES for r in runner.runs.values()):
+        raise HTTPException(404, "Report not ready")
+    report = await asyncio.to_thread(report_store.get, filename)
+    if report is not None:
+        return stored_report_response(request, report, report_store.iter_range)
+    # Not stored (yet): serve the file pytest wrote
+    return await report_response(request, Path(REPORT_DIR) / filename)
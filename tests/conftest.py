@@ -1,15 +1,26 @@
 import os
+import re
+from contextlib import asynccontextmanager
+from pathlib import Path
+
 import pytest
+import pytest_asyncio
+from playwright.async_api import async_playwright
 from playwright.sync_api import sync_playwright
 
+from utils.auth_state import AuthStateCache, mark_authenticated
+from utils.helpers import delete_user_if_exists
+from utils.registration import unique_identity
+from utils.routing import DEFAULT_PROFILE, get_profile, install_route_profile, install_route_profile_async
+from utils.warm_pool import warm_browser, warm_playwright
+
 # Base host for the application under test. Page objects will append paths
 # (for example, '/login') as needed so tests can reuse `BASE_URL` consistently.
 BASE_URL = "https://captive.encoreskydev.com"
 
 
-@pytest.fixture(scope="function")
-def page():
-    """Playwright page fixture.
+def _launch_options():
+    """Resolve browser launch options from the environment.
 
     Headless is enabled by default to avoid opening a headed browser during CI
     or automated runs. Set environment variable `HEADLESS=false` to run in a
@@ -29,19 +40,253 @@ def page():
     except Exception:
         slow_mo = 0
 
+    return {"headless": headless, "slow_mo": slow_mo}
+
+
+def _browser_type(playwright):
     # Allow choosing browser: chromium, firefox or webkit
     browser_name = os.getenv("BROWSER", "chromium").lower()
 
+    if browser_name == "firefox":
+        return playwright.firefox
+    if browser_name == "webkit":
+        return playwright.webkit
+    return playwright.chromium
+
+
+@pytest.fixture(scope="session")
+def playwright_instance():
+    """One Playwright driver per test session (per worker when parallel).
+
+    Inside a warm pool worker (utils/warm_pool.py) the worker's long-lived
+    driver is reused instead.
+    """
+    warm = warm_playwright()
+    if warm is not None:
+        yield warm
+        return
     with sync_playwright() as p:
-        if browser_name == "firefox":
-            browser = p.firefox.launch(headless=headless, slow_mo=slow_mo)
-        elif browser_name == "webkit":
-            browser = p.webkit.launch(headless=headless, slow_mo=slow_mo)
-        else:
-            browser = p.chromium.launch(headless=headless, slow_mo=slow_mo)
-        # Allow navigation to sites with self-signed / invalid certs in test env
-        context = browser.new_context(ignore_https_errors=True)
-        page = context.new_page()
-        yield page
-        context.close()
-        browser.close()
\ No newline at end of file
+        yield p
+
+
+@pytest.fixture(scope="session")
+def browser(playwright_instance):
+    """Session-scoped browser so the launch cost is paid once.
+
+    Each test still gets its own `BrowserContext` (see `context`), which keeps
+    cookies, storage and cache isolated between tests. A warm pool worker's
+    pre-launched browser is reused and left open for its next run.
+    """
+    warm = warm_browser()
+    if warm is not None:
+        yield warm
+        return
+    browser = _browser_type(playwright_instance).launch(**_launch_options())
+    yield browser
+    browser.close()
+
+
+@pytest.fixture(scope="session")
+def auth_state_cache(browser):
+    """Per-role storage states, recorded by logging in once per role."""
+    return AuthStateCache(browser, BASE_URL)
+
+
+def _har_path(request, label=None):
+    """HAR file of the current test: `<har-dir>/<module>/<test name>[-<label>].har`."""
+    module = request.node.path.stem if hasattr(request.node, "path") else "tests"
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "_", request.node.name if label is None else f"{request.node.name}-{label}")
+    return Path(request.config.getoption("har_dir")) / module / f"{name}.har"
+
+
+def _har_route_options(request, label=None):
+    """Return `(har_path, route_from_har kwargs)` for the test, or `(None, None)`.
+
+    `--record-har` writes the test's traffic on context close; `--replay-har`
+    answers requests from that file, applying `--har-not-found` to misses.
+    """
+    mode = request.config.getoption("har_mode")
+    if not mode:
+        return None, None
+
+    har_path = _har_path(request, label)
+    if mode == "record":
+        har_path.parent.mkdir(parents=True, exist_ok=True)
+        return har_path, {"update": True, "update_content": "embed"}
+
+    if not har_path.exists():
+        pytest.skip(f"No HAR recorded for this test ({har_path}); run it once with --record-har")
+    return har_path, {"not_found": request.config.getoption("har_not_found")}
+
+
+def _auth_role(request):
+    """Role a test's context should start logged in as, or None.
+
+    Tests (or whole modules via `pytestmark`) opt in with
+    `@pytest.mark.auth_role("superAdmin")`; `@pytest.mark.no_auth` opts a
+    single test back out. `AUTH_CACHE=false` disables the cache entirely.
+    """
+    if os.getenv("AUTH_CACHE", "true").lower() in ("0", "false", "no"):
+        return None
+    # HAR runs log in through the UI so the login traffic is in the HAR
+    # and replays do not need the network to record a storage state.
+    if request.config.getoption("har_mode"):
+        return None
+    if request.node.get_closest_marker("no_auth"):
+        return None
+    marker = request.node.get_closest_marker("auth_role")
+    if marker is None:
+        return None
+    return marker.args[0] if marker.args else "superAdmin"
+
+
+@pytest.fixture(scope="function")
+def context(browser, request):
+    """Fresh, isolated browser context for every test."""
+    har_path, har_options = _har_route_options(request)
+    role = _auth_role(request)
+    storage_state = None
+    cache = None
+    if role:
+        cache = request.getfixturevalue("auth_state_cache")
+        storage_state = cache.storage_state(role)
+
+    # Allow navigation to sites with self-signed / invalid certs in test env
+    context = browser.new_context(ignore_https_errors=True, storage_state=storage_state)
+    if role:
+        mark_authenticated(context, role, cache)
+
+    # Network routing profile: `@pytest.mark.route_profile("minimal")` or
+    # `ROUTE_PROFILE=no-media` for the whole run.
+    marker = request.node.get_closest_marker("route_profile")
+    profile = get_profile(marker.args[0] if marker else DEFAULT_PROFILE)
+    route_stats = install_route_profile(context, profile)
+    request.node.user_properties.append(("route_profile", profile.name))
+
+    # Registered after the profile so HAR replay answers requests first
+    if har_path:
+        context.route_from_har(har_path, **har_options)
+
+    yield context
+    context.close()
+    request.node.user_properties.append(("route_stats", route_stats.as_dict()))
+
+
+@pytest.fixture(scope="function")
+def page(context):
+    """Playwright page fixture backed by the per-test `context`."""
+    page = context.new_page()
+    yield page
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_browser():
+    """Session-scoped browser driven by `playwright.async_api`.
+
+    Async tests share one event loop for the session, so a single test can
+    open many contexts from this browser and drive them concurrently.
+    """
+    async with async_playwright() as p:
+        browser = await _browser_type(p).launch(**_launch_options())
+        yield browser
+        await browser.close()
+
+
+@asynccontextmanager
+async def open_async_context(browser, request, label=None):
+    """Open a context from the async `browser` set up like `async_context`
+    (routing profile, HAR record / replay) and close it on exit.
+
+    Tests driving several contexts at once give each a distinct `label`,
+    so each records to and replays from its own HAR file.
+    """
+    har_path, har_options = _har_route_options(request, label)
+    context = await browser.new_context(ignore_https_errors=True)
+    try:
+        marker = request.node.get_closest_marker("route_profile")
+        profile = get_profile(marker.args[0] if marker else DEFAULT_PROFILE)
+        route_stats = await install_route_profile_async(context, profile)
+        if ("route_profile", profile.name) not in request.node.user_properties:
+            request.node.user_properties.append(("route_profile", profile.name))
+
+        if har_path:
+            await context.route_from_har(har_path, **har_options)
+
+        yield context
+    finally:
+        await context.close()
+    request.node.user_properties.append(("route_stats", route_stats.as_dict()))
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_context(async_browser, request):
+    """Async twin of `context`: isolated, with the test's routing profile."""
+    async with open_async_context(async_browser, request) as context:
+        yield context
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def async_page(async_context):
+    """Async twin of `page`, for tests using the `pages.aio` page objects."""
+    page = await async_context.new_page()
+    yield page
+
+
+@pytest.fixture(scope="function")
+def unique_user():
+    """Factory for per-test user identities built from `data/users.json`.
+
+    `unique_user("new_admin")` returns the template with a unique email and
+    user name, so tests are safe to run in parallel (`pytest -n 4`). Every
+    user handed out is deleted through the API when the test finishes.
+    """
+    created = []
+
+    def factory(template_key: str) -> dict:
+        user = unique_identity(template_key)
+        created.append(user["email"])
+        return user
+
+    yield factory
+
+    for email in created:
+        try:
+            delete_user_if_exists(email)
+        except Exception as e:
+            print(f"DEBUG: delete_user_if_exists failed: {e}")
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Print request counts and test time per routing profile.
+
+    The numbers travel on the test reports (`user_properties`), so the
+    summary also covers tests that ran on pytest-xdist workers.
+    """
+    totals = {}
+    durations = {}
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            props = dict(getattr(report, "user_properties", None) or [])
+            if getattr(report, "when", None) == "call" and "route_profile" in props:
+                name = props["route_profile"]
+                durations[name] = durations.get(name, 0.0) + report.duration
+            if getattr(report, "when", None) == "teardown" and "route_stats" in props:
+                stats = props["route_stats"]
+                total = totals.setdefault(stats["profile"], {
+                    "tests": 0, "requests": 0, "allowed": 0, "blocked": 0, "stubbed": 0, "allowed_bytes": 0,
+                })
+                total["tests"] += 1
+                for key in ("requests", "allowed", "blocked", "stubbed", "allowed_bytes"):
+                    total[key] += stats[key]
+
+    if not totals:
+        return
+
+    terminalreporter.section("network routing profiles")
+    for name, total in sorted(totals.items()):
+        terminalreporter.write_line(
+            f"{name}: {total['tests']} tests, {total['requests']} requests "
+            f"({total['allowed']} allowed, {total['blocked']} blocked, {total['stubbed']} stubbed), "
+            f"{total['allowed_bytes'] / 1024:.0f} KiB downloaded, "
+            f"{durations.get(name, 0.0):.1f}s in test calls"
+        )
@@ -1,24 +1,20 @@
+import pytest
 import json
 import os
 from pages.login_page import LoginPage
 from pages.admin_page import AdminPage
-from utils.helpers import delete_user_if_exists
 from pages.password_setup import open_invitation_and_set_password
 
+# Start every test already logged in via the per-role storage-state cache
+pytestmark = pytest.mark.auth_role("superAdmin")
 
-def test_create_admin_and_set_password(page):
-    """Create an admin user and set their password via Gmail invitation link."""
 
-    # Step 1: Load admin template from users.json
-    with open("data/users.json") as f:
-        data = json.load(f)
+def test_create_admin_and_set_password(page, unique_user):
+    """Create an admin user and set their password via Gmail invitation link."""
 
-    admin_data = data["new_admin"]
-    # Cleanup: delete user if exists
-    try:
-        delete_user_if_exists(admin_data["email"])
-    except Exception as e:
-        print(f"DEBUG: delete_user_if_exists failed: {e}")
+    # Step 1: Build a unique admin from the users.json template; the
+    # `unique_user` fixture deletes it again after the test.
+    admin_data = unique_user("new_admin")
 
     # Step 3: Login as Super Admin
     login = LoginPage(page)
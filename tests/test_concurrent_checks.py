@@ -0,0 +1,50 @@
+import asyncio
+import json
+import pytest
+from pages.aio.login_page import LoginPage
+from pages.aio.forgot_password_page import ForgotPasswordPage
+from tests.conftest import BASE_URL, open_async_context
+
+# Read-only checks driven concurrently from one event loop
+pytestmark = [pytest.mark.asyncio, pytest.mark.route_profile("minimal")]
+
+with open("data/user_login.json") as f:
+    invalid_creds = json.load(f)["invalid_logins"]
+
+NEGATIVE_LOGINS = [
+    (invalid_creds["blank_email"], "ValidPassword123", "Email is required"),
+    (invalid_creds["invalid_email_format"], "ValidPassword123", "Invalid email"),
+    (invalid_creds["unregistered_email"], "ValidPassword123", "User not found.."),
+    ("super.admin@icon.lu", invalid_creds["wrong_password"], "The password provided does not meet requirements.."),
+]
+
+
+async def negative_login(browser, request, attempt, email, password):
+    # Each attempt gets its own isolated context (and HAR file) from the shared browser
+    async with open_async_context(browser, request, label=f"attempt{attempt}") as context:
+        page = await context.new_page()
+        login = LoginPage(page)
+        await login.goto()
+        await login.enter_email(email)
+        await login.enter_password(password)
+        await login.click_login()
+        return await login.get_error_message()
+
+
+@pytest.mark.smoke
+async def test_negative_logins_concurrently(async_browser, request):
+    messages = await asyncio.gather(
+        *(negative_login(async_browser, request, i, email, password)
+          for i, (email, password, _) in enumerate(NEGATIVE_LOGINS))
+    )
+    assert messages == [expected for _, _, expected in NEGATIVE_LOGINS]
+
+
+async def test_forgot_password_blank_email_async(async_page):
+    login = LoginPage(async_page)
+    await login.goto(BASE_URL)
+    await login.click_forgot_password()
+    fp = ForgotPasswordPage(async_page)
+    await fp.enter_email("")
+    await fp.click_send_link()
+    assert "Email is required" in await fp.get_visible_errors()
@@ -1,24 +1,19 @@
+import pytest
 import json
 import os
 from pages.login_page import LoginPage
 from pages.customer_page import CustomerPage
-from utils.helpers import delete_user_if_exists
 from pages.password_setup import open_invitation_and_set_password
 
-def test_create_customer_and_set_password(page):
-    """Create a customer user and set their password via Gmail invitation link."""
-
-    # Step 1: Load customer template from users.json
-    with open("data/users.json") as f:
-        data = json.load(f)
+# Start every test already logged in via the per-role storage-state cache
+pytestmark = pytest.mark.auth_role("superAdmin")
 
-    customer_data = data["new_customer"]
+def test_create_customer_and_set_password(page, unique_user):
+    """Create a customer user and set their password via Gmail invitation link."""
 
-    # Cleanup: delete user if exists
-    try:
-        delete_user_if_exists(customer_data["email"])
-    except Exception as e:
-        print(f"DEBUG: delete_user_if_exists failed: {e}")
+    # Step 1: Build a unique customer from the users.json template; the
+    # `unique_user` fixture deletes it again after the test.
+    customer_data = unique_user("new_customer")
 
     # Step 3: Login as Super Admin
     login = LoginPage(page)
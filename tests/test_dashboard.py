@@ -2,6 +2,10 @@ import pytest
 from pages.login_page import LoginPage
 from pages.dashboard_page import DashboardPage
 
+# Start every test already logged in via the per-role storage-state cache;
+# images, media and fonts are never asserted on here.
+pytestmark = [pytest.mark.auth_role("superAdmin"), pytest.mark.route_profile("no-media")]
+
 @pytest.mark.dashboard
 def test_dashboard_elements_visibility(page):
     # Step 1: Navigate to login page
@@ -1,7 +1,11 @@
+import pytest
 from pages.login_page import LoginPage
 from pages.forgot_password_page import ForgotPasswordPage
 from tests.conftest import BASE_URL
 
+# Only text and form state are asserted on: skip media, fonts and analytics
+pytestmark = pytest.mark.route_profile("minimal")
+
 def test_forgot_password_redirect(page):
     login = LoginPage(page)
     login.goto(BASE_URL)
@@ -1,8 +1,11 @@
+import pytest
 import json
-import time
 from pages.job_page import JobPage
 from pages.login_page import LoginPage
 
+# Start every test already logged in via the per-role storage-state cache
+pytestmark = pytest.mark.auth_role("superAdmin")
+
 
 def load_job_data():
     with open("data/job_data.json", "r") as f:
@@ -53,7 +56,7 @@ def test_new_install_job_creation(page):
     )
     job.save_job()
     job.validate_job_created() 
-    time.sleep(1)
+    job.wait_for_job_saved()
 
 def test_install_change_job_creation(page):
     login_as_super_admin(page)
@@ -85,7 +88,7 @@ def test_install_change_job_creation(page):
     )
     job.save_job()
     job.validate_job_created() 
-    time.sleep(1)
+    job.wait_for_job_saved()
 
 def test_install_change_job_for_Service_intervention(page):
     login_as_super_admin(page)
@@ -117,4 +120,4 @@ def test_install_change_job_for_Service_intervention(page):
     )
     job.save_job()
     job.validate_job_created() 
-    time.sleep(1)
+    job.wait_for_job_saved()
@@ -5,6 +5,9 @@ from playwright.sync_api import Page, expect
 from tests.conftest import BASE_URL
 from pages.login_page import LoginPage
 
+# Only text and form state are asserted on: skip media, fonts and analytics
+pytestmark = pytest.mark.route_profile("minimal")
+
 def load_test_data():
     with open("data/user_login.json") as f:
         data= json.load(f)
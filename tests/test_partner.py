@@ -1,25 +1,20 @@
+import pytest
 import json
 import os
 from pages.login_page import LoginPage
 from pages.partner_page import PartnerPage
-from utils.helpers import delete_user_if_exists
 from pages.password_setup import open_invitation_and_set_password
 
+# Start every test already logged in via the per-role storage-state cache
+pytestmark = pytest.mark.auth_role("superAdmin")
 
-def test_create_partner_and_set_password(page):
-    """Create an partner user and set their password via Gmail invitation link."""
-
-    # Step 1: Load partner template from users.json
-    with open("data/users.json") as f:
-        data = json.load(f)
 
-    partner_data = data["new_partner"]
+def test_create_partner_and_set_password(page, unique_user):
+    """Create an partner user and set their password via Gmail invitation link."""
 
-    # Cleanup: delete user if exists
-    try:
-        delete_user_if_exists(partner_data["email"])
-    except Exception as e:
-        print(f"DEBUG: delete_user_if_exists failed: {e}")
+    # Step 1: Build a unique partner from the users.json template; the
+    # `unique_user` fixture deletes it again after the test.
+    partner_data = unique_user("new_partner")
 
     # Step 3: Login as Super Admin
     login = LoginPage(page)
@@ -1,25 +1,20 @@
+import pytest
 import json
 import os
 from pages.login_page import LoginPage
 from pages.subsidiaries import SubsidiariesPage
-from utils.helpers import delete_user_if_exists
 from pages.password_setup import open_invitation_and_set_password
 
+# Start every test already logged in via the per-role storage-state cache
+pytestmark = pytest.mark.auth_role("superAdmin")
 
-def test_create_subsidiaries_and_set_password(page):
-    """Create an subsidiaries user and set their password via Gmail invitation link."""
-
-    # Step 1: Load subsidiaries template from users.json
-    with open("data/users.json") as f:
-        data = json.load(f)
 
-    subsidiaries_data = data["new_subsidiaries"]
+def test_create_subsidiaries_and_set_password(page, unique_user):
+    """Create an subsidiaries user and set their password via Gmail invitation link."""
 
-    # Cleanup: delete user if exists
-    try:
-        delete_user_if_exists(subsidiaries_data["email"])
-    except Exception as e:
-        print(f"DEBUG: delete_user_if_exists failed: {e}")
+    # Step 1: Build a unique subsidiaries from the users.json template; the
+    # `unique_user` fixture deletes it again after the test.
+    subsidiaries_data = unique_user("new_subsidiaries")
 
     # Step 3: Login as Super Admin
     login = LoginPage(page)
@@ -1,24 +1,20 @@
+import pytest
 import json
 import os
 from pages.login_page import LoginPage
 from pages.technician import TechnicianPage
-from utils.helpers import delete_user_if_exists
 from pages.password_setup import open_invitation_and_set_password
 
+# Start every test already logged in via the per-role storage-state cache
+pytestmark = pytest.mark.auth_role("superAdmin")
 
-def test_create_technician_and_set_password(page):
-    """Create an technician user and set their password via Gmail invitation link."""
 
-    # Step 1: Load technician template from users.json
-    with open("data/users.json") as f:
-        data = json.load(f)
+def test_create_technician_and_set_password(page, unique_user):
+    """Create an technician user and set their password via Gmail invitation link."""
 
-    technician_data = data["new_technician"]
-    # Cleanup: delete user if exists
-    try:
-        delete_user_if_exists(technician_data["email"])
-    except Exception as e:
-        print(f"DEBUG: delete_user_if_exists failed: {e}")
+    # Step 1: Build a unique technician from the users.json template; the
+    # `unique_user` fixture deletes it again after the test.
+    technician_data = unique_user("new_technician")
 
     # Step 3: Login as Super Admin
     login = LoginPage(page)
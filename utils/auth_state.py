@@ -0,0 +1,219 @@
+import base64
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from weakref import WeakKeyDictionary
+
+# Role credentials used by `LoginPage.login_with_role` and the state cache.
+CREDENTIALS_FILE = Path("data/user_login.json")
+
+# Where the saved Playwright storage states live (one JSON file per role).
+STATE_DIR = Path(os.getenv("AUTH_STATE_DIR", ".auth"))
+
+# Saved states older than this (seconds) are refreshed even if no token
+# expiry could be read from them.
+MAX_AGE = int(os.getenv("AUTH_STATE_MAX_AGE", "1800"))
+
+# Treat tokens that expire within this many seconds as already expired so a
+# test does not start with a session that dies halfway through.
+EXPIRY_MARGIN = 60
+
+# context -> (role key, cache) for contexts created from a saved state
+_authenticated_contexts = WeakKeyDictionary()
+
+
+def normalize_role(role: str) -> str:
+    """Match role keys case-insensitively and allow underscores/spaces."""
+    return role.lower().replace("_", "").replace(" ", "")
+
+
+def resolve_role_credentials(role: str, file_path: Path = CREDENTIALS_FILE):
+    """Return `(role_key, email, password)` for `role` from the credential file."""
+    file_path = Path(file_path)
+    if not file_path.exists():
+        raise FileNotFoundError(f"Role credential file not found: {file_path}")
+
+    with file_path.open() as f:
+        data = json.load(f)
+
+    match_key = None
+    for k in data.keys():
+        if normalize_role(k) == normalize_role(role):
+            match_key = k
+            break
+
+    if match_key is None:
+        raise ValueError(f"Credentials for role '{role}' not found in {file_path}")
+
+    entry = data.get(match_key, {})
+    email = entry.get("email")
+    password = entry.get("password")
+
+    if not email or not password:
+        raise ValueError(f"Incomplete credentials for role '{role}' in {file_path}")
+
+    return match_key, email, password
+
+
+def mark_authenticated(context, role: str, cache=None):
+    """Remember that `context` was created already logged in as `role`."""
+    _authenticated_contexts[context] = (role, cache)
+
+
+def authenticated_role(context):
+    """Return the role `context` starts logged in as, or None."""
+    entry = _authenticated_contexts.get(context)
+    return entry[0] if entry else None
+
+
+def session_expired(context):
+    """Drop the pre-authenticated flag of `context` and its cached state.
+
+    Called by page objects when a context that should be logged in lands on
+    the login form, so the next test gets a freshly recorded state.
+    """
+    entry = _authenticated_contexts.pop(context, None)
+    if entry and entry[1] is not None:
+        entry[1].invalidate(entry[0])
+
+
+def _jwt_expiry(value: str):
+    """Return the `exp` claim of a JWT-looking string, or None."""
+    if not isinstance(value, str):
+        return None
+    value = value.strip().strip('"')
+    if value.lower().startswith("bearer "):
+        value = value[7:]
+    parts = value.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = parts[1] + "=" * (-len(parts[1]) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except Exception:
+        return None
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    return exp if isinstance(exp, (int, float)) else None
+
+
+def _state_expired(state: dict, now: float) -> bool:
+    """True if any cookie or stored JWT in a storage state has expired."""
+    deadline = now + EXPIRY_MARGIN
+
+    for cookie in state.get("cookies", []):
+        expires = cookie.get("expires", -1)
+        # -1 marks a session cookie, which has no expiry of its own
+        if expires and expires > 0 and expires < deadline:
+            return True
+        exp = _jwt_expiry(cookie.get("value", ""))
+        if exp is not None and exp < deadline:
+            return True
+
+    for origin in state.get("origins", []):
+        for item in origin.get("localStorage", []):
+            value = item.get("value", "")
+            candidates = [value]
+            # tokens are frequently nested inside a JSON blob
+            try:
+                parsed = json.loads(value)
+                if isinstance(parsed, dict):
+                    candidates.extend(v for v in parsed.values() if isinstance(v, str))
+            except Exception:
+                pass
+            for candidate in candidates:
+                exp = _jwt_expiry(candidate)
+                if exp is not None and exp < deadline:
+                    return True
+
+    return False
+
+
+class AuthStateCache:
+    """Logs in once per role and hands out the saved Playwright storage state.
+
+    States are stored as `<STATE_DIR>/<role>-<fingerprint>.json`. The
+    fingerprint covers the role's entry in the credential file and the base
+    URL, so editing a password (or pointing at another host) automatically
+    records a new state. A state is refreshed when it is older than
+    `max_age`, when a cookie or stored JWT in it has expired, or when a page
+    object reports that the session was rejected (see `session_expired`).
+    """
+
+    def __init__(self, browser, base_url: str, credentials_file: Path = CREDENTIALS_FILE,
+                 state_dir: Path = STATE_DIR, max_age: int = MAX_AGE):
+        self.browser = browser
+        self.base_url = base_url
+        self.credentials_file = Path(credentials_file)
+        self.state_dir = Path(state_dir)
+        self.max_age = max_age
+        self.logins = 0
+        self.hits = 0
+
+    def state_path(self, role: str) -> Path:
+        role_key, email, password = resolve_role_credentials(role, self.credentials_file)
+        fingerprint = hashlib.sha256(
+            json.dumps([role_key, email, password, self.base_url]).encode("utf-8")
+        ).hexdigest()[:12]
+        return self.state_dir / f"{normalize_role(role_key)}-{fingerprint}.json"
+
+    def storage_state(self, role: str) -> str:
+        """Return the path of a valid storage state for `role`, logging in if needed."""
+        path = self.state_path(role)
+        if self._is_fresh(path):
+            self.hits += 1
+            return str(path)
+
+        self._login(role, path)
+        return str(path)
+
+    def invalidate(self, role: str):
+        try:
+            self.state_path(role).unlink()
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def _is_fresh(self, path: Path) -> bool:
+        try:
+            age = time.time() - path.stat().st_mtime
+            if age > self.max_age:
+                return False
+            with path.open() as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return not _state_expired(state, time.time())
+
+    def _login(self, role: str, path: Path):
+        # Imported lazily: the login page imports this module for the
+        # pre-authenticated context registry.
+        from pages.login_page import LoginPage
+
+        _, email, password = resolve_role_credentials(role, self.credentials_file)
+
+        context = self.browser.new_context(ignore_https_errors=True)
+        try:
+            page = context.new_page()
+            LoginPage(page).login(email, password, self.base_url)
+            if "/login" in page.url:
+                raise RuntimeError(f"Login as '{role}' did not succeed (still on {page.url})")
+
+            # Write next to the final file and swap it in, so parallel
+            # workers never read a half-written state.
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            context.storage_state(path=tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            context.close()
+
+        self.logins += 1
+        # Remove states recorded for older versions of this role's credentials
+        prefix = path.name.rsplit("-", 1)[0] + "-"
+        for stale in self.state_dir.glob(f"{prefix}*.json"):
+            if stale != path:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
@@ -0,0 +1,73 @@
+import re
+
+# Collects every error candidate on the page in one `page.evaluate` call.
+# Mirrors what the page objects used to ask with one locator at a time:
+#   texts      - for each needle, the text of the innermost visible element
+#                containing it (like a `text=...` locator), or null
+#   containers - for each selector, the matching elements with their text,
+#                aria-label/title and visibility
+#   validation - native `validationMessage` of each named input
+ERROR_SNAPSHOT_JS = """
+({texts, containers, inputs}) => {
+    const isVisible = (el) => {
+        if (!el) return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+    const norm = (t) => (t || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+    const elements = Array.from(document.querySelectorAll('body *'));
+
+    const found = texts.map((needle) => {
+        const n = norm(needle);
+        const matches = elements.filter((el) => norm(el.textContent).includes(n));
+        // innermost match: no child element also contains the needle
+        const leaf = matches.find((el) => !Array.from(el.children).some((c) => norm(c.textContent).includes(n)));
+        return leaf && isVisible(leaf) ? (leaf.textContent || '').trim() : null;
+    });
+
+    const boxes = {};
+    for (const selector of containers) {
+        boxes[selector] = Array.from(document.querySelectorAll(selector)).map((el) => ({
+            text: (el.textContent || '').trim(),
+            label: el.getAttribute('aria-label') || el.getAttribute('title') || '',
+            visible: isVisible(el),
+        }));
+    }
+
+    const validation = {};
+    for (const [name, selector] of Object.entries(inputs)) {
+        const el = document.querySelector(selector);
+        validation[name] = el ? (el.validationMessage || '') : '';
+    }
+
+    return {texts: found, containers: boxes, validation};
+}
+"""
+
+
+def collect_error_snapshot(page, texts=(), containers=(), inputs=None) -> dict:
+    """Return all error candidates on `page` from a single browser round trip.
+
+    `texts` are substrings to look for (case-insensitive), `containers` CSS
+    selectors for alert/toast elements and `inputs` a `{name: selector}` map
+    of inputs whose native validation message should be read.
+    """
+    return page.evaluate(
+        ERROR_SNAPSHOT_JS,
+        {"texts": list(texts), "containers": list(containers), "inputs": dict(inputs or {})},
+    )
+
+
+async def collect_error_snapshot_async(page, texts=(), containers=(), inputs=None) -> dict:
+    """Async counterpart of `collect_error_snapshot`."""
+    return await page.evaluate(
+        ERROR_SNAPSHOT_JS,
+        {"texts": list(texts), "containers": list(containers), "inputs": dict(inputs or {})},
+    )
+
+
+def clean_message(text: str) -> str:
+    """Remove zero-width chars, collapse multiple dots and trim."""
+    s = re.sub(r'[\u200B\u200C\u200D\ufeff]', '', text)
+    s = re.sub(r'\.{2,}', '.', s)
+    return s.strip()
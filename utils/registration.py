@@ -1,21 +1,53 @@
 import time
 import json
+import uuid
 from pathlib import Path
 import os
 
 
-def _load_template():
+def _load_template(template_key: str = "new_admin"):
     p = Path("data/users.json")
     if p.exists():
         try:
             with p.open() as f:
                 data = json.load(f)
-            return data.get("new_admin", {})
+            return data.get(template_key, {})
         except Exception:
             return {}
     return {}
 
 
+def worker_id() -> str:
+    """Name of the current pytest-xdist worker (`gw0`, `gw1`, ...) or `main`."""
+    return os.getenv("PYTEST_XDIST_WORKER", "main")
+
+
+def unique_identity(template_key: str) -> dict:
+    """Return a copy of a `data/users.json` template with a unique identity.
+
+    The email gets a `+<worker><token>` sub-address (so invitation mails still
+    reach the same inbox) and the user name the same suffix. Parallel workers
+    therefore never create, delete or activate each other's users.
+    """
+    entry = _load_template(template_key)
+    if not entry:
+        raise KeyError(f"User template '{template_key}' not found in users.json")
+
+    suffix = f"{worker_id()}{uuid.uuid4().hex[:8]}"
+    user = dict(entry)
+
+    email = entry.get("email", "testuser@example.com")
+    if "@" in email:
+        local, domain = email.split("@", 1)
+        local_base = local.split("+")[0]
+        user["email"] = f"{local_base}+{suffix}@{domain}"
+    else:
+        user["email"] = f"{email}_{suffix}@example.com"
+
+    user["userName"] = f"{entry.get('userName', 'user')}_{suffix}"
+    return user
+
+
 def register_new_user(create_via_api: bool = False, api_url: str | None = None) -> str:
     """Create a new user for tests and return the created email.
 
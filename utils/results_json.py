@@ -0,0 +1,88 @@
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict
+
+# Longer failure reports are cut down to their last characters
+MAX_ERROR_LENGTH = 8000
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+class ResultsRecorder:
+    """pytest plugin writing one JSON document of per-test results.
+
+    Registered by the root conftest for `--results-json PATH`. Each test
+    gets its outcome, total duration, setup / call / teardown timings and
+    the error of the failing phase. Under pytest-xdist only the controller
+    writes the file; worker reports reach it through the same hook.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.started = time.time()
+        self.tests: Dict[str, dict] = {}
+
+    def _entry(self, report) -> dict:
+        entry = self.tests.get(report.nodeid)
+        if entry is None:
+            entry = self.tests[report.nodeid] = {
+                "nodeid": report.nodeid,
+                "outcome": None,
+                "duration": 0.0,
+                "phases": {},
+                "error": None,
+                "started_at": _iso(getattr(report, "start", None) or time.time()),
+                # xdist worker id ("gw0") when the test ran on a worker
+                "worker": getattr(getattr(getattr(report, "node", None), "gateway", None), "id", None),
+            }
+        return entry
+
+    def pytest_runtest_logreport(self, report):
+        entry = self._entry(report)
+        entry["phases"][report.when] = round(report.duration, 4)
+        entry["duration"] = round(sum(entry["phases"].values()), 4)
+
+        if hasattr(report, "wasxfail"):
+            outcome = "xpassed" if report.passed else "xfailed"
+        elif report.failed:
+            # Failures in setup / teardown are errors, as pytest counts them
+            outcome = "failed" if report.when == "call" else "error"
+        elif report.skipped:
+            outcome = "skipped"
+        else:
+            outcome = "passed"
+
+        # The first phase that did not pass decides the outcome
+        if entry["outcome"] in (None, "passed"):
+            entry["outcome"] = outcome
+        if report.failed or report.skipped:
+            text = report.longreprtext
+            if report.skipped and isinstance(report.longrepr, tuple):
+                text = report.longrepr[2]
+            entry["error"] = entry["error"] or text[-MAX_ERROR_LENGTH:] or None
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        if hasattr(session.config, "workerinput"):
+            return
+        finished = time.time()
+        counts: Dict[str, int] = {}
+        for entry in self.tests.values():
+            counts[entry["outcome"]] = counts.get(entry["outcome"], 0) + 1
+
+        document = {
+            "started_at": _iso(self.started),
+            "finished_at": _iso(finished),
+            "duration": round(finished - self.started, 3),
+            "exitstatus": int(exitstatus),
+            "summary": counts,
+            "tests": list(self.tests.values()),
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(document, f, indent=1)
+        os.replace(tmp, self.path)
@@ -0,0 +1,168 @@
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+
+# Profile used when a test does not pick one with `@pytest.mark.route_profile`
+DEFAULT_PROFILE = os.getenv("ROUTE_PROFILE", "full")
+
+# Third-party hosts that never matter for our assertions
+ANALYTICS_PATTERNS = (
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"hotjar\.com",
+    r"segment\.(io|com)",
+    r"connect\.facebook\.net",
+    r"clarity\.ms",
+    r"sentry\.io",
+)
+
+
+@dataclass(frozen=True)
+class RouteProfile:
+    """What a browser context is allowed to fetch.
+
+    `block_resource_types` are Playwright resource types (`image`, `font`,
+    `media`, ...) that are aborted. Requests whose URL matches one of
+    `stub_patterns` are answered locally with an empty body instead, so
+    scripts that expect them to load keep working.
+    """
+    name: str
+    block_resource_types: frozenset = frozenset()
+    block_patterns: tuple = ()
+    stub_patterns: tuple = ()
+
+    @property
+    def intercepts(self) -> bool:
+        return bool(self.block_resource_types or self.block_patterns or self.stub_patterns)
+
+
+PROFILES = {
+    "full": RouteProfile("full"),
+    "no-media": RouteProfile(
+        "no-media",
+        block_resource_types=frozenset({"image", "media", "font"}),
+    ),
+    "minimal": RouteProfile(
+        "minimal",
+        block_resource_types=frozenset({"image", "media", "font", "manifest", "texttrack", "eventsource"}),
+        stub_patterns=ANALYTICS_PATTERNS,
+    ),
+}
+
+
+@dataclass
+class RouteStats:
+    """Request counters collected for one browser context."""
+    profile: str
+    requests: int = 0
+    blocked: int = 0
+    stubbed: int = 0
+    allowed_bytes: int = 0
+    blocked_by_type: Counter = field(default_factory=Counter)
+
+    @property
+    def allowed(self) -> int:
+        return self.requests - self.blocked - self.stubbed
+
+    def as_dict(self) -> dict:
+        return {
+            "profile": self.profile,
+            "requests": self.requests,
+            "allowed": self.allowed,
+            "blocked": self.blocked,
+            "stubbed": self.stubbed,
+            "allowed_bytes": self.allowed_bytes,
+            "blocked_by_type": dict(self.blocked_by_type),
+        }
+
+
+def get_profile(name: str) -> RouteProfile:
+    if name not in PROFILES:
+        raise ValueError(f"Unknown route profile '{name}', expected one of {sorted(PROFILES)}")
+    return PROFILES[name]
+
+
+def _route_decider(profile: RouteProfile, stats: RouteStats):
+    """Return a function mapping a request to "stub", "block" or None (allow)."""
+    block_re = re.compile("|".join(profile.block_patterns)) if profile.block_patterns else None
+    stub_re = re.compile("|".join(profile.stub_patterns)) if profile.stub_patterns else None
+
+    def decide(request):
+        url = request.url
+        if stub_re and stub_re.search(url):
+            stats.stubbed += 1
+            return "stub"
+        if request.resource_type in profile.block_resource_types or (block_re and block_re.search(url)):
+            stats.blocked += 1
+            stats.blocked_by_type[request.resource_type] += 1
+            return "block"
+        return None
+
+    return decide
+
+
+def _count_traffic(context, stats: RouteStats):
+    def on_request(request):
+        stats.requests += 1
+
+    def on_response(response):
+        try:
+            stats.allowed_bytes += int(response.headers.get("content-length", 0))
+        except (TypeError, ValueError):
+            pass
+
+    context.on("request", on_request)
+    context.on("response", on_response)
+
+
+def install_route_profile(context, profile: RouteProfile) -> RouteStats:
+    """Apply `profile` to `context` and return the live request counters.
+
+    The "full" profile registers no route handler at all, so it only pays
+    for the event listeners that feed the counters.
+    """
+    stats = RouteStats(profile.name)
+    _count_traffic(context, stats)
+    if not profile.intercepts:
+        return stats
+
+    decide = _route_decider(profile, stats)
+
+    def handle(route):
+        action = decide(route.request)
+        if action == "stub":
+            route.fulfill(status=204, body="")
+        elif action == "block":
+            route.abort("blockedbyclient")
+        else:
+            # Routes run newest first, so HAR replay (registered after this
+            # profile) has already passed on the request; hand it to any
+            # earlier-registered route or the network
+            route.fallback()
+
+    context.route("**/*", handle)
+    return stats
+
+
+async def install_route_profile_async(context, profile: RouteProfile) -> RouteStats:
+    """Async counterpart of `install_route_profile` for `playwright.async_api`."""
+    stats = RouteStats(profile.name)
+    _count_traffic(context, stats)
+    if not profile.intercepts:
+        return stats
+
+    decide = _route_decider(profile, stats)
+
+    async def handle(route):
+        action = decide(route.request)
+        if action == "stub":
+            await route.fulfill(status=204, body="")
+        elif action == "block":
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    await context.route("**/*", handle)
+    return stats
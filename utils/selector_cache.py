@@ -0,0 +1,188 @@
+import json
+import os
+import threading
+import warnings
+from pathlib import Path
+
+# Learned selectors survive the session in this file (set to "" to keep
+# them in memory only).
+CACHE_FILE = os.getenv("SELECTOR_CACHE_FILE", ".selector_cache.json")
+
+# How long (ms) a remembered selector gets before the fallbacks are raced
+PROBE_TIMEOUT = int(os.getenv("SELECTOR_PROBE_TIMEOUT", "1500"))
+
+# How long (ms) to wait for any of the candidates to show up at all
+RESOLVE_TIMEOUT = int(os.getenv("SELECTOR_RESOLVE_TIMEOUT", "5000"))
+
+
+class SelectorFallbackWarning(UserWarning):
+    """A field's primary selector no longer matched and a fallback was used."""
+
+
+class SelectorResolver:
+    """Finds the working selector for a form field and remembers it.
+
+    Candidates are given primary-first. The remembered selector for
+    `(page_name, field)` is tried first with a short timeout; otherwise all
+    candidates are raced with one `or_` locator, so a missing primary costs
+    no extra timeout. The winner is stored (in memory and in `cache_file`)
+    and a `SelectorFallbackWarning` is emitted when it is not the primary.
+    A remembered fallback is checked against the primary on every use: the
+    warning repeats each session until the primary works again, and then
+    the fallback is forgotten.
+    """
+
+    def __init__(self, cache_file=CACHE_FILE, probe_timeout: int = PROBE_TIMEOUT,
+                 resolve_timeout: int = RESOLVE_TIMEOUT):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.probe_timeout = probe_timeout
+        self.resolve_timeout = resolve_timeout
+        self.learned = self._load()
+        self.fallbacks = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        if not self.cache_file:
+            return {}
+        try:
+            with self.cache_file.open() as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        if not self.cache_file:
+            return
+        try:
+            tmp_path = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with tmp_path.open("w") as f:
+                json.dump(self.learned, f, indent=4, sort_keys=True)
+            os.replace(tmp_path, self.cache_file)
+        except OSError:
+            pass
+
+    def remember(self, page_name: str, field: str, selector: str, primary: str):
+        with self._lock:
+            if self.learned.get(page_name, {}).get(field) != selector:
+                self.learned.setdefault(page_name, {})[field] = selector
+                self._save()
+
+        if selector != primary and (page_name, field) not in self.fallbacks:
+            self.fallbacks[(page_name, field)] = selector
+            message = f"{page_name}.{field}: primary selector {primary!r} failed, using {selector!r}"
+            warnings.warn(message, SelectorFallbackWarning, stacklevel=3)
+
+    def forget(self, page_name: str, field: str):
+        with self._lock:
+            if self.learned.get(page_name, {}).pop(field, None) is not None:
+                self._save()
+
+    def _settle_learned(self, page_name: str, field: str, learned: str, primary: str,
+                        primary_visible: bool) -> str:
+        """Pick between a visible remembered selector and the primary."""
+        if learned == primary:
+            return learned
+        if primary_visible:
+            # The primary works again: drop the fallback
+            self.forget(page_name, field)
+            self.fallbacks.pop((page_name, field), None)
+            return primary
+        self.remember(page_name, field, learned, primary)
+        return learned
+
+    def resolve(self, page, page_name: str, field: str, candidates):
+        """Return the first candidate selector that is visible on `page`, or None."""
+        learned = self.learned.get(page_name, {}).get(field)
+        if learned in candidates:
+            try:
+                page.locator(learned).first.wait_for(state="visible", timeout=self.probe_timeout)
+            except Exception:
+                self.forget(page_name, field)
+            else:
+                primary_visible = False
+                if learned != candidates[0]:
+                    try:
+                        primary_visible = page.locator(candidates[0]).first.is_visible()
+                    except Exception:
+                        pass
+                return self._settle_learned(page_name, field, learned, candidates[0], primary_visible)
+
+        combined = page.locator(candidates[0])
+        for selector in candidates[1:]:
+            combined = combined.or_(page.locator(selector))
+        try:
+            combined.first.wait_for(state="visible", timeout=self.resolve_timeout)
+        except Exception:
+            return None
+
+        for selector in candidates:
+            try:
+                if page.locator(selector).first.is_visible():
+                    self.remember(page_name, field, selector, candidates[0])
+                    return selector
+            except Exception:
+                continue
+        return None
+
+    def fill(self, page, page_name: str, field: str, candidates, value: str):
+        """Fill the field through its working selector; returns it, or None if nothing matched."""
+        selector = self.resolve(page, page_name, field, candidates)
+        if selector is None:
+            return None
+        try:
+            page.locator(selector).first.fill(value, timeout=self.probe_timeout)
+            return selector
+        except Exception:
+            self.forget(page_name, field)
+            return None
+
+    async def resolve_async(self, page, page_name: str, field: str, candidates):
+        """Async counterpart of `resolve` for `playwright.async_api` pages."""
+        learned = self.learned.get(page_name, {}).get(field)
+        if learned in candidates:
+            try:
+                await page.locator(learned).first.wait_for(state="visible", timeout=self.probe_timeout)
+            except Exception:
+                self.forget(page_name, field)
+            else:
+                primary_visible = False
+                if learned != candidates[0]:
+                    try:
+                        primary_visible = await page.locator(candidates[0]).first.is_visible()
+                    except Exception:
+                        pass
+                return self._settle_learned(page_name, field, learned, candidates[0], primary_visible)
+
+        combined = page.locator(candidates[0])
+        for selector in candidates[1:]:
+            combined = combined.or_(page.locator(selector))
+        try:
+            await combined.first.wait_for(state="visible", timeout=self.resolve_timeout)
+        except Exception:
+            return None
+
+        for selector in candidates:
+            try:
+                if await page.locator(selector).first.is_visible():
+                    self.remember(page_name, field, selector, candidates[0])
+                    return selector
+            except Exception:
+                continue
+        return None
+
+    async def fill_async(self, page, page_name: str, field: str, candidates, value: str):
+        """Async counterpart of `fill`."""
+        selector = await self.resolve_async(page, page_name, field, candidates)
+        if selector is None:
+            return None
+        try:
+            await page.locator(selector).first.fill(value, timeout=self.probe_timeout)
+            return selector
+        except Exception:
+            self.forget(page_name, field)
+            return None
+
+
+# Shared by all page objects for the whole test session
+selector_resolver = SelectorResolver()
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+
+class WaitTimeout(TimeoutError):
+    """Raised when a condition did not become true before its deadline."""
+
+
+def wait_until(condition, timeout: float = 10.0, interval: float = 0.1, backoff: float = 1.5,
+               max_interval: float = 2.0, description: str = "condition", page=None,
+               ignore_exceptions=(Exception,)):
+    """Poll `condition()` until it returns a truthy value and return that value.
+
+    Polling starts every `interval` seconds and backs off by `backoff` up to
+    `max_interval`, so fast outcomes are seen quickly while slow ones do not
+    hammer the browser or a remote API. Exceptions listed in
+    `ignore_exceptions` count as "not ready yet". When `timeout` seconds pass
+    without success, `WaitTimeout` is raised (chained to the last error).
+
+    Pass the Playwright `page` to sleep with `page.wait_for_timeout`, which
+    keeps Playwright's event loop (listeners, routes) running while waiting.
+    """
+    deadline = time.monotonic() + timeout
+    delay = interval
+    last_error = None
+
+    while True:
+        try:
+            result = condition()
+            if result:
+                return result
+        except ignore_exceptions as e:
+            last_error = e
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise WaitTimeout(f"Timed out after {timeout}s waiting for {description}") from last_error
+
+        pause = min(delay, remaining)
+        if page is not None:
+            page.wait_for_timeout(pause * 1000)
+        else:
+            time.sleep(pause)
+        delay = min(delay * backoff, max_interval)
+
+
+async def async_wait_until(condition, timeout: float = 10.0, interval: float = 0.1, backoff: float = 1.5,
+                           max_interval: float = 2.0, description: str = "condition",
+                           ignore_exceptions=(Exception,)):
+    """Async counterpart of `wait_until`; `condition` may be sync or async."""
+    deadline = time.monotonic() + timeout
+    delay = interval
+    last_error = None
+
+    while True:
+        try:
+            result = condition()
+            if asyncio.iscoroutine(result):
+                result = await result
+            if result:
+                return result
+        except ignore_exceptions as e:
+            last_error = e
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise WaitTimeout(f"Timed out after {timeout}s waiting for {description}") from last_error
+
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * backoff, max_interval)
+
@@ -0,0 +1,260 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import sys
+import traceback
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# Runs a worker serves before it is replaced by a fresh process
+WARM_MAX_RUNS = int(os.getenv("WARM_MAX_RUNS", "20"))
+
+# How long (seconds) a new worker may take to import, collect and launch
+WARM_START_TIMEOUT = 180
+
+# Code a warm worker has imported; it is recycled once any of these changes
+SOURCE_DIRS = ("tests", "pages", "utils")
+
+# Files it has read at import / collection time (test data, pytest config)
+SOURCE_FILES = ("conftest.py", "pytest.ini", "data/*.json")
+
+# pytest's exit code for internal errors
+PYTEST_INTERNAL_ERROR = 3
+
+# Inside a worker process: the Playwright driver and browser that the
+# session fixtures in tests/conftest.py reuse instead of launching their own
+_warm: Dict[str, object] = {}
+
+
+def warm_playwright():
+    """The worker's running Playwright driver, or None outside a warm worker."""
+    return _warm.get("playwright")
+
+
+def warm_browser():
+    """The worker's pre-launched browser, or None outside a warm worker."""
+    browser = _warm.get("browser")
+    return browser if browser is not None and browser.is_connected() else None
+
+
+def source_stamp(root: Path = ROOT_DIR) -> float:
+    """Latest modification time of the code and data a worker has loaded."""
+    paths = []
+    for pattern in SOURCE_FILES:
+        paths.extend(root.glob(pattern))
+    for name in SOURCE_DIRS:
+        paths.extend((root / name).rglob("*.py"))
+    return max((p.stat().st_mtime for p in paths if p.exists()), default=0.0)
+
+
+# -------------------------------------------------------------------------
+# Worker process
+# -------------------------------------------------------------------------
+@contextmanager
+def _redirect_output(path: str):
+    """Point fds 1 and 2 (so also child processes and `-s` output) at `path`."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = os.dup(1), os.dup(2)
+    with open(path, "ab") as f:
+        os.dup2(f.fileno(), 1)
+        os.dup2(f.fileno(), 2)
+        try:
+            yield
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved[0], 1)
+            os.dup2(saved[1], 2)
+            os.close(saved[0])
+            os.close(saved[1])
+
+
+def _launch_browser():
+    from tests.conftest import _browser_type, _launch_options
+    _warm["browser"] = _browser_type(_warm["playwright"]).launch(**_launch_options())
+
+
+def _worker_main(conn, root: str):
+    # Own session / process group: killing the group also takes down the
+    # browser and anything else the tests started
+    os.setsid()
+    os.chdir(root)
+    if root not in sys.path:
+        sys.path.insert(0, root)
+
+    try:
+        import pytest
+        from playwright.sync_api import sync_playwright
+
+        _warm["playwright"] = sync_playwright().start()
+        _launch_browser()
+
+        # Imports playwright, the page objects and every test module once;
+        # later runs find them in sys.modules
+        with _redirect_output(os.devnull):
+            pytest.main(["--collect-only", "-q", "-p", "no:cacheprovider", "tests"])
+    except Exception as e:
+        conn.send({"ready": False, "error": repr(e)})
+        return
+
+    conn.send({"ready": True, "pid": os.getpid()})
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+
+        if warm_browser() is None:
+            _launch_browser()
+
+        with _redirect_output(job["log"]):
+            try:
+                returncode = int(pytest.main(job["args"]))
+            except BaseException:
+                traceback.print_exc()
+                returncode = PYTEST_INTERNAL_ERROR
+        conn.send({"returncode": returncode})
+
+    try:
+        _warm["browser"].close()
+        _warm["playwright"].stop()
+    except Exception:
+        pass
+
+
+# -------------------------------------------------------------------------
+# Pool (lives in the run_tests.py process)
+# -------------------------------------------------------------------------
+class WarmWorker:
+    def __init__(self, ctx, root: Path):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, str(root)), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.runs = 0
+        self.stamp = source_stamp(root)
+
+    def kill(self):
+        """SIGKILL the worker's process group, as `LocalRunner._stop` does for a run."""
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            # Not (yet) a group leader, or already gone
+            if self.process.is_alive():
+                os.kill(self.process.pid, signal.SIGKILL)
+
+
+class WarmPool:
+    """Pre-warmed pytest processes that take runs one at a time.
+
+    Each worker has already imported playwright, the page objects and the
+    test modules, collected the suite and launched a browser, so a run only
+    pays for the tests themselves. A worker is replaced after `max_runs`
+    runs, when the code under tests/, pages/ or utils/ (or the test data
+    and pytest.ini) changed since it started, or when it dies.
+    """
+
+    def __init__(self, size: int, max_runs: int = WARM_MAX_RUNS, root: Path = ROOT_DIR):
+        self.size = size
+        self.max_runs = max_runs
+        self.root = root
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: Optional[asyncio.Queue] = None
+        self._busy: Dict[str, WarmWorker] = {}
+        self._tasks = set()
+
+    @property
+    def idle(self) -> int:
+        return self._idle.qsize() if self._idle is not None else 0
+
+    def start(self):
+        """Start warming `size` workers in the background (call from the event loop)."""
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._spawn()
+
+    def _spawn(self):
+        task = asyncio.get_running_loop().create_task(self._start_worker())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _start_worker(self):
+        worker = None
+        try:
+            worker = WarmWorker(self._ctx, self.root)
+            ready = await asyncio.wait_for(asyncio.to_thread(worker.conn.recv), WARM_START_TIMEOUT)
+            if not ready.get("ready"):
+                raise RuntimeError(ready.get("error"))
+            self._idle.put_nowait(worker)
+        except Exception as e:
+            # Not retried: runs fall back to a fresh pytest process
+            print(">>> Warm worker failed to start:", repr(e))
+            if worker:
+                worker.kill()
+
+    def _retire(self, worker: WarmWorker, replace: bool = True):
+        try:
+            worker.conn.send(None)
+        except (OSError, ValueError):
+            worker.kill()
+        worker.conn.close()
+        if replace:
+            self._spawn()
+
+    def take(self) -> Optional[WarmWorker]:
+        """An idle, up-to-date worker, or None if there is none right now."""
+        stamp = None
+        while self.idle:
+            worker = self._idle.get_nowait()
+            if stamp is None:
+                stamp = source_stamp(self.root)
+            if worker.process.is_alive() and worker.stamp >= stamp:
+                return worker
+            # Dead, or started before the code changed
+            self._retire(worker)
+        return None
+
+    async def run(self, worker: WarmWorker, run_id: str, args: list, log_path: str) -> Optional[int]:
+        """Run pytest with `args` in `worker` (from `take()`); returns its exit
+        code, or None if the worker was killed, e.g. by `kill(run_id)`."""
+        self._busy[run_id] = worker
+        healthy = False
+        try:
+            worker.conn.send({"args": args, "log": log_path})
+            reply = await asyncio.to_thread(worker.conn.recv)
+            worker.runs += 1
+            healthy = True
+            return reply["returncode"]
+        except (EOFError, OSError):
+            return None
+        except asyncio.CancelledError:
+            worker.kill()
+            raise
+        finally:
+            self._busy.pop(run_id, None)
+            if healthy and worker.process.is_alive() and worker.runs < self.max_runs:
+                self._idle.put_nowait(worker)
+            else:
+                self._retire(worker)
+
+    def kill(self, run_id: str) -> bool:
+        """Stop a running run by killing its worker (a replacement is started)."""
+        worker = self._busy.get(run_id)
+        if worker is None:
+            return False
+        worker.kill()
+        return True
+
+    def shutdown(self):
+        while self._idle is not None and not self._idle.empty():
+            self._retire(self._idle.get_nowait(), replace=False)
+        for worker in list(self._busy.values()):
+            worker.kill()